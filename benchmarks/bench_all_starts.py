@@ -0,0 +1,65 @@
+"""
+Filename: bench_all_starts.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks running one script from every start state. A move-heavy
+    script is run by AllStarts from every start on a size x size table at
+    once, and by a reused Simulator from a sample of the starts, one PLACE
+    and script per start; the Simulator's time is scaled up to every start.
+    The sampled starts must report the same states both ways, and the run
+    fails if AllStarts is less than --min-speedup times faster.
+
+    Usage: python -m benchmarks.bench_all_starts [--size N] [--commands N] [--sample N] [--min-speedup S]
+"""
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.generators import make_config
+from toyrobot.all_starts import AllStarts
+from toyrobot.simulator import Simulator
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="All-starts vs one run per start benchmark")
+    parser.add_argument("--size", type=int, default=50, help="table side (default: 50)")
+    parser.add_argument("--commands", type=int, default=2_000, help="commands in the script (default: 2000)")
+    parser.add_argument("--sample", type=int, default=200, help="starts run one at a time (default: 200)")
+    parser.add_argument("--min-speedup", type=float, default=20.0,
+                        help="fail if AllStarts is not this many times faster (default: 20.0)")
+    args = parser.parse_args(argv)
+
+    config = make_config(args.size, args.size)
+    rng = random.Random(args.size)
+    script = rng.choices(["MOVE", "LEFT", "RIGHT", "REPORT"], [80, 8, 8, 4], k=args.commands)
+
+    start = time.perf_counter()
+    all_starts = AllStarts(config)
+    result = all_starts.run(script)
+    together = time.perf_counter() - start
+
+    simulator = Simulator(config)
+    sample = rng.sample(range(len(all_starts)), min(args.sample, len(all_starts)))
+    lines = list(all_starts.format_lines(result))
+    start = time.perf_counter()
+    runs = []
+    for index in sample:
+        runs.append(simulator.run([f"PLACE {lines[index].split()[0]}", *script]))
+    one_by_one = (time.perf_counter() - start) / len(sample) * len(all_starts)
+
+    for index, run in zip(sample, runs):
+        expected = lines[index].partition("(reports: ")[2].rstrip(")").split()
+        if run.reports != expected:
+            print(f"FAIL: start {lines[index].split()[0]} reports differ")
+            return 1
+    speedup = one_by_one / together
+    print(f"{args.size}x{args.size} table, {len(all_starts):,} starts, {args.commands:,} commands")
+    print(f"one run per start: {one_by_one:8.2f} s (from {len(sample)} starts)")
+    print(f"all starts:        {together:8.2f} s")
+    print(f"speedup: {speedup:.1f}x (limit {args.min_speedup:.1f}x)")
+    return 0 if speedup >= args.min_speedup else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
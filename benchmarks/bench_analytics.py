@@ -0,0 +1,67 @@
+"""
+Filename: bench_analytics.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks the overhead of --analytics. A move-heavy stream on a small
+    table, where most MOVEs reach the edge and are clamped, and one on a
+    large table are each run through a Session without and with analytics.
+    The counts must add up to every placement and MOVE, and the run fails
+    if analytics add more than --max-overhead nanoseconds per command.
+
+    Usage: python -m benchmarks.bench_analytics [--commands N] [--max-overhead NS]
+"""
+import argparse
+import random
+import sys
+import timeit
+
+from benchmarks.generators import move_heavy, weighted_stream, make_config
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+
+REPEATS = 3
+
+def run_session(config, commands, analytics):
+    """Runs commands through a new Session and returns its analytics, if enabled."""
+    session = Session(config, ListSink())
+    if analytics:
+        session.enable_analytics()
+    session.run(commands)
+    return session.analytics
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analytics overhead benchmark")
+    parser.add_argument("--commands", type=int, default=200_000, help="commands per workload (default: 200000)")
+    parser.add_argument("--max-overhead", type=float, default=1_000.0,
+                        help="fail if analytics add more than this many ns per command (default: 1000)")
+    args = parser.parse_args(argv)
+
+    workloads = {
+        "5x5 table": move_heavy(args.commands),
+        "1000x1000 table": (make_config(1000, 1000),
+                            weighted_stream(random.Random(0), args.commands,
+                                            {"MOVE": 85, "LEFT": 6, "RIGHT": 6, "PLACE": 3}, 1000, 1000)),
+    }
+
+    failed = False
+    print(f"{'workload':<16} {'plain ms':>9} {'analytics ms':>13} {'ns/command':>11}")
+    for name, (config, commands) in workloads.items():
+        analytics = run_session(config, commands, True)
+        counted = int(analytics.visits.sum() + analytics.edge_clamps.sum() + analytics.obstacle_stops.sum())
+        expected = sum(command == "MOVE" or command.startswith("PLACE") for command in commands)
+        if counted != expected:
+            print(f"{name}: counted {counted:,} placements and MOVEs, expected {expected:,}")
+            failed = True
+            continue
+        plain = min(timeit.repeat(lambda: run_session(config, commands, False), number=1, repeat=REPEATS))
+        counting = min(timeit.repeat(lambda: run_session(config, commands, True), number=1, repeat=REPEATS))
+        overhead = (counting - plain) / len(commands) * 1e9
+        failed |= overhead > args.max_overhead
+        print(f"{name:<16} {plain * 1e3:>9.1f} {counting * 1e3:>13.1f} {overhead:>11.0f}")
+    print(f"limit: {args.max_overhead:g} ns per command")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Filename: bench_binary.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks the binary command format against text. Each seeded workload
+    is written as a text file and converted to binary, then both files are
+    replayed through the dispatcher. The file sizes, the best of several
+    replay times, and whether the outputs match are reported. The run fails
+    if the outputs differ or any binary replay is slower than the text one.
+
+    Usage: python -m benchmarks.bench_binary [commands]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+from benchmarks.generators import WORKLOADS
+from toyrobot.binary_format import convert_text_to_binary, iter_binary_tokens
+from toyrobot.command_source import iter_file_commands
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+
+REPEATS = 3
+
+def replay_text(path, config):
+    """Replays a text command file and returns the output."""
+    session = Session(config, ListSink())
+    session.run(iter_file_commands(path))
+    return session.output_sink.records
+
+def replay_binary(path, config):
+    """Replays a binary command file and returns the output."""
+    session = Session(config, ListSink())
+    execute = session.dispatcher.execute
+    robot, table = session.robot, session.table
+    for opcode, argument in iter_binary_tokens(path, robot.directions):
+        execute(opcode, argument, robot, table)
+    return session.output_sink.records
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for name, workload in WORKLOADS.items():
+            config, commands = workload(count)
+            text_path = os.path.join(directory, name + ".txt")
+            binary_path = os.path.join(directory, name + ".trb")
+            with open(text_path, 'w') as f:
+                f.write("\n".join(commands) + "\n")
+            convert_text_to_binary(text_path, binary_path, config["directions"])
+
+            text_size = os.path.getsize(text_path)
+            binary_size = os.path.getsize(binary_path)
+            text_time = min(timeit.repeat(lambda: replay_text(text_path, config), number=1, repeat=REPEATS))
+            binary_time = min(timeit.repeat(lambda: replay_binary(binary_path, config), number=1, repeat=REPEATS))
+            same = replay_text(text_path, config) == replay_binary(binary_path, config)
+            slower = binary_time > text_time
+            failed |= slower or not same
+            print(f"{name:>14}: {text_size / binary_size:4.1f}x smaller ({binary_size:,} bytes), "
+                  f"{text_time / binary_time:4.2f}x faster ({count / binary_time:,.0f} commands/sec)"
+                  f"{'' if same else ', OUTPUT DIFFERS'}{', SLOWER THAN TEXT' if slower else ''}")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
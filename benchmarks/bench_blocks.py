@@ -0,0 +1,59 @@
+"""
+Filename: bench_blocks.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks REPEAT blocks against the same commands written out in full.
+    A square walk on a 1000 x 1000 table is repeated with growing counts;
+    once the robot's state cycles, REPEAT skips the rest of the cycle, so its
+    time should stop growing with the count. The run fails if the largest
+    count takes more than --max-ratio times as long as the smallest.
+
+    Usage: python -m benchmarks.bench_blocks [--counts N ...] [--expanded N] [--max-ratio R]
+"""
+import argparse
+import sys
+import timeit
+
+from benchmarks.generators import make_config
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+
+SIZE = 1_000
+BODY = ["MOVE", "MOVE", "MOVE", "RIGHT", "MOVE", "LEFT", "LEFT", "MOVE", "RIGHT"]
+REPEATS = 5
+
+def run_commands(commands):
+    """Runs commands in a fresh session and returns the final report."""
+    sink = ListSink()
+    Session(make_config(SIZE, SIZE), sink).run(commands)
+    return sink.messages[-1]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="REPEAT block benchmark")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10**3, 10**6, 10**12],
+                        help="REPEAT counts to benchmark (default: 1000 1000000 1000000000000)")
+    parser.add_argument("--expanded", type=int, default=10_000,
+                        help="repetitions to also run written out in full (default: 10000)")
+    parser.add_argument("--max-ratio", type=float, default=5.0,
+                        help="fail if the largest count is this many times slower (default: 5.0)")
+    args = parser.parse_args(argv)
+
+    expanded = ["PLACE 0,0,NORTH"] + BODY * args.expanded + ["REPORT"]
+    seconds = min(timeit.repeat(lambda: run_commands(expanded), number=1, repeat=REPEATS))
+    print(f"expanded {args.expanded:>17,}: {seconds * 1e3:8.2f} ms  {run_commands(expanded)}")
+
+    results = []
+    for count in args.counts:
+        commands = ["PLACE 0,0,NORTH", f"REPEAT {count}", *BODY, "END", "REPORT"]
+        seconds = min(timeit.repeat(lambda: run_commands(commands), number=1, repeat=REPEATS))
+        results.append(seconds)
+        print(f"REPEAT   {count:>17,}: {seconds * 1e3:8.2f} ms  {run_commands(commands)}")
+
+    ratio = results[-1] / results[0]
+    print(f"largest/smallest: {ratio:.2f}x (limit {args.max_ratio:.2f}x)")
+    return 0 if ratio <= args.max_ratio else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
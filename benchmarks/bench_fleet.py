@@ -0,0 +1,59 @@
+"""
+Filename: bench_fleet.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks the vectorised Fleet engine against driving one scalar Robot
+    per fleet member. Every robot runs its own random command column.
+
+    Usage: python -m benchmarks.bench_fleet [robots] [commands_per_robot]
+"""
+import random
+import sys
+import time
+
+from toyrobot.command_dispatcher import CommandDispatcher
+from toyrobot.fleet import Fleet
+from toyrobot.output_sink import ListSink
+from toyrobot.robot import Robot
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.table import Table
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+COMMANDS = ["MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 1,2,NORTH", "PLACE 3,0,WEST"]
+WEIGHTS = [10, 3, 3, 1, 1, 1]
+
+def main():
+    robots = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(42)
+    columns = [["PLACE 0,0,NORTH"] + rng.choices(COMMANDS, WEIGHTS, k=length - 1) for _ in range(robots)]
+    table = Table(5, 5)
+    total = robots * length
+
+    start = time.perf_counter()
+    scalar_outputs = []
+    dispatcher = CommandDispatcher(ListSink())
+    for column in columns:
+        sink = ListSink()
+        dispatcher.output_sink = sink
+        robot = Robot(DIRECTIONS, robot_reporter=RobotReporter(sink))
+        for command in column:
+            dispatcher.dispatch(command, robot, table)
+        scalar_outputs.append(sink.messages)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fleet_outputs = Fleet(robots, table, DIRECTIONS).run(columns)
+    fleet_time = time.perf_counter() - start
+
+    print(f"robots: {robots:,}, commands: {total:,}")
+    print(f"scalar: {total / scalar_time:,.0f} commands/sec ({scalar_time:.3f}s)")
+    print(f" fleet: {total / fleet_time:,.0f} commands/sec ({fleet_time:.3f}s)")
+    if fleet_outputs != scalar_outputs:
+        print("Fleet output differs from the scalar robots")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
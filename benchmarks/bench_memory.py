@@ -0,0 +1,98 @@
+"""
+Filename: bench_memory.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks the memory used by robot state. Reports the bytes held per
+    robot for the slotted Robot/Position/Table classes against the previous
+    layout (a __dict__ per instance and a complex-backed Position), and the
+    Position allocations per 1M commands for the allocating
+    ComplexMovementEngine against the in-place LookupMovementEngine.
+
+    Usage: python -m benchmarks.bench_memory [commands]
+"""
+import random
+import sys
+
+from toyrobot.command_dispatcher import CommandDispatcher
+from toyrobot.movement_engine import ComplexMovementEngine, LookupMovementEngine
+from toyrobot.output_sink import ListSink
+from toyrobot.position import Position
+from toyrobot.robot import Robot
+from toyrobot.robot_mover import RobotMover
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.table import Table
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+
+class DictPosition:
+    """The previous Position layout: a complex number in a per-instance __dict__."""
+    def __init__(self, x=0, y=0):
+        self._complex_pos = complex(x, y)
+
+class DictRobot:
+    """The previous Robot layout: every attribute in a per-instance __dict__."""
+    def __init__(self, directions):
+        self.position = DictPosition(1, 2)
+        self.facing_angle = 90
+        self.directions = directions
+        self.table = None
+        self.robot_rotator = None
+        self.robot_reporter = None
+        self.robot_placer = None
+        self.robot_mover = None
+
+def state_bytes(robot):
+    """Returns the bytes held by a robot and its position (components are shared)."""
+    total = 0
+    for obj in (robot, robot.position):
+        total += sys.getsizeof(obj)
+        if hasattr(obj, "__dict__"):
+            total += sys.getsizeof(obj.__dict__)
+            total += sum(sys.getsizeof(value) for value in obj.__dict__.values()
+                         if isinstance(value, complex))
+    return total
+
+def count_position_allocations(engine, commands):
+    """Runs commands with a movement engine and counts the Positions created."""
+    created = 0
+    original_init = Position.__init__
+
+    def counting_init(self, *args, **kwargs):
+        nonlocal created
+        created += 1
+        original_init(self, *args, **kwargs)
+
+    table = Table(5, 5)
+    sink = ListSink()
+    robot = Robot(DIRECTIONS, robot_reporter=RobotReporter(sink), robot_mover=RobotMover(engine))
+    dispatcher = CommandDispatcher(sink)
+    Position.__init__ = counting_init
+    try:
+        for command in commands:
+            dispatcher.dispatch(command, robot, table)
+            if len(sink.records) > 1024:
+                sink.clear()
+    finally:
+        Position.__init__ = original_init
+    return created
+
+def main():
+    commands_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(0)
+    commands = ["PLACE 0,0,NORTH"] + rng.choices(["MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 2,2,EAST"],
+                                                  [80, 7, 7, 5, 1], k=commands_count - 1)
+
+    slotted = Robot(DIRECTIONS)
+    slotted.position = Position(1, 2)
+    slotted.facing_angle = 90
+    print(f"bytes per robot: {state_bytes(DictRobot(DIRECTIONS))} before, {state_bytes(slotted)} after")
+
+    scale = 1_000_000 / commands_count
+    before = count_position_allocations(ComplexMovementEngine(), commands) * scale
+    after = count_position_allocations(LookupMovementEngine(DIRECTIONS), commands) * scale
+    print(f"Position allocations per 1M commands: {before:,.0f} before, {after:,.0f} after")
+
+if __name__ == "__main__":
+    main()
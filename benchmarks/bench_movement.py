@@ -0,0 +1,57 @@
+"""
+Filename: bench_movement.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks the movement engines against each other. Each engine drives
+    a robot through the same sequence of MOVEs and turns on a 5x5 table and
+    the best of several repeats is reported in moves per second.
+
+    Usage: python -m benchmarks.bench_movement [moves]
+"""
+import sys
+import timeit
+
+from toyrobot.movement_engine import ComplexMovementEngine, LookupMovementEngine
+from toyrobot.position import Position
+from toyrobot.robot import Robot
+from toyrobot.robot_mover import RobotMover
+from toyrobot.table import Table
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+REPEATS = 5
+
+def run_moves(mover, moves):
+    """Moves a robot `moves` times, turning left every 7 moves."""
+    table = Table(5, 5)
+    robot = Robot(DIRECTIONS, table=table, robot_mover=mover)
+    robot.position = Position(0, 0)
+    robot.facing_angle = 0
+    for i in range(moves):
+        if i % 7 == 0:
+            robot.robot_rotator.left(robot)
+        mover.move_one_space(robot, table)
+    return robot
+
+def main():
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    engines = [
+        ("complex", ComplexMovementEngine()),
+        ("lookup", LookupMovementEngine(DIRECTIONS)),
+    ]
+
+    results = {}
+    for name, engine in engines:
+        mover = RobotMover(engine)
+        final = run_moves(mover, moves)
+        results[name] = (final.position.x, final.position.y, final.facing_angle)
+        best = min(timeit.repeat(lambda: run_moves(mover, moves), number=1, repeat=REPEATS))
+        print(f"{name:>8}: {moves / best:,.0f} moves/sec ({best:.3f}s for {moves:,} moves)")
+
+    if len(set(results.values())) != 1:
+        print(f"Engines disagree on the final state: {results}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Filename: bench_obstacles.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks obstacle maps with up to millions of obstacles. For a dense
+    table (a bytearray grid) and a huge table (a sparse set), it times
+    blocking the cells, a single blocked-cell check, and a move-heavy
+    command stream through a Session, and compares the check against
+    scanning a plain list of cells.
+
+    Usage: python -m benchmarks.bench_obstacles [--obstacles N ...] [--commands N]
+"""
+import argparse
+import random
+import sys
+import time
+import timeit
+
+from benchmarks.generators import make_config, weighted_stream
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+
+TABLES = (("dense", 2_000), ("sparse", 10**9))
+WEIGHTS = {"MOVE": 80, "LEFT": 5, "RIGHT": 5, "REPORT": 5, "PLACE": 5}
+LIST_SCAN_LIMIT = 10_000  # Larger lists take too long to scan to be worth timing
+REPEATS = 5
+
+def random_cells(rng, count, size):
+    """Returns count random cells on a size x size table."""
+    return [(rng.randrange(size), rng.randrange(size)) for _ in range(count)]
+
+def time_check(obstacles, probes):
+    """Returns the best time per blocked() call in nanoseconds."""
+    blocked = obstacles.blocked
+    best = min(timeit.repeat(lambda: [blocked(x, y) for x, y in probes], number=1, repeat=REPEATS))
+    return best / len(probes) * 1e9
+
+def time_commands(size, cells, commands):
+    """Returns the best time per command in nanoseconds on a table with the given obstacles."""
+    sink = ListSink()
+    session = Session(make_config(size, size), sink)
+    for x, y in cells:
+        session.table.add_obstacle(x, y)
+
+    def run():
+        sink.clear()
+        session.robot.position = None
+        session.run(commands)
+
+    return min(timeit.repeat(run, number=1, repeat=REPEATS)) / len(commands) * 1e9
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Obstacle map benchmarks")
+    parser.add_argument("--obstacles", type=int, nargs="+", default=[0, 10_000, 1_000_000],
+                        help="obstacle counts to benchmark (default: 0 10000 1000000)")
+    parser.add_argument("--commands", type=int, default=100_000, help="commands per run (default: 100000)")
+    args = parser.parse_args(argv)
+
+    for kind, size in TABLES:
+        rng = random.Random(size)
+        commands = weighted_stream(rng, args.commands, WEIGHTS, size, size)
+        probes = random_cells(rng, 100_000, size)
+        print(f"{kind} ({size:,} x {size:,} table)")
+        for count in args.obstacles:
+            cells = random_cells(rng, count, size)
+            start = time.perf_counter()
+            session = Session(make_config(size, size), ListSink())
+            for x, y in cells:
+                session.table.add_obstacle(x, y)
+            build = time.perf_counter() - start
+            obstacles = session.table.obstacles
+            check = f"{time_check(obstacles, probes):5.0f} ns/check" if obstacles is not None else f"{'-':>14}"
+            per_command = time_commands(size, cells, commands)
+            print(f"  {count:>10,} obstacles: build {build:6.2f}s  {check}  {per_command:5.0f} ns/command")
+            if 0 < count <= LIST_SCAN_LIMIT:
+                cell_list = list(cells)
+                scan = min(timeit.repeat(lambda: [cell in cell_list for cell in probes[:100]], number=1,
+                                         repeat=REPEATS)) / 100 * 1e9
+                print(f"  {count:>10,} obstacles as a list: {scan:,.0f} ns/check")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
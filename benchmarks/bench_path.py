@@ -0,0 +1,72 @@
+"""
+Filename: bench_path.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks PATH planning on a table with random obstacles. A stream of
+    queries from random starts towards a small set of popular targets is
+    answered twice: with a fresh PathPlanner per query, which searches the
+    whole table every time, and with one planner whose cached distance
+    tables answer repeat targets in time proportional to the path length.
+    The run fails if the cached planner is less than --min-speedup times
+    faster per query.
+
+    Usage: python -m benchmarks.bench_path [--size N] [--queries N] [--targets N] [--min-speedup S]
+"""
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.generators import DIRECTIONS, DIRECTION_NAMES
+from toyrobot.path_planner import PathPlanner
+from toyrobot.table import Table
+
+OBSTACLE_DENSITY = 0.2
+
+def make_table(rng, size):
+    """Returns a size x size table with about a fifth of its cells blocked, and its free cells."""
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    obstacles = set(rng.sample(cells, int(len(cells) * OBSTACLE_DENSITY)))
+    return Table(size, size, obstacles), [cell for cell in cells if cell not in obstacles]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PATH planning benchmark")
+    parser.add_argument("--size", type=int, default=100, help="table side (default: 100)")
+    parser.add_argument("--queries", type=int, default=2_000, help="queries to answer (default: 2000)")
+    parser.add_argument("--targets", type=int, default=8, help="distinct targets queried (default: 8)")
+    parser.add_argument("--min-speedup", type=float, default=10.0,
+                        help="fail if the cached planner is not this many times faster (default: 10.0)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.size)
+    table, free = make_table(rng, args.size)
+    targets = [(*rng.choice(free), rng.choice(DIRECTION_NAMES)) for _ in range(args.targets)]
+    queries = [((*rng.choice(free), rng.choice(DIRECTION_NAMES)), rng.choice(targets)) for _ in range(args.queries)]
+
+    # Searching the whole table for every query is slow, so only time a sample of them
+    sample = queries[:max(1, args.queries // 100)]
+    start = time.perf_counter()
+    uncached = [PathPlanner(table, DIRECTIONS).path(*query) for query in sample]
+    per_search = (time.perf_counter() - start) / len(sample)
+
+    planner = PathPlanner(table, DIRECTIONS)
+    start = time.perf_counter()
+    paths = [planner.path(*query) for query in queries]
+    per_query = (time.perf_counter() - start) / len(queries)
+
+    if paths[:len(sample)] != uncached:
+        print("FAIL: cached and uncached paths differ")
+        return 1
+    lengths = [len(path) for path in paths if path is not None]
+    speedup = per_search / per_query
+    print(f"{args.size}x{args.size} table, {len(table.obstacles):,} obstacles, "
+          f"mean path {sum(lengths) / max(len(lengths), 1):.1f} commands")
+    print(f"search per query: {per_search * 1e3:8.2f} ms")
+    print(f"cached per query: {per_query * 1e3:8.2f} ms  ({planner.hits:,} hits, {planner.misses:,} misses)")
+    print(f"speedup: {speedup:.1f}x (limit {args.min_speedup:.1f}x)")
+    return 0 if speedup >= args.min_speedup else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Filename: bench_segments.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks replaying one large command file split at PLACE commands.
+    A seeded move-heavy log with occasional PLACEs is written to a temporary
+    file, run serially through a Session, then run with the segment runner
+    for each worker count, and the speedup and parallel efficiency are
+    reported. Every run's output is checked against the serial output.
+
+    Usage: python -m benchmarks.bench_segments [--commands N] [--jobs N ...]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import make_config, weighted_stream
+from toyrobot.output_sink import ListSink
+from toyrobot.segment_runner import run_segmented
+from toyrobot.session import Session
+
+WEIGHTS = {"MOVE": 80, "LEFT": 6, "RIGHT": 6, "REPORT": 6, "PLACE": 2}
+
+def default_jobs():
+    """Returns 1, 2, 4, ... up to the number of cores."""
+    cores = os.cpu_count() or 1
+    jobs = [1]
+    while jobs[-1] * 2 <= cores:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != cores:
+        jobs.append(cores)
+    return jobs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segmented replay benchmark")
+    parser.add_argument("--commands", type=int, default=2_000_000, help="commands in the log (default: 2000000)")
+    parser.add_argument("--jobs", type=int, nargs="+", help="worker counts to benchmark (default: 1 2 4 ... cores)")
+    args = parser.parse_args(argv)
+
+    config = make_config()
+    commands = weighted_stream(random.Random(0), args.commands, WEIGHTS)
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write("\n".join(commands) + "\n")
+        size = os.path.getsize(path)
+
+        sink = ListSink()
+        start = time.perf_counter()
+        with open(path) as f:
+            Session(config, sink).run(f)
+        serial = time.perf_counter() - start
+        expected = sink.records
+        print(f"{args.commands:,} commands ({size / 1e6:,.1f} MB), serial: {serial:.2f}s")
+
+        for jobs in args.jobs or default_jobs():
+            sink = ListSink()
+            summary = run_segmented(path, config, sink, jobs=jobs)
+            if sink.records != expected:
+                print(f"{jobs} workers: output differs from the serial run")
+                return 1
+            speedup = serial / summary.seconds
+            print(f"  {jobs:>3} workers, {summary.segments:>4} segments: {summary.seconds:6.2f}s  "
+                  f"speedup {speedup:5.2f}x  efficiency {speedup / jobs:4.0%}")
+    finally:
+        os.remove(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Filename: bench_server.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Load generator for the network server. Opens many concurrent sessions,
+    each streaming a seeded move-heavy workload followed by EXIT, and reports
+    the sessions held open and the sustained commands/sec. Without --serve or
+    --unix-socket, the server is started in-process on an ephemeral port, so
+    the server and all clients share one event loop on a single core.
+
+    Usage: python -m benchmarks.bench_server [--sessions N] [--commands N]
+           [--serve HOST:PORT | --unix-socket PATH]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.generators import move_heavy
+from toyrobot.server import RobotServer, parse_address
+
+CHUNK_LINES = 1024
+
+
+async def run_client(connect, commands):
+    """
+    Streams commands over one connection while reading its output.
+
+    Returns:
+        int: The number of output lines received.
+    """
+    reader, writer = await connect()
+
+    async def send():
+        for start in range(0, len(commands), CHUNK_LINES):
+            writer.write("".join(line + "\n" for line in commands[start:start + CHUNK_LINES]).encode())
+            await writer.drain()
+
+    async def receive():
+        lines = 0
+        while await reader.readline():
+            lines += 1
+        return lines
+
+    _, lines = await asyncio.gather(send(), receive())
+    writer.close()
+    await writer.wait_closed()
+    return lines
+
+
+async def run_load(sessions, commands_per_session, address=None, unix_path=None):
+    """Runs the load and returns (commands, output lines, seconds, server or None)."""
+    server = None
+    listener = None
+    if address is None and unix_path is None:
+        config, _ = move_heavy(1)
+        server = RobotServer(config)
+        listener = await server.start("127.0.0.1", 0)
+        address = listener.sockets[0].getsockname()[:2]
+
+    if unix_path is not None:
+        connect = lambda: asyncio.open_unix_connection(unix_path)
+    else:
+        connect = lambda: asyncio.open_connection(*address)
+
+    workloads = [move_heavy(commands_per_session - 1, seed)[1] + ["EXIT"] for seed in range(sessions)]
+    start = time.perf_counter()
+    lines = await asyncio.gather(*(run_client(connect, commands) for commands in workloads))
+    seconds = time.perf_counter() - start
+
+    if listener is not None:
+        listener.close()
+        await listener.wait_closed()
+    return sessions * commands_per_session, sum(lines), seconds, server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the robot server")
+    parser.add_argument("--sessions", type=int, default=200, help="concurrent sessions (default: 200)")
+    parser.add_argument("--commands", type=int, default=5000, help="commands per session (default: 5000)")
+    parser.add_argument("--serve", metavar="HOST:PORT", help="connect to a running TCP server")
+    parser.add_argument("--unix-socket", metavar="PATH", help="connect to a running Unix-socket server")
+    args = parser.parse_args()
+
+    address = parse_address(args.serve) if args.serve else None
+    commands, lines, seconds, server = asyncio.run(
+        run_load(args.sessions, args.commands, address, args.unix_socket))
+    print(f"sessions: {args.sessions:,} concurrent, commands: {commands:,}, output lines: {lines:,}")
+    print(f"{commands / seconds:,.0f} commands/sec, {args.sessions / seconds:,.1f} sessions/sec ({seconds:.3f}s)")
+    if server is not None:
+        print(f"server: {server}")
+
+
+if __name__ == "__main__":
+    main()
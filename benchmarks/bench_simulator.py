@@ -0,0 +1,92 @@
+"""
+Filename: bench_simulator.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks the Simulator library API against printing and capturing
+    stdout. The capture path builds a Table, Robot and components for every
+    job the way run.py does, runs each command through process_command with
+    stdout redirected, and sorts the captured lines into reports, errors and
+    ignored commands. The Simulator is built once and reused for every job.
+    Many short jobs and one long job are run both ways; the results must
+    match, and the run fails if the Simulator's speedup over the capture
+    path is below --min-speedup.
+
+    Usage: python -m benchmarks.bench_simulator [--jobs N] [--job-commands N] [--long N] [--min-speedup S]
+"""
+import argparse
+import io
+import sys
+import timeit
+from contextlib import redirect_stdout
+
+from benchmarks.generators import make_config, invalid_heavy, move_heavy
+from run import process_command
+from toyrobot.config import compile_config
+from toyrobot.robot import Robot
+from toyrobot.robot_mover import RobotMover
+from toyrobot.robot_placer import RobotPlacer
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.robot_rotator import RobotRotator
+from toyrobot.simulator import Simulator
+from toyrobot.table import Table
+
+REPEATS = 3
+
+def run_captured(config, commands):
+    """Runs commands by printing to captured stdout, and sorts the lines into (reports, errors, ignored)."""
+    table = Table(config.width, config.length)
+    robot = Robot(config.directions, RobotRotator(), RobotReporter(), table, RobotPlacer(), RobotMover())
+    with redirect_stdout(io.StringIO()) as stdout:
+        for command in commands:
+            process_command(command, robot, table)
+    reports, errors, ignored = [], [], []
+    for line in stdout.getvalue().splitlines():
+        if line.startswith("Error"):
+            errors.append(line)
+        elif line.startswith("Command ignored"):
+            ignored.append(line)
+        else:
+            reports.append(line)
+    return reports, errors, ignored
+
+def run_simulator(simulator, commands):
+    """Runs commands through a reused Simulator and returns (reports, errors, ignored)."""
+    result = simulator.run(commands)
+    return result.reports, result.errors, result.ignored
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulator API vs print-and-capture benchmark")
+    parser.add_argument("--jobs", type=int, default=2_000, help="number of short jobs (default: 2000)")
+    parser.add_argument("--job-commands", type=int, default=50, help="commands per short job (default: 50)")
+    parser.add_argument("--long", type=int, default=200_000, help="commands in the long job (default: 200000)")
+    parser.add_argument("--min-speedup", type=float, default=0.9,
+                        help="fail if the Simulator is not at least this many times as fast (default: 0.9)")
+    args = parser.parse_args(argv)
+
+    config = compile_config(make_config())
+    simulator = Simulator(config)
+    workloads = {
+        f"{args.jobs} x {args.job_commands} commands": [invalid_heavy(args.job_commands, seed)[1]
+                                                        for seed in range(args.jobs)],
+        f"1 x {args.long} commands": [move_heavy(args.long)[1]],
+    }
+
+    failed = False
+    print(f"{'workload':<26} {'capture ms':>11} {'simulator ms':>13} {'speedup':>8}")
+    for name, jobs in workloads.items():
+        if [run_captured(config, job) for job in jobs] != [run_simulator(simulator, job) for job in jobs]:
+            print(f"{name}: results differ")
+            failed = True
+            continue
+        captured = min(timeit.repeat(lambda: [run_captured(config, job) for job in jobs], number=1, repeat=REPEATS))
+        simulated = min(timeit.repeat(lambda: [run_simulator(simulator, job) for job in jobs], number=1,
+                                      repeat=REPEATS))
+        speedup = captured / simulated
+        failed |= speedup < args.min_speedup
+        print(f"{name:<26} {captured * 1e3:>11.1f} {simulated * 1e3:>13.1f} {speedup:>7.2f}x")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
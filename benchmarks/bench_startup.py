@@ -0,0 +1,84 @@
+"""
+Filename: bench_startup.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Startup benchmark for short-lived runs. Times `python run.py FILE` on a
+    three-command file against a bare interpreter start, and checks which
+    modules the run imports. Fails (exit status 1) if the startup overhead
+    is over budget or if a module that plain file runs should never need
+    (the server, batch runner, argparse, json, ...) is imported.
+
+    Usage: python -m benchmarks.bench_startup [--runs N] [--budget-ms MS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMANDS = "PLACE 0,0,NORTH\nMOVE\nREPORT\n"
+
+# Milliseconds a run may take on top of a bare interpreter start
+DEFAULT_BUDGET_MS = 60.0
+
+# Modules that are only imported by the options that need them
+LAZY_MODULES = (
+    "argparse", "asyncio", "concurrent.futures", "json", "multiprocessing", "numpy", "queue", "re",
+    "threading", "toyrobot.all_starts", "toyrobot.analytics", "toyrobot.batch_runner", "toyrobot.binary_format",
+    "toyrobot.blocks", "toyrobot.fast_forward", "toyrobot.fleet", "toyrobot.instrumentation", "toyrobot.path_planner",
+    "toyrobot.server",
+)
+
+def time_runs(command, runs):
+    """Runs a command repeatedly and returns the median wall time in milliseconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def imported_modules(command):
+    """Returns the names of the modules a command imports, from -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *command], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return {line.rpartition("|")[2].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup benchmark for short-lived runs")
+    parser.add_argument("--runs", type=int, default=30, help="runs of each command (default: 30)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"allowed startup overhead in milliseconds (default: {DEFAULT_BUDGET_MS:g})")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "commands.txt")
+        with open(path, 'w') as f:
+            f.write(COMMANDS)
+        run = ["run.py", path]
+        subprocess.run([sys.executable, *run], cwd=ROOT, stdout=subprocess.DEVNULL, check=True)  # Warms the caches
+
+        bare = time_runs([sys.executable, "-c", "pass"], args.runs)
+        full = time_runs([sys.executable, *run], args.runs)
+        eager = sorted(name for name in imported_modules(run) - imported_modules(["-c", "pass"])
+                       if name in LAZY_MODULES)
+
+    overhead = full - bare
+    print(f"interpreter: {bare:.1f} ms, run.py: {full:.1f} ms, overhead: {overhead:.1f} ms "
+          f"(budget {args.budget_ms:g} ms)")
+    failed = False
+    if overhead > args.budget_ms:
+        print(f"FAIL: startup overhead is {overhead - args.budget_ms:.1f} ms over budget")
+        failed = True
+    if eager:
+        print(f"FAIL: imported modules that should be lazy: {', '.join(eager)}")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Filename: bench_suite.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmark suite for the whole command pipeline and its components.
+    Every workload from generators.py is run through a Session exactly as
+    run.py runs a file, and each component (tokenizer, placer, mover,
+    rotator, reporter) is timed on its own. For each benchmark the suite
+    reports commands/sec, per-command latency percentiles and peak memory,
+    and compares throughput against a stored baseline file.
+
+    Usage:
+        python -m benchmarks.bench_suite                  # compare against the baseline
+        python -m benchmarks.bench_suite --save-baseline  # record a new baseline
+
+    Exits with status 1 if any benchmark's throughput falls more than the
+    threshold below its baseline.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generators import WORKLOADS, make_config
+from toyrobot.command_parser import tokenize
+from toyrobot.output_sink import StdoutSink, ListSink, DEFAULT_FLUSH_EVERY
+from toyrobot.position import Position
+from toyrobot.robot import Robot
+from toyrobot.robot_mover import RobotMover
+from toyrobot.robot_placer import RobotPlacer
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.robot_rotator import RobotRotator
+from toyrobot.session import Session
+from toyrobot.table import Table
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.3
+LATENCY_PERCENTILES = (50, 90, 99)
+
+class BenchmarkResult:
+    def __init__(self, name, operations, seconds, latencies_ns, peak_bytes):
+        """
+        Initialise the result of a single benchmark.
+
+        Args:
+            name (str): Benchmark name, e.g. "pipeline.move_heavy".
+            operations (int): Number of commands or calls timed.
+            seconds (float): Best wall clock time for all operations.
+            latencies_ns (list): Per-operation latencies in nanoseconds.
+            peak_bytes (int): Peak memory allocated while running.
+        """
+        self.name = name
+        self.operations = operations
+        self.per_second = operations / max(seconds, 1e-9)
+        self.percentiles = percentiles(latencies_ns, LATENCY_PERCENTILES)
+        self.peak_bytes = peak_bytes
+
+    def __str__(self):
+        latency = "  ".join(f"p{p}={self.percentiles[p] / 1000:7.2f}us" for p in LATENCY_PERCENTILES)
+        return (f"{self.name:<26} {self.per_second:>13,.0f}/sec  {latency}  "
+                f"peak={self.peak_bytes / 1024:8.1f}KiB")
+
+def percentiles(values, points):
+    """Returns the nearest-rank percentiles of a list of values."""
+    ordered = sorted(values)
+    if not ordered:
+        return {p: 0 for p in points}
+    return {p: ordered[min(len(ordered) - 1, len(ordered) * p // 100)] for p in points}
+
+def measure(name, operations, run_all, run_one, repeat):
+    """
+    Measures throughput, latency and peak memory of a benchmark.
+
+    Args:
+        name (str): Benchmark name.
+        operations (int): Number of operations performed by run_all().
+        run_all: Callable that performs every operation once, untimed per call.
+        run_one: Callable taking an operation index, used for latency sampling.
+        repeat (int): Number of throughput runs; the best is kept.
+    """
+    run_all()  # Warm up caches before timing
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_all()
+        best = min(best, time.perf_counter() - start)
+
+    clock = time.perf_counter_ns
+    latencies = []
+    for index in range(operations):
+        start = clock()
+        run_one(index)
+        latencies.append(clock() - start)
+
+    tracemalloc.start()
+    run_all()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return BenchmarkResult(name, operations, best, latencies, peak)
+
+def bench_pipeline(name, config, commands, repeat):
+    """Benchmarks a workload through a Session, as run.py runs a file."""
+    with open(os.devnull, 'w') as devnull:
+        def new_session():
+            return Session(config, StdoutSink(devnull, flush_every=DEFAULT_FLUSH_EVERY))
+
+        def run_all():
+            session = new_session()
+            session.run(commands)
+            session.output_sink.flush()
+
+        session = new_session()
+        dispatch = session.dispatcher.dispatch
+
+        def run_one(index):
+            dispatch(commands[index], session.robot, session.table)
+
+        return measure(f"pipeline.{name}", len(commands), run_all, run_one, repeat)
+
+def bench_components(operations, repeat):
+    """Benchmarks each component on its own."""
+    config = make_config()
+    directions = config["directions"]
+    table = Table(5, 5)
+    robot = Robot(directions, robot_reporter=RobotReporter(ListSink()))
+    robot.position = Position(2, 2)
+    robot.facing_angle = 90
+
+    placer = RobotPlacer()
+    mover = RobotMover()
+    rotator = RobotRotator()
+    reporter = robot.robot_reporter
+    place_arguments = [f"{i % 5},{i // 5 % 5},{name}" for i, name in enumerate(list(directions) * 7)]
+    lines = ["MOVE\n", "LEFT\n", "REPORT\n", "PLACE 1,2,NORTH\n", "JUMP\n"]
+
+    def tokenize_one(index):
+        tokenize(lines[index % len(lines)])
+
+    def place_one(index):
+        placer.try_place(place_arguments[index % len(place_arguments)], robot, table)
+
+    def move_one(index):
+        mover.move_one_space(robot, table)
+        if index % 4 == 0:
+            rotator.left(robot)
+
+    def rotate_one(index):
+        rotator.left(robot)
+
+    def report_one(index):
+        reporter.report(robot)
+        if index % 1024 == 0:
+            reporter.output_sink.clear()
+
+    results = []
+    for name, run_one in (("tokenizer", tokenize_one), ("placer", place_one), ("mover", move_one),
+                          ("rotator", rotate_one), ("reporter", report_one)):
+        def run_all(run_one=run_one):
+            for index in range(operations):
+                run_one(index)
+        results.append(measure(f"component.{name}", operations, run_all, run_one, repeat))
+        reporter.output_sink.clear()
+    return results
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Compares throughput against a baseline.
+
+    Returns:
+        list: Descriptions of the benchmarks that regressed past the threshold.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected and result.per_second < expected * (1 - threshold):
+            change = result.per_second / expected - 1
+            regressions.append(f"{result.name}: {result.per_second:,.0f}/sec vs baseline "
+                               f"{expected:,.0f}/sec ({change:+.0%})")
+    return regressions
+
+def parse_args(argv=None):
+    """Parses the command line arguments."""
+    parser = argparse.ArgumentParser(description="Toy Robot benchmark suite")
+    parser.add_argument("--commands", type=int, default=100_000,
+                        help="commands per workload and calls per component (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="throughput runs, best kept (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the workload generators")
+    parser.add_argument("--only", nargs="+", metavar="NAME",
+                        help="only run benchmarks whose name contains one of these strings")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed fractional throughput drop (default: {DEFAULT_THRESHOLD})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    def selected(name):
+        return not args.only or any(part in name for part in args.only)
+
+    results = []
+    for name, generate in WORKLOADS.items():
+        if selected(f"pipeline.{name}"):
+            config, commands = generate(args.commands, seed=args.seed)
+            results.append(bench_pipeline(name, config, commands, args.repeat))
+            print(results[-1])
+    if selected("component."):
+        for result in bench_components(args.commands, args.repeat):
+            if selected(result.name):
+                results.append(result)
+                print(result)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({result.name: round(result.per_second) for result in results}, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Filename: bench_table_size.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks the cost of a command as the table grows, from 5x5 up to
+    10**18 units per side, well past the 2**53 limit of exact float
+    coordinates. Every size runs the same mix of PLACE, MOVE, LEFT, RIGHT and
+    REPORT through a Session, and the best of several repeats is reported in
+    nanoseconds per command. Fails (exit status 1) if the slowest size costs
+    more than --max-ratio times the fastest.
+
+    Usage: python -m benchmarks.bench_table_size [--commands N] [--max-ratio R]
+"""
+import argparse
+import random
+import sys
+import timeit
+
+from benchmarks.generators import make_config, weighted_stream
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+
+SIZES = (5, 1_000, 1_000_000, 2**53 + 1, 10**18)
+WEIGHTS = {"MOVE": 80, "LEFT": 5, "RIGHT": 5, "REPORT": 5, "PLACE": 5}
+REPEATS = 5
+DEFAULT_MAX_RATIO = 1.5
+
+def time_size(size, count):
+    """Returns the best time per command, in nanoseconds, on a table of the given size."""
+    commands = weighted_stream(random.Random(size), count, WEIGHTS, size, size)
+    sink = ListSink()
+
+    def run():
+        sink.clear()
+        Session(make_config(size, size), sink).run(commands)
+
+    return min(timeit.repeat(run, number=1, repeat=REPEATS)) / count * 1e9
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-command cost by table size")
+    parser.add_argument("--commands", type=int, default=200_000, help="commands per run (default: 200000)")
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO,
+                        help=f"allowed slowest/fastest cost ratio (default: {DEFAULT_MAX_RATIO:g})")
+    args = parser.parse_args(argv)
+
+    costs = {}
+    for size in SIZES:
+        costs[size] = time_size(size, args.commands)
+        print(f"{size:>25,}: {costs[size]:7.0f} ns/command")
+
+    ratio = max(costs.values()) / min(costs.values())
+    print(f"slowest/fastest: {ratio:.2f} (limit {args.max_ratio:g})")
+    if ratio > args.max_ratio:
+        print("FAIL: per-command cost depends on the table size")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Filename: bench_world.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Benchmarks the multi-robot World as the number of robots grows. Robots
+    are placed on distinct cells of a 1000 x 1000 table, then a stream of
+    named MOVE, LEFT, RIGHT and REPORT commands is routed to random robots.
+    Routing and collision checks are hash lookups, so the cost per command
+    should stay flat; the run fails if the largest world is more than
+    --max-ratio times slower per command than the smallest.
+
+    Usage: python -m benchmarks.bench_world [--robots N ...] [--commands N] [--max-ratio R]
+"""
+import argparse
+import random
+import sys
+import time
+import timeit
+
+from benchmarks.generators import make_config, DIRECTION_NAMES
+from toyrobot.output_sink import ListSink
+from toyrobot.world import World
+
+SIZE = 1_000
+WEIGHTS = {"MOVE": 80, "LEFT": 8, "RIGHT": 8, "REPORT": 4}
+REPEATS = 5
+
+def place_commands(rng, count):
+    """Returns PLACE commands for count robots on distinct random cells."""
+    cells = rng.sample(range(SIZE * SIZE), count)
+    return [f"PLACE R{i} {cell % SIZE},{cell // SIZE},{rng.choice(DIRECTION_NAMES)}" for i, cell in enumerate(cells)]
+
+def robot_commands(rng, robots, count):
+    """Returns count commands, each for a random robot."""
+    choices = list(WEIGHTS)
+    keywords = rng.choices(choices, [WEIGHTS[c] for c in choices], k=count)
+    return [f"R{rng.randrange(robots)} {keyword}" for keyword in keywords]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-robot world scaling benchmark")
+    parser.add_argument("--robots", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="robot counts to benchmark (default: 1000 10000 100000)")
+    parser.add_argument("--commands", type=int, default=200_000, help="commands per run (default: 200000)")
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="fail if the largest world is this many times slower per command (default: 2.0)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in args.robots:
+        rng = random.Random(count)
+        sink = ListSink()
+        world = World(make_config(SIZE, SIZE), sink)
+        start = time.perf_counter()
+        world.run(place_commands(rng, count))
+        placed = time.perf_counter() - start
+        commands = robot_commands(rng, count, args.commands)
+
+        def run():
+            sink.clear()
+            world.run(commands)
+
+        per_command = min(timeit.repeat(run, number=1, repeat=REPEATS)) / len(commands) * 1e9
+        results.append(per_command)
+        print(f"{count:>9,} robots: placed in {placed:5.2f}s  {per_command:6.0f} ns/command  "
+              f"{world.collisions:,} collisions  {len(world.occupancy):,} occupied cells")
+
+    ratio = results[-1] / results[0]
+    print(f"largest/smallest: {ratio:.2f}x (limit {args.max_ratio:.2f}x)")
+    return 0 if ratio <= args.max_ratio else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
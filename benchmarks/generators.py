@@ -0,0 +1,72 @@
+"""
+Filename: generators.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Seeded generators for synthetic command streams. Each workload returns
+    the configuration to run it with and a list of command lines, and the
+    same seed always produces the same stream.
+"""
+import random
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+DIRECTION_NAMES = list(DIRECTIONS)
+
+def make_config(width=5, length=5):
+    """Returns a configuration dictionary in the format of config.json."""
+    return {"table_size": {"width": width, "length": length}, "directions": dict(DIRECTIONS)}
+
+def random_place(rng, width, length):
+    """Returns a valid PLACE command for a table of the given size."""
+    return f"PLACE {rng.randrange(length)},{rng.randrange(width)},{rng.choice(DIRECTION_NAMES)}"
+
+def weighted_stream(rng, count, weights, width=5, length=5):
+    """
+    Generates a stream that starts with a PLACE and continues with commands
+    chosen by weight. A weight keyed "PLACE" produces random valid PLACEs.
+    """
+    choices = list(weights)
+    commands = [random_place(rng, width, length)]
+    for choice in rng.choices(choices, [weights[c] for c in choices], k=count - 1):
+        commands.append(random_place(rng, width, length) if choice == "PLACE" else choice)
+    return commands
+
+def move_heavy(count, seed=0):
+    """Mostly MOVEs with occasional turns, the common replay workload."""
+    rng = random.Random(seed)
+    return make_config(), weighted_stream(rng, count, {"MOVE": 85, "LEFT": 6, "RIGHT": 6, "REPORT": 3})
+
+def report_heavy(count, seed=0):
+    """Every other command is a REPORT, so output dominates."""
+    rng = random.Random(seed)
+    return make_config(), weighted_stream(rng, count, {"REPORT": 50, "MOVE": 30, "LEFT": 10, "RIGHT": 10})
+
+def invalid_heavy(count, seed=0):
+    """Mostly malformed or unknown commands that exercise the error paths."""
+    rng = random.Random(seed)
+    invalid = ["JUMP", "PLACE", "PLACE 9,9,NORTH", "PLACE 1,NORTH", "PLACE 1,1,UP", "PLACE a,b,NORTH"]
+    commands = ["MOVE", "REPORT"]  # Ignored because the robot has not been placed yet
+    for _ in range(count - len(commands)):
+        commands.append(rng.choice(invalid) if rng.random() < 0.8 else rng.choice(["MOVE", "LEFT"]))
+    return make_config(), commands
+
+def many_place(count, seed=0):
+    """Mostly PLACE commands, exercising argument parsing."""
+    rng = random.Random(seed)
+    return make_config(), weighted_stream(rng, count, {"PLACE": 60, "MOVE": 25, "REPORT": 15})
+
+def large_table(count, seed=0, size=1_000_000):
+    """A move-heavy stream on a very large table, with PLACEs spread across it."""
+    rng = random.Random(seed)
+    weights = {"MOVE": 80, "LEFT": 5, "RIGHT": 5, "REPORT": 5, "PLACE": 5}
+    return make_config(size, size), weighted_stream(rng, count, weights, size, size)
+
+# Workloads by name, in the order they are reported
+WORKLOADS = {
+    "move_heavy": move_heavy,
+    "report_heavy": report_heavy,
+    "invalid_heavy": invalid_heavy,
+    "many_place": many_place,
+    "large_table": large_table,
+}
@@ -9,123 +9,446 @@ Description:
     and coordinates the robot's actions on the table.
 """
 
-from toyrobot.robot import Robot
-from toyrobot.robot_rotator import RobotRotator
-from toyrobot.robot_reporter import RobotReporter
-from toyrobot.table import Table
-from toyrobot.robot_placer import RobotPlacer
-from toyrobot.robot_mover import RobotMover
+from toyrobot.config import load_config
+from toyrobot.session import Session, DEFAULT_IDLE_TIMEOUT
+from toyrobot.command_dispatcher import CommandDispatcher, STATUS_EXIT
+from toyrobot.command_parser import tokenize
+from toyrobot.command_source import open_command_source, is_binary_command_file, STDIN_SOURCE
+from toyrobot.checkpoint import CheckpointRunner, DEFAULT_CHECKPOINT_INTERVAL
+from toyrobot.output_sink import StdoutSink, KIND_ERROR, DEFAULT_FLUSH_EVERY
 import sys
-import json
 
-def load_config():
+# Modules only some runs need (batch, server, world, parallel, fast-forward,
+# binary files, instrumentation, argparse, json) are imported where they are used,
+# so running a small command file loads as little as possible.
+
+_default_dispatcher = CommandDispatcher()
+
+def process_command(command, robot, table, dispatcher=None):
     """
-    Loads the configuration from the config.json file.
+    Process a single command for the robot.
+
+    Returns:
+        int: The dispatcher status code for the command.
     """
-    try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-        return config
-    except FileNotFoundError:
-        print("Error: config.json file not found. Using default configuration.")
-        return {
-            "table_size": {"width": 5, "length": 5},
-            "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
-        }
-    except json.JSONDecodeError as e:
-        print(f"Error: Failed to parse config.json - {e}. Using default configuration.")
-        return {
-            "table_size": {"width": 5, "length": 5},
-            "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
-        }
-
-def process_command(command, robot, table):
-    """Process a single command for the robot."""
-    command = command.strip()
-    if not command:
+    status = (dispatcher or _default_dispatcher).dispatch(command, robot, table)
+    if status == STATUS_EXIT:
+        sys.exit(0)
+    return status
+
+def run_commands(commands, robot, table, dispatcher=None):
+    """Process each command from an iterable of command lines, in order."""
+    dispatcher = dispatcher or _default_dispatcher
+    dispatch = dispatcher.dispatch
+    for command in commands:
+        if dispatch(command, robot, table) == STATUS_EXIT:
+            sys.exit(0)
+    dispatcher.finish()
+
+def run_commands_fast_forward(commands, robot, table, dispatcher=None):
+    """
+    Process an iterable of command lines, folding runs of MOVE and turn
+    commands into single updates, and report how many commands were folded.
+    """
+    run_tokens(map(tokenize, commands), robot, table, dispatcher, fast_forward=True)
+
+def run_tokens(tokens, robot, table, dispatcher=None, fast_forward=False):
+    """
+    Process an iterable of already tokenized (opcode, argument) commands,
+    e.g. from a binary command file, optionally folding runs of MOVE and turn commands.
+    """
+    dispatcher = dispatcher or _default_dispatcher
+    if fast_forward:
+        from toyrobot.fast_forward import FastForwardRunner
+        runner = FastForwardRunner(dispatcher)
+        try:
+            status = runner.run_tokens(tokens, robot, table)
+        finally:
+            print(f"Fast-forward folded {runner.folded} commands", file=sys.stderr)
+        if status == STATUS_EXIT:
+            sys.exit(0)
         return
-        
-    split_command = command.split(' ')
-    first_word = split_command[0].strip().upper()
-    
-    if first_word == "PLACE" and len(split_command) > 1:
-        place_arguments = split_command[1]
+
+    execute = dispatcher.execute
+    for opcode, argument in tokens:
+        if execute(opcode, argument, robot, table) == STATUS_EXIT:
+            sys.exit(0)
+    dispatcher.finish()
+
+def run_commands_checkpointed(source, args, robot, table, dispatcher, output_sink):
+    """
+    Process a command file, saving a checkpoint every --checkpoint-interval
+    commands, and optionally resuming from the last checkpoint.
+    """
+    runner = CheckpointRunner(dispatcher, args.checkpoint, args.checkpoint_interval, output_sink)
+    status = runner.run(source, robot, table, resume=args.resume)
+    if status == STATUS_EXIT:
+        sys.exit(0)
+
+def default_args(file=None):
+    """
+    Returns the arguments for a run with no options, as parse_args would,
+    without importing argparse.
+    """
+    from types import SimpleNamespace
+    return SimpleNamespace(
+        file=file, batch=None, jobs=None, output_dir=None, serve=None, unix_socket=None,
+        idle_timeout=DEFAULT_IDLE_TIMEOUT, mmap=False, fast_forward=False, checkpoint=None,
+        checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, resume=False, stats=False, stats_file=None,
+        analytics=None, all_starts=False, world=False, parallel=False, format="text",
+        flush_every=DEFAULT_FLUSH_EVERY, background_writer=False,
+    )
+
+def parse_args(argv=None):
+    """
+    Parses the command line arguments.
+
+    The common case of a single command file (or none) with no options is
+    handled without building the argparse parser.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) <= 1 and not (argv and argv[0].startswith("-") and argv[0] != STDIN_SOURCE):
+        return default_args(*argv)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+    if args.checkpoint and (args.fast_forward or args.mmap):
+        parser.error("--checkpoint cannot be combined with --fast-forward or --mmap")
+    if args.checkpoint and args.file in (None, STDIN_SOURCE):
+        parser.error("--checkpoint needs a command file, as stdin cannot be resumed from an offset")
+    if args.serve:
+        from toyrobot.server import parse_address
         try:
-            robot.robot_placer.place(place_arguments, robot, table)
-        except Exception as e:
-            print(f"Error: Invalid PLACE command - {e}")
-    elif robot.position is None:
-        print("Command ignored: Robot not placed on the table.")
+            parse_address(args.serve)
+        except ValueError as error:
+            parser.error(f"--serve: {error}")
+    if not args.idle_timeout > 0:
+        parser.error("--idle-timeout must be greater than 0")
+    if args.checkpoint and args.checkpoint_interval < 1:
+        parser.error("--checkpoint-interval must be at least 1")
+    if args.stats_file:
+        args.stats = True
+    if args.stats and args.batch:
+        parser.error("--stats is not supported with --batch")
+    if args.stats and args.fast_forward:
+        parser.error("--stats cannot be combined with --fast-forward, which folds commands without running them")
+    if args.world and (args.batch or args.serve or args.unix_socket or args.fast_forward or args.checkpoint
+                       or args.stats):
+        parser.error("--world cannot be combined with --batch, --serve, --unix-socket, --fast-forward, "
+                     "--checkpoint or --stats")
+    if args.parallel and (args.batch or args.serve or args.unix_socket or args.world or args.fast_forward
+                          or args.checkpoint or args.stats):
+        parser.error("--parallel cannot be combined with --batch, --serve, --unix-socket, --world, "
+                     "--fast-forward, --checkpoint or --stats")
+    if args.analytics and (args.batch or args.serve or args.unix_socket or args.world or args.parallel):
+        parser.error("--analytics cannot be combined with --batch, --serve, --unix-socket, --world or --parallel")
+    if args.analytics and not args.analytics.lower().endswith((".npy", ".csv")):
+        parser.error("--analytics must name a .npy or .csv file")
+    if args.all_starts and (args.batch or args.serve or args.unix_socket or args.world or args.parallel
+                            or args.fast_forward or args.checkpoint or args.stats or args.analytics):
+        parser.error("--all-starts cannot be combined with --batch, --serve, --unix-socket, --world, --parallel, "
+                     "--fast-forward, --checkpoint, --stats or --analytics")
+    if args.all_starts and args.file is None:
+        parser.error("--all-starts needs a command file, or - to read from stdin")
+    if args.parallel and args.file in (None, STDIN_SOURCE):
+        parser.error("--parallel needs a command file")
+    return args
+
+def build_parser():
+    """Builds the argparse parser for the command line options."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Toy Robot Simulator")
+    parser.add_argument("file", nargs="?",
+                        help="command file to run, or - to read from stdin (default: interactive)")
+    parser.add_argument("--batch", nargs="+", metavar="PATH",
+                        help="run many command files (paths or glob patterns), each with its own robot")
+    parser.add_argument("--jobs", type=int, metavar="N",
+                        help="number of worker processes for --batch and --parallel (default: one per core)")
+    parser.add_argument("--output-dir", metavar="DIR",
+                        help="write each --batch file's output to DIR/<name>.out instead of stdout")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="run as a TCP server with one robot session per connection")
+    parser.add_argument("--unix-socket", metavar="PATH",
+                        help="run as a Unix-socket server with one robot session per connection")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, metavar="SECONDS",
+                        help=f"close server connections idle for this long (default: {DEFAULT_IDLE_TIMEOUT:g})")
+    parser.add_argument("--mmap", action="store_true",
+                        help="memory-map the command file instead of reading it in chunks")
+    parser.add_argument("--fast-forward", action="store_true",
+                        help="fold runs of MOVE and LEFT/RIGHT commands into single updates")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="periodically save the robot state and input offset to PATH")
+    parser.add_argument("--checkpoint-interval", type=int, default=DEFAULT_CHECKPOINT_INTERVAL, metavar="N",
+                        help=f"commands between checkpoints (default: {DEFAULT_CHECKPOINT_INTERVAL})")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from the --checkpoint file if it exists")
+    parser.add_argument("--stats", action="store_true",
+                        help="record per-command counts and latencies and write them as JSON to stderr at exit")
+    parser.add_argument("--stats-file", metavar="PATH",
+                        help="write the --stats JSON to PATH instead of stderr (implies --stats)")
+    parser.add_argument("--analytics", metavar="PATH",
+                        help="count the cells the robot visits and the MOVEs clamped at the edge, "
+                             "and write them to PATH (.npy or .csv) at exit and on HEATMAP")
+    parser.add_argument("--all-starts", action="store_true",
+                        help="run the command file from every legal PLACE X,Y,F start at once and "
+                             "print each start's final state and reports")
+    parser.add_argument("--world", action="store_true",
+                        help="run many named robots on one table (PLACE R1 0,0,NORTH, R1 MOVE, ...)")
+    parser.add_argument("--parallel", action="store_true",
+                        help="split the command file at PLACE commands and run the parts on all cores")
+    parser.add_argument("--format", choices=("text", "jsonl"), default="text",
+                        help="output format (default: text)")
+    parser.add_argument("--flush-every", type=int, default=DEFAULT_FLUSH_EVERY, metavar="N",
+                        help=f"lines of output to buffer before writing when reading "
+                             f"from a file or pipe (default: {DEFAULT_FLUSH_EVERY})")
+    parser.add_argument("--background-writer", action="store_true",
+                        help="write output on a background thread")
+    return parser
+
+def create_output_sink(args, interactive):
+    """Creates the output sink selected by the command line arguments."""
+    flush_every = 1 if interactive else args.flush_every
+    if args.format == "jsonl":
+        from toyrobot.output_sink import JsonLinesSink
+        output_sink = JsonLinesSink(flush_every=flush_every)
     else:
-        if first_word == "MOVE":
-            try:
-                robot.robot_mover.move_one_space(robot, table)
-            except Exception as e:
-                print(f"Error during MOVE command: {e}")
-        elif first_word == "RIGHT":
-            try:
-                robot.robot_rotator.right(robot)
-            except Exception as e:
-                print(f"Error during RIGHT command: {e}")
-        elif first_word == "LEFT":
-            try:
-                robot.robot_rotator.left(robot)
-            except Exception as e:
-                print(f"Error during LEFT command: {e}")
-        elif first_word == "REPORT":
-            try:
-                robot.robot_reporter.report(robot)
-            except Exception as e:
-                print(f"Error during REPORT command: {e}")
-        elif first_word == "EXIT":
-            print("Goodbye!")
-            sys.exit(0)
-        else:
-            print(f"Error: Unknown command '{first_word}'")
+        output_sink = StdoutSink(flush_every=flush_every)
+    if args.background_writer:
+        from toyrobot.output_sink import BackgroundWriterSink
+        output_sink = BackgroundWriterSink(output_sink)
+    return output_sink
+
+def write_stats(instrumentation, path=None):
+    """Writes the recorded statistics as JSON to a file, or to stderr if no path is given."""
+    import json
+    data = json.dumps(instrumentation.snapshot(), indent=2)
+    if path is None:
+        print(data, file=sys.stderr)
+        return
+    with open(path, 'w') as f:
+        f.write(data + "\n")
+
+def write_analytics(analytics):
+    """Writes the analytics file and a summary of the counts to stderr."""
+    try:
+        path = analytics.export()
+    except OSError as e:
+        print(f"Error: could not write analytics file: {e}", file=sys.stderr)
+        return
+    print(f"Analytics written to {path}: {analytics.summary()}", file=sys.stderr)
 
 def main():
-    config = load_config()
-    table_size = config["table_size"]
-    directions = config["directions"]
-    
-    # Initialize table and robot components
-    table = Table(table_size["width"], table_size["length"])
-    robot_rotator = RobotRotator()
-    robot_reporter = RobotReporter()
-    robot_placer = RobotPlacer()
-    robot_mover = RobotMover()
-    
-    # Create the robot
-    robot = Robot(directions, robot_rotator, robot_reporter, 
-                 table, robot_placer, robot_mover)
-    
-    # Check if a file was provided as an argument
-    if len(sys.argv) > 1:
+    args = parse_args()
+    try:
+        config = load_config()
+    except ValueError as e:
+        print(f"Error: Invalid configuration in config.json - {e}")
+        sys.exit(1)
+    if args.batch:
+        run_batch_mode(args, config)
+        return
+    if args.world:
+        run_world_mode(args, config)
+        return
+    if args.parallel:
+        run_parallel_mode(args, config)
+        return
+    if args.all_starts:
+        run_all_starts_mode(args, config)
+        return
+    instrumentation = None
+    if args.stats:
+        from toyrobot.instrumentation import Instrumentation
+        instrumentation = Instrumentation()
+    if args.serve or args.unix_socket:
+        run_server_mode(args, config, instrumentation)
+        return
+
+    source = args.file
+    if source is None and not sys.stdin.isatty():
+        source = STDIN_SOURCE  # Commands are being piped in, so skip the prompts
+    output_sink = create_output_sink(args, interactive=source is None)
+
+    # Initialize the table, robot and its components
+    session = Session(config, output_sink, instrumentation)
+    analytics = None
+    if args.analytics:
+        try:
+            analytics = session.enable_analytics(args.analytics)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    try:
+        run_session(source, args, session)
+    finally:
+        output_sink.close()
+        if instrumentation is not None:
+            write_stats(instrumentation, args.stats_file)
+        if analytics is not None:
+            write_analytics(analytics)
+
+def run_session(source, args, session):
+    """Runs commands from the given source, or interactively if there is none."""
+    robot = session.robot
+    table = session.table
+    dispatcher = session.dispatcher
+    output_sink = session.output_sink
+
+    # Check if a command source was provided
+    if source is not None:
         try:
-            with open(sys.argv[1]) as f:
-                lines = f.readlines()
-                for line in lines:
-                    process_command(line, robot, table)
+            if source != STDIN_SOURCE and is_binary_command_file(source):
+                if args.checkpoint:
+                    output_sink.write("Error: --checkpoint is not supported for binary command files", KIND_ERROR)
+                    return
+                from toyrobot.binary_format import iter_binary_tokens
+                run_tokens(iter_binary_tokens(source, robot.directions), robot, table, dispatcher, args.fast_forward)
+                return
+            if args.checkpoint:
+                run_commands_checkpointed(source, args, robot, table, dispatcher, output_sink)
+                return
+            commands = open_command_source(source, use_mmap=args.mmap)
+            if args.fast_forward:
+                run_commands_fast_forward(commands, robot, table, dispatcher)
+            else:
+                run_commands(commands, robot, table, dispatcher)
         except FileNotFoundError:
-            print(f"File {sys.argv[1]} not found.")
+            output_sink.write(f"File {source} not found.", KIND_ERROR)
             return
         except Exception as e:
-            print(f"Error processing file: {e}")
+            output_sink.write(f"Error processing file: {e}", KIND_ERROR)
     else:
         # Interactive mode
         print("Toy Robot Simulator")
-        print("Available commands: PLACE X,Y,F | MOVE | LEFT | RIGHT | REPORT | EXIT")
+        print("Available commands: PLACE X,Y,F | MOVE | LEFT | RIGHT | REPORT | STATS | EXIT")
         print("Type EXIT to quit")
         
         while True:
             try:
                 command = input("Enter command: ")
-                process_command(command, robot, table)
+                process_command(command, robot, table, dispatcher)
             except KeyboardInterrupt:
                 print("\nGoodbye!")
                 break
             except Exception as e:
                 print(f"Error: {e}")
+            output_sink.flush()
+
+def run_batch_mode(args, config):
+    """Runs every file matched by the --batch patterns and prints a summary to stderr."""
+    from toyrobot.batch_runner import run_batch
+    output_sink = create_output_sink(args, interactive=False)
+    try:
+        summary = run_batch(args.batch, config, output_sink, jobs=args.jobs, output_dir=args.output_dir)
+    except ValueError as e:
+        output_sink.write(f"Error: {e}", KIND_ERROR)
+        return
+    finally:
+        output_sink.close()
+    print(summary, file=sys.stderr)
+
+def run_world_mode(args, config):
+    """Runs commands for many named robots sharing one table."""
+    from toyrobot.world import World
+    source = args.file
+    if source is None and not sys.stdin.isatty():
+        source = STDIN_SOURCE  # Commands are being piped in, so skip the prompts
+    output_sink = create_output_sink(args, interactive=source is None)
+    world = World(config, output_sink)
+    try:
+        if source is not None:
+            try:
+                if source != STDIN_SOURCE and is_binary_command_file(source):
+                    # Binary files drop the robot names, which only text commands carry
+                    output_sink.write("Error: --world is not supported for binary command files", KIND_ERROR)
+                    return
+                world.run(open_command_source(source, use_mmap=args.mmap))
+            except FileNotFoundError:
+                output_sink.write(f"File {source} not found.", KIND_ERROR)
+            return
+
+        print("Toy Robot Simulator (multi-robot)")
+        print("Available commands: PLACE NAME X,Y,F | NAME MOVE | NAME LEFT | NAME RIGHT | NAME REPORT | "
+              "OBSTACLE X,Y | STATS | EXIT")
+        print("Type EXIT to quit")
+        while True:
+            try:
+                if world.dispatch(input("Enter command: ")) == STATUS_EXIT:
+                    break
+            except KeyboardInterrupt:
+                print("\nGoodbye!")
+                break
+            finally:
+                output_sink.flush()
+    finally:
+        output_sink.close()
+
+def run_parallel_mode(args, config):
+    """Runs one command file split at PLACE commands on a process pool and prints a summary to stderr."""
+    from toyrobot.segment_runner import run_segmented
+    output_sink = create_output_sink(args, interactive=False)
+    try:
+        if is_binary_command_file(args.file):
+            output_sink.write("Error: --parallel is not supported for binary command files", KIND_ERROR)
+            return
+        summary = run_segmented(args.file, config, output_sink, jobs=args.jobs)
+    except FileNotFoundError:
+        output_sink.write(f"File {args.file} not found.", KIND_ERROR)
+        return
+    except Exception as e:
+        output_sink.write(f"Error processing file: {e}", KIND_ERROR)
+        return
+    finally:
+        output_sink.close()
+    print(summary, file=sys.stderr)
+
+def run_all_starts_mode(args, config):
+    """Runs one command file from every start state and prints one line per start."""
+    from toyrobot.all_starts import AllStarts
+    from toyrobot.output_sink import KIND_REPORT
+    output_sink = create_output_sink(args, interactive=False)
+    try:
+        if args.file != STDIN_SOURCE and is_binary_command_file(args.file):
+            output_sink.write("Error: --all-starts is not supported for binary command files", KIND_ERROR)
+            return
+        all_starts = AllStarts(config)
+        result = all_starts.run(open_command_source(args.file, use_mmap=args.mmap))
+        for event in result.messages:
+            output_sink.write(event.message, event.kind)
+        for line in all_starts.format_lines(result):
+            output_sink.write(line, KIND_REPORT)
+    except FileNotFoundError:
+        output_sink.write(f"File {args.file} not found.", KIND_ERROR)
+        return
+    except Exception as e:
+        output_sink.write(f"Error processing file: {e}", KIND_ERROR)
+        return
+    finally:
+        output_sink.close()
+    print(f"All starts: {len(all_starts):,} starts, {result.commands:,} commands", file=sys.stderr)
+
+def run_server_mode(args, config, instrumentation=None):
+    """Serves robot sessions over the network until interrupted."""
+    import asyncio
+    from toyrobot.server import RobotServer, parse_address
+    server = RobotServer(config, idle_timeout=args.idle_timeout, json_lines=args.format == "jsonl",
+                         instrumentation=instrumentation)
+    host, port = parse_address(args.serve) if args.serve else (None, None)
+
+    def on_start(listener):
+        addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+        print(f"Serving robot sessions on {addresses}", file=sys.stderr)
+
+    try:
+        asyncio.run(server.serve_forever(host, port, args.unix_socket, on_start))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Server stopped: {server}", file=sys.stderr)
+        if instrumentation is not None:
+            write_stats(instrumentation, args.stats_file)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
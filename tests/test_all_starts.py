@@ -0,0 +1,111 @@
+"""
+Filename: test_all_starts.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the AllStarts class. Validates that running a script from
+    every start at once gives each start the same reports and final state
+    as placing a single robot there and running the script, including
+    after starts have been merged, and that shared messages, EXIT and
+    unsupported commands are reported once.
+"""
+import random
+import unittest
+import numpy as np
+from parameterized import parameterized
+from toyrobot.all_starts import AllStarts, MAX_ALL_STARTS_CELLS
+from toyrobot.command_dispatcher import STATUS_OK, STATUS_EXIT
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+NAMES = {0: "EAST", 1: "NORTH", 2: "WEST", 3: "SOUTH"}
+
+def make_config(width, length, obstacles=()):
+    return {"table_size": {"width": width, "length": length}, "directions": DIRECTIONS,
+            "obstacles": [list(cell) for cell in obstacles]}
+
+def format_state(state):
+    x, y, heading = state
+    return f"{x},{y},{NAMES[heading]}"
+
+class TestAllStarts(unittest.TestCase):
+    def assert_matches_sessions(self, config, script):
+        """Checks every start against a Session that places the robot there and runs the script."""
+        all_starts = AllStarts(config)
+        result = all_starts.run(script)
+        shared = [(event.kind, event.message) for event in result.messages]
+        for index, start in enumerate(result.starts.tolist()):
+            sink = ListSink()
+            session = Session(config, sink)
+            session.run([f"PLACE {format_state(start)}", *script])
+            reports = [message for kind, message in sink.records if kind == "report"]
+            self.assertEqual([format_state(state) for state in result.reports[:, index].tolist()], reports)
+            self.assertEqual([record for record in sink.records if record[0] != "report"], shared)
+            robot = session.robot
+            final = f"{robot.position.x},{robot.position.y},{robot.directions.name_for(robot.facing_angle)}"
+            self.assertEqual(format_state(result.finals[index].tolist()), final)
+        return result
+
+    @parameterized.expand([
+        ("square", 5, 5, ()),
+        ("wide", 3, 7, ()),
+        ("obstacles", 4, 6, ((1, 1), (3, 2), (0, 3))),
+    ])
+    def test_matches_single_robots(self, name, width, length, obstacles):
+        rng = random.Random(width * length)
+        script = rng.choices(["MOVE", "LEFT", "RIGHT", "REPORT", "", "JUMP", "STATS", "PLACE 2,2,EAST",
+                              "PLACE 9,9,NORTH"], [30, 5, 5, 4, 1, 1, 0.3, 0.2, 0.2], k=400)
+        self.assert_matches_sessions(make_config(width, length, obstacles), script)
+
+    def test_merged_starts_match_single_robots(self):
+        # A long script on a small table merges the starts many times
+        rng = random.Random(3)
+        script = rng.choices(["MOVE", "LEFT", "RIGHT", "REPORT"], [30, 5, 5, 0.2], k=3000)
+        self.assert_matches_sessions(make_config(3, 4, [(1, 1)]), script)
+
+    def test_starts(self):
+        all_starts = AllStarts(make_config(2, 3, [(1, 0)]))
+        self.assertEqual(len(all_starts), 5 * 4)
+        starts = all_starts.run([]).starts
+        self.assertEqual(starts[:4].tolist(), [[0, 0, 0], [0, 0, 1], [0, 0, 2], [0, 0, 3]])
+        self.assertNotIn([1, 0], starts[:, :2].tolist())
+
+    def test_place_gathers_every_start(self):
+        result = AllStarts(make_config(5, 5)).run("MOVE\nPLACE 1,2,WEST\nMOVE\nREPORT\n")
+        self.assertTrue((result.finals == [0, 2, 2]).all())
+        self.assertTrue((result.reports[0] == [0, 2, 2]).all())
+        self.assertEqual((result.status, result.commands), (STATUS_OK, 4))
+
+    def test_exit_stops_the_script(self):
+        result = AllStarts(make_config(5, 5)).run(["MOVE", "REPORT", "EXIT", "MOVE", "REPORT"])
+        self.assertEqual(result.reports.shape, (1, 100, 3))
+        np.testing.assert_array_equal(result.finals, result.reports[0])
+        self.assertEqual([event.message for event in result.messages], ["Goodbye!"])
+        self.assertEqual((result.status, result.commands), (STATUS_EXIT, 3))
+
+    @parameterized.expand([
+        ("obstacle", "OBSTACLE 1,1", "OBSTACLE"),
+        ("repeat", "REPEAT 2", "REPEAT"),
+        ("call", "CALL HOP", "CALL"),
+        ("path", "PATH 1,1,NORTH", "PATH"),
+    ])
+    def test_unsupported_commands(self, name, command, keyword):
+        result = AllStarts(make_config(5, 5)).run(["MOVE", command, "MOVE"])
+        self.assertEqual([(event.line, event.kind, event.message) for event in result.messages],
+                         [(2, "error", f"Error: Command '{keyword}' is not supported with --all-starts")])
+
+    def test_format_lines(self):
+        all_starts = AllStarts(make_config(1, 2))
+        lines = list(all_starts.format_lines(all_starts.run(["MOVE", "REPORT", "RIGHT", "REPORT"])))
+        self.assertEqual(len(lines), 8)
+        self.assertEqual(lines[0], "0,0,EAST -> 1,0,SOUTH (reports: 1,0,EAST 1,0,SOUTH)")
+        self.assertEqual(list(all_starts.format_lines(all_starts.run(["LEFT"])))[0], "0,0,EAST -> 0,0,NORTH")
+
+    def test_rejects_large_tables(self):
+        with self.assertRaises(ValueError):
+            AllStarts(make_config(MAX_ALL_STARTS_CELLS, 2))
+
+if __name__ == "__main__":
+    unittest.main()
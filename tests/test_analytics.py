@@ -0,0 +1,194 @@
+"""
+Filename: test_analytics.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the Analytics class. Validates the per-cell visit, edge
+    clamp and obstacle stop counts against a reference walk of the same
+    commands, that fast-forwarded runs and blocks count every MOVE, that
+    HEATMAP and export write the counts as .npy and CSV, and that robots
+    without analytics are left untouched.
+"""
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from parameterized import parameterized
+from toyrobot.analytics import Analytics, MAX_ANALYTICS_CELLS, CSV_HEADER
+from toyrobot.command_dispatcher import ANALYTICS_DISABLED_MESSAGE
+from toyrobot.fast_forward import FastForwardRunner
+from toyrobot.output_sink import ListSink
+from toyrobot.robot_mover import RobotMover
+from toyrobot.session import Session
+from toyrobot.table import Table
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+STEPS = {"NORTH": (0, 1), "EAST": (1, 0), "SOUTH": (0, -1), "WEST": (-1, 0)}
+TURNS = ["NORTH", "WEST", "SOUTH", "EAST"]  # LEFT moves one place along
+
+def make_config(obstacles=()):
+    return {"table_size": {"width": 4, "length": 6}, "directions": DIRECTIONS,
+            "obstacles": [list(cell) for cell in obstacles]}
+
+def reference_counts(commands, width, length, obstacles):
+    """Walks the commands one at a time and counts visits, edge clamps and obstacle stops."""
+    counts = np.zeros((3, width, length), dtype=np.int64)
+    state = None
+    for command in commands:
+        if command.startswith("PLACE "):
+            x, y, facing = command[6:].split(",")
+            x, y = int(x), int(y)
+            if 0 <= x < length and 0 <= y < width and (x, y) not in obstacles:
+                state = [x, y, facing]
+                counts[0, y, x] += 1
+        elif state is not None and command == "MOVE":
+            x, y, facing = state
+            dx, dy = STEPS[facing]
+            if not (0 <= x + dx < length and 0 <= y + dy < width):
+                counts[1, y, x] += 1
+            elif (x + dx, y + dy) in obstacles:
+                counts[2, y, x] += 1
+            else:
+                state[:2] = x + dx, y + dy
+                counts[0, y + dy, x + dx] += 1
+        elif state is not None and command in ("LEFT", "RIGHT"):
+            step = 1 if command == "LEFT" else -1
+            state[2] = TURNS[(TURNS.index(state[2]) + step) % 4]
+    return counts
+
+def random_commands(seed, k=3000):
+    rng = random.Random(seed)
+    return rng.choices(["MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 0,0,NORTH", "PLACE 5,3,WEST", "PLACE 2,2,EAST",
+                        "PLACE 6,0,NORTH"], [40, 6, 6, 2, 1, 1, 1, 1], k=k)
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def session(self, obstacles=()):
+        session = Session(make_config(obstacles), ListSink())
+        session.enable_analytics()
+        return session
+
+    @parameterized.expand([
+        ("no_obstacles", ()),
+        ("obstacles", ((1, 1), (3, 2), (4, 0))),
+    ])
+    def test_matches_reference_walk(self, name, obstacles):
+        for seed in range(3):
+            commands = random_commands(seed)
+            session = self.session(obstacles)
+            session.run(commands)
+            expected = reference_counts(commands, 4, 6, set(obstacles))
+            np.testing.assert_array_equal(session.analytics.counts, expected)
+
+    @parameterized.expand([
+        ("no_obstacles", ()),
+        ("obstacles", ((1, 1), (3, 2), (4, 0))),
+    ])
+    def test_fast_forward_counts_every_move(self, name, obstacles):
+        commands = random_commands(11)
+        expected = self.session(obstacles)
+        expected.run(commands)
+        actual = self.session(obstacles)
+        FastForwardRunner(actual.dispatcher).run(commands, actual.robot, actual.table)
+        np.testing.assert_array_equal(actual.analytics.counts, expected.analytics.counts)
+        self.assertEqual(actual.analytics.edges, expected.analytics.edges)
+
+    def test_blocks_count_every_move(self):
+        session = self.session()
+        session.run(["PLACE 0,0,NORTH", "DEFINE HOP", "MOVE", "END", "REPEAT 1000", "CALL HOP", "END"])
+        analytics = session.analytics
+        self.assertEqual(analytics.visits[:, 0].tolist(), [1, 1, 1, 1])
+        self.assertEqual(analytics.edge_clamps[3, 0], 997)
+        self.assertEqual(analytics.edges, [0, 997, 0, 0])
+
+    def test_clamps_by_edge(self):
+        session = self.session()
+        session.run(["PLACE 0,0,SOUTH", "MOVE", "RIGHT", "MOVE", "MOVE", "PLACE 5,3,EAST", "MOVE", "LEFT", "MOVE"])
+        analytics = session.analytics
+        self.assertEqual(analytics.edges, [1, 1, 2, 1])
+        self.assertEqual(analytics.edge_clamps[0, 0], 3)
+        self.assertEqual(analytics.edge_clamps[3, 5], 2)
+        self.assertEqual(int(analytics.obstacle_stops.sum()), 0)
+        self.assertEqual(analytics.summary(), "2 visits to 2 of 24 cells, 5 MOVEs clamped at the edge "
+                                              "(E 1/N 1/W 2/S 1), 0 stopped by obstacles")
+
+    def test_multi_space_moves(self):
+        session = Session(make_config([(4, 2)]), ListSink())
+        analytics = session.enable_analytics()
+        session.run(["PLACE 0,2,EAST"])
+        session.robot.robot_mover.move(10, session.robot, session.table)
+        session.run(["LEFT"])
+        session.robot.robot_mover.move(3, session.robot, session.table)
+        self.assertEqual(analytics.visits.tolist(), [[0] * 6, [0] * 6, [1, 1, 1, 1, 0, 0], [0, 0, 0, 1, 0, 0]])
+        self.assertEqual(analytics.obstacle_stops[2, 3], 7)
+        self.assertEqual(analytics.edge_clamps[3, 3], 2)
+
+    @parameterized.expand([(".npy",), (".csv",), (".CSV",)])
+    def test_export(self, extension):
+        path = os.path.join(self.directory.name, "heatmap" + extension)
+        session = Session(make_config([(2, 1)]), ListSink())
+        analytics = session.enable_analytics(path)
+        session.run(["PLACE 2,0,NORTH", "MOVE", "LEFT", "LEFT", "MOVE"])
+        self.assertEqual(analytics.export(), path)
+        if extension == ".npy":
+            np.testing.assert_array_equal(np.load(path), analytics.counts)
+        else:
+            with open(path) as file:
+                self.assertEqual(file.read().splitlines(), [CSV_HEADER, "2,0,1,1,1"])
+
+    def test_heatmap_command(self):
+        path = os.path.join(self.directory.name, "heatmap.npy")
+        sink = ListSink()
+        session = Session(make_config(), sink)
+        session.run(["HEATMAP"])
+        self.assertEqual(sink.messages, [ANALYTICS_DISABLED_MESSAGE])
+        sink.clear()
+
+        session.enable_analytics(path)
+        session.run(["HEATMAP", "PLACE 1,1,EAST", "MOVE", "HEATMAP"])
+        summary = "HEATMAP: {} visits to {} of 24 cells, 0 MOVEs clamped at the edge (E 0/N 0/W 0/S 0), " \
+                  "0 stopped by obstacles"
+        self.assertEqual(sink.messages, [f"HEATMAP: wrote {path}", summary.format(0, 0),
+                                         f"HEATMAP: wrote {path}", summary.format(2, 2)])
+        self.assertEqual(int(np.load(path).sum()), 2)
+
+    def test_heatmap_without_a_file_reports_summary(self):
+        sink = ListSink()
+        session = Session(make_config(), sink)
+        session.enable_analytics()
+        session.run(["HEATMAP"])
+        self.assertEqual(len(sink.messages), 1)
+        self.assertTrue(sink.messages[0].startswith("HEATMAP: 0 visits"))
+
+    def test_export_errors(self):
+        analytics = Analytics(Table(2, 2))
+        with self.assertRaises(ValueError):
+            analytics.export()
+        with self.assertRaises(ValueError):
+            analytics.export(os.path.join(self.directory.name, "heatmap.txt"))
+        with self.assertRaises(OSError):
+            analytics.export(os.path.join(self.directory.name, "missing", "heatmap.csv"))
+
+    @parameterized.expand([
+        ("bad_extension", Table(4, 4), "heatmap.json"),
+        ("table_too_large", Table(MAX_ANALYTICS_CELLS, 2), None),
+    ])
+    def test_invalid_analytics(self, name, table, path):
+        with self.assertRaises(ValueError):
+            Analytics(table, path)
+
+    def test_only_the_attached_robot_is_counted(self):
+        session = self.session()
+        other = Session(make_config(), ListSink())
+        other.run(["PLACE 0,0,NORTH", "MOVE"])
+        self.assertNotIn("move", vars(other.robot.robot_mover))
+        self.assertIs(type(other.robot.robot_mover).move, RobotMover.move)
+        self.assertEqual(int(session.analytics.counts.sum()), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Filename: test_batch_runner.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the batch runner. Validates glob expansion, that each
+    file runs with its own robot, that output is emitted in input order
+    whether files run in this process or on a process pool, and that output
+    files keep their relative paths and never collide.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+from toyrobot.batch_runner import expand_paths, run_batch, output_path_for, output_paths_for
+from toyrobot.output_sink import ListSink
+
+CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+}
+
+FILES = {
+    "a.txt": "PLACE 0,0,NORTH\nMOVE\nREPORT\n",
+    "b.txt": "REPORT\n",  # Must not see the robot placed by a.txt
+    "c.txt": "PLACE 1,1,EAST\nEXIT\nREPORT\n",
+}
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name, contents in FILES.items():
+            with open(os.path.join(self.directory, name), 'w') as f:
+                f.write(contents)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_expand_paths(self):
+        pattern = os.path.join(self.directory, "*.txt")
+        missing = os.path.join(self.directory, "missing.txt")
+        paths = expand_paths([missing, pattern])
+        self.assertEqual(paths, [missing] + [os.path.join(self.directory, name) for name in sorted(FILES)])
+
+    @parameterized.expand([
+        ("in_process", 1),
+        ("process_pool", 2),
+    ])
+    def test_output_in_input_order(self, name, jobs):
+        paths = [os.path.join(self.directory, name) for name in ("c.txt", "a.txt", "b.txt")]
+        sink = ListSink()
+        summary = run_batch(paths, CONFIG, sink, jobs=jobs)
+        self.assertEqual(sink.messages, [
+            f"==> {paths[0]} <==", "Goodbye!",
+            f"==> {paths[1]} <==", "0,1,NORTH",
+            f"==> {paths[2]} <==", "Command ignored: Robot not placed on the table.",
+        ])
+        self.assertEqual((summary.files, summary.commands), (3, 6))
+
+    def test_output_dir(self):
+        output_dir = os.path.join(self.directory, "out")
+        sink = ListSink()
+        run_batch([os.path.join(self.directory, "*.txt")], CONFIG, sink, jobs=2, output_dir=output_dir)
+        self.assertEqual(sink.messages, [])
+        with open(output_path_for("a.txt", output_dir)) as f:
+            self.assertEqual(f.read(), "0,1,NORTH\n")
+
+    def test_output_dir_keeps_relative_paths(self):
+        for name, contents in (("a", "PLACE 0,0,NORTH\nREPORT\n"), ("b", "PLACE 1,1,EAST\nREPORT\n")):
+            os.makedirs(os.path.join(self.directory, name))
+            with open(os.path.join(self.directory, name, "s.txt"), 'w') as f:
+                f.write(contents)
+        output_dir = os.path.join(self.directory, "out")
+        run_batch([os.path.join(self.directory, "*", "s.txt")], CONFIG, ListSink(), jobs=2, output_dir=output_dir)
+        for name, expected in (("a", "0,0,NORTH\n"), ("b", "1,1,EAST\n")):
+            with open(os.path.join(output_dir, name, "s.out")) as f:
+                self.assertEqual(f.read(), expected)
+
+    @parameterized.expand([
+        ("same_name", ["s.txt", "s.log"]),
+        ("same_file", ["a.txt", "./a.txt"]),
+    ])
+    def test_colliding_outputs_are_rejected(self, name, paths):
+        output_dir = os.path.join(self.directory, "out")
+        with self.assertRaises(ValueError):
+            output_paths_for(paths, output_dir)
+        with self.assertRaises(ValueError):
+            run_batch(paths, CONFIG, ListSink(), jobs=1, output_dir=output_dir)
+        self.assertFalse(os.path.exists(output_dir))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Filename: test_binary_format.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the binary command format. Validates varint encoding,
+    which PLACE arguments are packed and read back as parsed Placements,
+    that binary files replay with exactly the output of their text source,
+    and the text round trip.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+from toyrobot.binary_format import (
+    encode_commands, iter_binary_tokens, iter_binary_tokens_from, decode_tokens, write_varint, read_varint,
+    convert_text_to_binary, convert_binary_to_text, is_binary_command_file, read_header
+)
+from toyrobot.command_dispatcher import STATUS_EXIT
+from toyrobot.command_parser import tokenize, format_token, OP_NOP, OP_PLACE
+from toyrobot.config import compile_config
+from toyrobot.output_sink import ListSink
+from toyrobot.robot_placer import Placement
+from toyrobot.session import Session
+
+CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+}
+
+COMMANDS = ["REPORT", "PLACE 1,2,NORTH", "MOVE", "move", "LEFT", "RIGHT", "REPORT", "", "JUMP", "jump high",
+            "PLACE", "PLACE 9,9,EAST", "PLACE 1,NORTH", "PLACE +1,2,WEST", "PLACE 01,2,WEST", "PLACE 1,2,north",
+            "PLACE 1,2,UP", "PLACE 1,2,NORTH,X", "PLACE  3,3,SOUTH", "PLACE 3,3,SOUTH extra", "MOVE", "REPORT",
+            "PLACE 200,300,EAST", "REPORT", "STATS", "stats", "OBSTACLE 3,4", "obstacle 1,x", "OBSTACLE",
+            "define hop", "MOVE", "END", "REPEAT 3", "call Hop", "REPORT", "end", "REPEAT  2", "END",
+            "PLACE 3,4,EAST", "EXIT", "REPORT"]
+
+def replay_text(commands):
+    """Replays command lines and returns the output records."""
+    session = Session(CONFIG, ListSink())
+    session.run(commands)
+    return session.output_sink.records
+
+def replay_tokens(tokens):
+    """Replays (opcode, argument) tokens and returns the output records."""
+    session = Session(CONFIG, ListSink())
+    for opcode, argument in tokens:
+        if session.dispatcher.execute(opcode, argument, session.robot, session.table) == STATUS_EXIT:
+            break
+    return session.output_sink.records
+
+class TestBinaryFormat(unittest.TestCase):
+    @parameterized.expand([
+        ("zero", 0, b"\x00"),
+        ("one_byte", 127, b"\x7f"),
+        ("two_bytes", 300, b"\xac\x02"),
+        ("large", 10**18, None),
+    ])
+    def test_varint_round_trip(self, name, value, expected):
+        out = bytearray()
+        write_varint(out, value)
+        if expected is not None:
+            self.assertEqual(bytes(out), expected)
+        self.assertEqual(read_varint(out, 0), (value, len(out)))
+
+    @parameterized.expand([
+        ("canonical", "PLACE 1,2,NORTH", True),
+        ("large_coordinates", "PLACE 1000000,5,WEST", True),
+        ("sign", "PLACE +1,2,NORTH", False),
+        ("leading_zero", "PLACE 01,2,NORTH", False),
+        ("lowercase_direction", "PLACE 1,2,north", False),
+        ("unknown_direction", "PLACE 1,2,UP", False),
+        ("extra_field", "PLACE 1,2,NORTH,X", False),
+    ])
+    def test_place_packing(self, name, command, packed):
+        data = encode_commands([command], CONFIG["directions"])
+        names, texts, _ = read_header(data)
+        self.assertEqual(texts, [] if packed else [tokenize(command)[1]])
+        self.assertEqual(list(iter_binary_tokens_from(data)), [tokenize(command)])
+
+    def test_tokens_match_text_tokens(self):
+        data = encode_commands(COMMANDS, CONFIG["directions"])
+        expected = [tokenize(command) for command in COMMANDS if tokenize(command)[0] != OP_NOP]
+        self.assertEqual(list(iter_binary_tokens_from(data)), expected)
+
+    def test_replay_matches_text(self):
+        data = encode_commands(COMMANDS, CONFIG["directions"])
+        self.assertEqual(replay_tokens(iter_binary_tokens_from(data)), replay_text(COMMANDS))
+
+    def test_parsed_placements(self):
+        directions = compile_config(CONFIG).directions
+        commands = COMMANDS[:-2] + ["PLACE 4,4,WEST", "REPEAT 2", "PLACE 2,3,SOUTH", "MOVE", "REPORT", "END",
+                                    "DEFINE BACK", "PLACE 0,0,EAST", "END", "CALL BACK", "REPORT"]
+        data = encode_commands(commands, CONFIG["directions"])
+        tokens = list(iter_binary_tokens_from(data, directions))
+        self.assertIn((OP_PLACE, Placement(1, 2, 90, "NORTH")), tokens)
+        self.assertIn((OP_PLACE, Placement(200, 300, 0, "EAST")), tokens)
+        self.assertIn((OP_PLACE, "+1,2,WEST"), tokens)  # Not packed, so still text
+        self.assertEqual([format_token(*token) for token in tokens],
+                         [format_token(*tokenize(command)) for command in commands if tokenize(command)[0] != OP_NOP])
+        self.assertEqual(replay_tokens(tokens), replay_text(commands))
+
+    def test_directions_missing_from_model_stay_text(self):
+        data = encode_commands(["PLACE 1,1,UP", "PLACE 1,1,NORTH"], ["UP", "NORTH"])
+        tokens = list(iter_binary_tokens_from(data, compile_config(CONFIG).directions))
+        self.assertEqual(tokens, [(OP_PLACE, "1,1,UP"), (OP_PLACE, Placement(1, 1, 90, "NORTH"))])
+
+    def test_smaller_than_text(self):
+        commands = ["PLACE 0,0,NORTH"] + ["MOVE", "MOVE", "LEFT", "REPORT", "JUMP"] * 1000
+        text_size = sum(len(command) + 1 for command in commands)
+        self.assertLess(len(encode_commands(commands)) * 4, text_size)
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            list(iter_binary_tokens_from(b"PLACE 1,2,NORTH\n"))
+        data = encode_commands(["MOVE", "MOVE"]) + b"\x63"
+        with self.assertRaises(ValueError):
+            list(iter_binary_tokens_from(data))
+
+class TestBinaryFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.text_path = os.path.join(self.directory, "commands.txt")
+        self.binary_path = os.path.join(self.directory, "commands.trb")
+        with open(self.text_path, 'w') as f:
+            f.write("\n".join(COMMANDS) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_convert_and_replay(self):
+        convert_text_to_binary(self.text_path, self.binary_path, CONFIG["directions"])
+        self.assertTrue(is_binary_command_file(self.binary_path))
+        self.assertFalse(is_binary_command_file(self.text_path))
+        self.assertEqual(replay_tokens(iter_binary_tokens(self.binary_path)), replay_text(COMMANDS))
+        directions = compile_config(CONFIG).directions
+        self.assertEqual(replay_tokens(iter_binary_tokens(self.binary_path, directions)), replay_text(COMMANDS))
+
+    def test_round_trip_to_text(self):
+        convert_text_to_binary(self.text_path, self.binary_path, CONFIG["directions"])
+        round_trip_path = os.path.join(self.directory, "round_trip.txt")
+        convert_binary_to_text(self.binary_path, round_trip_path)
+        with open(round_trip_path) as f:
+            self.assertEqual(replay_text(f), replay_text(COMMANDS))
+        self.assertEqual(list(decode_tokens([(OP_PLACE, "")])), ["PLACE  _"])
+
+if __name__ == "__main__":
+    unittest.main()
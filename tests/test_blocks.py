@@ -0,0 +1,205 @@
+"""
+Filename: test_blocks.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for DEFINE and REPEAT blocks. Validates that running blocks
+    gives exactly the output of expanding them, that huge REPEAT counts
+    finish by skipping cycles, that transitions are memoized, that output
+    is streamed, and that invalid, unterminated and over-limit blocks are
+    reported.
+"""
+import random
+import unittest
+from parameterized import parameterized
+from toyrobot.blocks import MEMO_OUTPUT_LIMIT
+from toyrobot.command_dispatcher import STATUS_OK, STATUS_ERROR, STATUS_EXIT
+from toyrobot.output_sink import ListSink, KIND_REPORT
+from toyrobot.session import Session
+
+CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+}
+
+SIMPLE_COMMANDS = ["MOVE", "MOVE", "MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 1,2,EAST", "PLACE 9,9,NORTH",
+                   "OBSTACLE 3,3", "OBSTACLE 0,4", "JUMP", ""]
+
+def random_program(rng, depth, macros):
+    """Returns (lines, expansion) for a random sequence of commands and blocks."""
+    lines, expansion = [], []
+    for _ in range(rng.randrange(1, 6)):
+        choice = rng.random()
+        if choice < 0.15 and depth < 3:
+            count = rng.randrange(0, 12)
+            body, body_expansion = random_program(rng, depth + 1, macros)
+            lines += [f"REPEAT {count}"] + body + ["END"]
+            expansion += body_expansion * count
+        elif choice < 0.25 and macros:
+            name = rng.choice(sorted(macros))
+            lines.append(f"CALL {name.lower()}")
+            expansion += macros[name]
+        else:
+            command = rng.choice(SIMPLE_COMMANDS)
+            lines.append(command)
+            expansion.append(command)
+    return lines, expansion
+
+def run_session(commands):
+    """Runs commands in a fresh session and returns the output records and final status."""
+    sink = ListSink()
+    session = Session(CONFIG, sink)
+    status = session.run(commands)
+    return session, sink.records, status
+
+class PositionSink(ListSink):
+    """Records where the robot is at the time each message is written."""
+
+    def __init__(self):
+        super().__init__()
+        self.robot = None
+
+    def write(self, message, kind=KIND_REPORT):
+        super().write(f"{message} at y={self.robot.position.y}", kind)
+
+class TestBlocks(unittest.TestCase):
+    def test_matches_expansion(self):
+        for seed in range(40):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                macros = {}
+                lines, expansion = ["REPORT", "MOVE"], ["REPORT", "MOVE"]
+                for index in range(3):
+                    body, body_expansion = random_program(rng, 1, macros)
+                    lines += [f"DEFINE M{index}"] + body + ["END"]
+                    macros[f"M{index}"] = body_expansion  # Defined after its body, so it can't call itself
+                    program, program_expansion = random_program(rng, 0, macros)
+                    lines += program
+                    expansion += program_expansion
+                self.assertEqual(run_session(lines)[1], run_session(expansion)[1])
+
+    def test_huge_repeat_skips_cycles(self):
+        _, records, _ = run_session(["PLACE 0,0,NORTH", "REPEAT 1000000000000", "MOVE", "RIGHT", "END", "REPORT",
+                                     "REPEAT 1000000000001", "REPEAT 1000000000000", "LEFT", "END", "MOVE", "END",
+                                     "REPORT"])
+        self.assertEqual([message for _, message in records], ["0,0,NORTH", "0,4,NORTH"])
+
+    def test_huge_repeat_with_output_before_cycle(self):
+        # The unplaced robot's messages come before the cycle, so the cycle is still skipped
+        commands = ["REPEAT 1000000000000", "REPEAT 3", "MOVE", "END", "PLACE 2,2,WEST", "REPORT", "END"]
+        _, records, _ = run_session(["REPEAT 2"] + commands[1:-1] + ["END"])
+        _, huge_records, _ = run_session(commands[:5] + ["END", "REPORT"])
+        self.assertEqual(huge_records, records[:3] + [(records[3][0], "2,2,WEST")])
+
+    def test_transitions_are_memoized(self):
+        session, _, _ = run_session(["DEFINE SQUARE", "MOVE", "RIGHT", "END", "PLACE 0,0,NORTH",
+                                     "REPEAT 100", "CALL SQUARE", "END"])
+        block = session.dispatcher.blocks.macros["SQUARE"]
+        self.assertEqual(len(block.memo), 4)  # One transition per state on the cycle
+        self.assertTrue(block.memoizable)
+
+    def test_stats_blocks_are_not_memoized(self):
+        session, records, _ = run_session(["DEFINE SHOW", "STATS", "END", "CALL SHOW", "CALL SHOW"])
+        block = session.dispatcher.blocks.macros["SHOW"]
+        self.assertFalse(block.memoizable)
+        self.assertEqual(block.memo, {})
+        self.assertEqual(len(records), 2)
+
+    def test_output_is_streamed(self):
+        sink = PositionSink()
+        session = Session(CONFIG, sink)
+        sink.robot = session.robot
+        session.run(["PLACE 0,0,NORTH", "REPEAT 2", "MOVE", "REPORT", "MOVE", "END"])
+        self.assertEqual(sink.messages, ["0,1,NORTH at y=1", "0,3,NORTH at y=3"])
+
+    def test_bodies_with_large_output_are_not_memoized(self):
+        session, records, _ = run_session(["DEFINE LOUD", f"REPEAT {MEMO_OUTPUT_LIMIT + 1}", "REPORT", "END", "END",
+                                           "DEFINE QUIET", "REPORT", "END", "PLACE 0,0,NORTH", "CALL LOUD",
+                                           "CALL LOUD", "CALL QUIET"])
+        self.assertEqual(len(records), 2 * (MEMO_OUTPUT_LIMIT + 1) + 1)
+        macros = session.dispatcher.blocks.macros
+        self.assertEqual(macros["LOUD"].memo, {})
+        self.assertEqual(len(macros["QUIET"].memo), 1)
+
+    @parameterized.expand([
+        ("define", ["DEFINE HOP", "MOVE", "EXIT"], "Error: Invalid DEFINE command - unterminated DEFINE block "
+                                                   "at end of input."),
+        ("nested_repeat", ["REPEAT 2", "REPEAT 3", "MOVE", "END", "EXIT"],
+         "Error: Invalid REPEAT command - unterminated REPEAT block at end of input."),
+    ])
+    def test_unterminated_block(self, name, commands, expected_error):
+        session, records, status = run_session(["PLACE 0,0,NORTH", *commands])
+        self.assertEqual((status, records), (STATUS_OK, []))
+        self.assertEqual(session.finish(), STATUS_ERROR)
+        self.assertEqual(session.output_sink.messages, [expected_error])
+        self.assertFalse(session.dispatcher.recording)
+        self.assertEqual(session.finish(), STATUS_OK)
+
+    @parameterized.expand([
+        ("long_block", ["REPEAT 1", "REPEAT 2", "MOVE", "MOVE", "END", "REPORT", "END", "REPORT"],
+         ["Error: Invalid REPEAT command - REPEAT block is longer than 4 lines.", "0,0,NORTH"]),
+        ("too_many_commands", ["REPEAT 2", "REPEAT 3", "MOVE", "END", "END", "REPEAT 1", "REPEAT 3", "MOVE", "END",
+                               "END", "REPORT"],
+         ["Error: Invalid REPEAT command - Invalid REPEAT command: 2. Error: runs 6 commands, more than the limit "
+          "of 5", "0,3,NORTH"]),
+        ("call_too_many_commands", ["DEFINE HOP", "REPEAT 6", "MOVE", "END", "END", "CALL HOP", "REPORT"],
+         ["Error: Invalid CALL command - Invalid CALL command: HOP. Error: runs 6 commands, more than the limit "
+          "of 5", "0,0,NORTH"]),
+    ])
+    def test_limits(self, name, commands, expected):
+        session = Session(CONFIG, ListSink())
+        session.limit_blocks(4, 5)
+        session.run(["PLACE 0,0,NORTH", *commands])
+        self.assertEqual(session.output_sink.messages, expected)
+        self.assertFalse(session.dispatcher.recording)
+
+    def test_exit_inside_loop(self):
+        _, records, status = run_session(["PLACE 0,0,NORTH", "REPEAT 1000000000000", "MOVE", "REPORT", "EXIT",
+                                          "END", "REPORT"])
+        self.assertEqual(status, STATUS_EXIT)
+        self.assertEqual([message for _, message in records], ["0,1,NORTH", "Goodbye!"])
+
+    def test_blocks_are_recorded_not_run(self):
+        session, records, _ = run_session(["DEFINE HOP", "MOVE", "REPORT", "END", "REPEAT 0", "JUMP", "END"])
+        self.assertEqual(records, [])  # Not even "Robot not placed" while recording
+        self.assertFalse(session.dispatcher.recording)
+        session, records, _ = run_session(["REPEAT 2", "MOVE"])
+        self.assertTrue(session.dispatcher.recording)
+        self.assertEqual(records, [])
+
+    def test_calls_bind_when_recorded(self):
+        _, records, _ = run_session(["PLACE 0,0,NORTH", "DEFINE STEP", "MOVE", "END", "DEFINE TWICE", "CALL STEP",
+                                     "CALL STEP", "END", "DEFINE STEP", "RIGHT", "END", "CALL TWICE", "CALL STEP",
+                                     "REPORT"])
+        self.assertEqual([message for _, message in records], ["0,2,EAST"])
+
+    @parameterized.expand([
+        ("end_without_block", ["END"], "Error: Invalid END command - no DEFINE or REPEAT block is open."),
+        ("undefined_macro", ["CALL hop"],
+         "Error: Invalid CALL command - Invalid CALL command: hop. Error: no macro named HOP"),
+        ("undefined_macro_in_block", ["REPEAT 1", "CALL hop", "END"],
+         "Error: Invalid CALL command - Invalid CALL command: hop. Error: no macro named HOP"),
+        ("negative_count", ["REPEAT -1", "MOVE", "END"],
+         "Error: Invalid REPEAT command - Invalid REPEAT command: -1. Error: expected a count of 0 or more"),
+        ("invalid_count", ["REPEAT x", "MOVE", "END"],
+         "Error: Invalid REPEAT command - Invalid REPEAT command: x. Error: expected a count of 0 or more"),
+        ("keyword_name", ["DEFINE report", "MOVE", "END"],
+         "Error: Invalid DEFINE command - Invalid DEFINE command: report. "
+         "Error: 'REPORT' is a command and cannot be a macro name."),
+        ("nested_define", ["REPEAT 2", "DEFINE HOP", "MOVE", "END", "END"],
+         "Error: Invalid DEFINE command - Invalid DEFINE command: HOP. Error: DEFINE cannot be used inside a block."),
+    ])
+    def test_invalid_blocks(self, name, commands, expected_error):
+        session = Session(CONFIG, ListSink())
+        session.run(["PLACE 0,0,NORTH"])
+        for command in commands:
+            session.dispatcher.dispatch(command, session.robot, session.table)
+        self.assertEqual(session.output_sink.messages, [expected_error])
+        # An invalid block is dropped whole, and its END still matches it
+        self.assertEqual((session.robot.position.x, session.robot.position.y), (0, 0))
+        self.assertFalse(session.dispatcher.recording)
+        self.assertEqual(session.dispatcher.dispatch("REPORT", session.robot, session.table), STATUS_OK)
+
+if __name__ == "__main__":
+    unittest.main()
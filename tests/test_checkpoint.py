@@ -0,0 +1,208 @@
+"""
+Filename: test_checkpoint.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for checkpoint and resume. Validates the binary checkpoint
+    format and that a replay interrupted part-way and resumed from its last
+    checkpoint ends in the same state as an uninterrupted replay.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+from toyrobot.checkpoint import (
+    Checkpoint, CheckpointRunner, OffsetCommandReader, capture_checkpoint, restore_checkpoint,
+    save_checkpoint, load_checkpoint, CHECKPOINT_RECORD
+)
+from toyrobot.command_dispatcher import CommandDispatcher, STATUS_EXIT
+from toyrobot.output_sink import ListSink
+from toyrobot.position import Position
+from toyrobot.robot import Robot
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.table import Table
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+COMMANDS = ["REPORT", "PLACE 0,0,NORTH", "MOVE", "REPORT", "RIGHT", "MOVE", "MOVE", "REPORT",
+            "JUMP", "LEFT", "MOVE", "REPORT", "PLACE 4,4,SOUTH", "MOVE", "REPORT", "LEFT", "REPORT"]
+
+class InterruptingDispatcher(CommandDispatcher):
+    """A dispatcher that raises KeyboardInterrupt after a number of commands."""
+    def __init__(self, output_sink, interrupt_after):
+        super().__init__(output_sink)
+        self.remaining = interrupt_after
+
+    def dispatch(self, command, robot, table):
+        if self.remaining == 0:
+            raise KeyboardInterrupt
+        self.remaining -= 1
+        return super().dispatch(command, robot, table)
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, "commands.txt")
+        self.path = os.path.join(self.directory, "replay.ckpt")
+        with open(self.source, 'w') as f:
+            f.write("\r\n".join(COMMANDS[:3]) + "\n" + "\n".join(COMMANDS[3:]))
+        self.table = Table(5, 5)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_robot(self, sink):
+        return Robot(DIRECTIONS, robot_reporter=RobotReporter(sink))
+
+    @parameterized.expand([
+        ("placed", Checkpoint(1234, 56, True, 3, 4, 270)),
+        ("not_placed", Checkpoint(0, 0, False, 0, 0, 0.0)),
+        ("large_coordinates", Checkpoint(2**40, 2**40, True, 10**18, 10**18 - 1, 90)),
+        ("fingerprint", Checkpoint(5, 1, False, 0, 0, 0.0, (), "", bytes(range(16)))),
+    ])
+    def test_save_and_load(self, name, checkpoint):
+        save_checkpoint(self.path, checkpoint)
+        self.assertEqual(os.path.getsize(self.path), CHECKPOINT_RECORD.size)
+        self.assertEqual(load_checkpoint(self.path), checkpoint)
+
+    def test_save_and_load_obstacles(self):
+        checkpoint = Checkpoint(99, 7, True, 1, 2, 0, ((3, 4), (0, 0), (10**18, 5)))
+        save_checkpoint(self.path, checkpoint)
+        self.assertEqual(os.path.getsize(self.path), CHECKPOINT_RECORD.size + 3 * 16)
+        self.assertEqual(load_checkpoint(self.path), checkpoint)
+
+    def test_load_missing_and_invalid_checkpoints(self):
+        self.assertIsNone(load_checkpoint(self.path))
+        with open(self.path, 'wb') as f:
+            f.write(b"not a checkpoint")
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+
+    def test_capture_and_restore(self):
+        robot = self.make_robot(ListSink())
+        robot.position = Position(2, 3)
+        robot.facing_angle = 180
+        restored = self.make_robot(ListSink())
+        restore_checkpoint(capture_checkpoint(robot, 10, 2), restored)
+        self.assertEqual((restored.position.x, restored.position.y, restored.facing_angle), (2, 3, 180))
+        self.assertIsInstance(restored.facing_angle, int)
+        restore_checkpoint(capture_checkpoint(self.make_robot(ListSink()), 0, 0), restored)
+        self.assertIsNone(restored.position)
+
+    def test_offset_reader_resumes_mid_file(self):
+        reader = OffsetCommandReader(self.source)
+        lines = iter(reader)
+        for _ in range(5):
+            next(lines)
+        lines.close()
+        remaining = list(OffsetCommandReader(self.source, reader.offset))
+        self.assertEqual([line.strip() for line in remaining], COMMANDS[5:])
+
+    @parameterized.expand([
+        ("interval_1", 1, 9),
+        ("interval_4", 4, 10),
+        ("interval_4_on_boundary", 4, 8),
+    ])
+    def test_resume_matches_uninterrupted_run(self, name, interval, interrupt_after):
+        expected_sink = ListSink()
+        expected_robot = self.make_robot(expected_sink)
+        CheckpointRunner(CommandDispatcher(expected_sink), self.path, interval).run(
+            self.source, expected_robot, self.table)
+
+        sink = ListSink()
+        with self.assertRaises(KeyboardInterrupt):
+            CheckpointRunner(InterruptingDispatcher(sink, interrupt_after), self.path, interval).run(
+                self.source, self.make_robot(sink), self.table)
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(checkpoint.commands, interrupt_after // interval * interval)
+
+        resumed_sink = ListSink()
+        resumed_robot = self.make_robot(resumed_sink)
+        CheckpointRunner(CommandDispatcher(resumed_sink), self.path, interval).run(
+            self.source, resumed_robot, self.table, resume=True)
+
+        self.assertEqual(str(resumed_robot.position), str(expected_robot.position))
+        self.assertEqual(resumed_robot.facing_angle, expected_robot.facing_angle)
+        # Output before the checkpoint is not repeated
+        self.assertEqual(resumed_sink.messages, expected_sink.messages[-len(resumed_sink.messages):])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_keeps_obstacles(self):
+        with open(self.source, 'w') as f:
+            f.write("OBSTACLE 2,2\nPLACE 2,0,NORTH\nMOVE\nREPORT\nMOVE\nREPORT\nOBSTACLE 3,1\nRIGHT\nMOVE\nREPORT\n")
+        with self.assertRaises(KeyboardInterrupt):
+            sink = ListSink()
+            CheckpointRunner(InterruptingDispatcher(sink, 5), self.path, 2).run(
+                self.source, self.make_robot(sink), Table(5, 5))
+        self.assertEqual(load_checkpoint(self.path).obstacles, ((2, 2),))
+
+        sink = ListSink()
+        table = Table(5, 5)
+        CheckpointRunner(CommandDispatcher(sink), self.path, 2).run(self.source, self.make_robot(sink), table,
+                                                                     resume=True)
+        self.assertEqual(sink.messages, ["2,1,NORTH", "2,1,EAST"])
+        self.assertEqual(list(table.obstacles), [(3, 1), (2, 2)])
+
+    def test_resume_keeps_macros(self):
+        with open(self.source, 'w') as f:
+            f.write("DEFINE HOP\nMOVE\nMOVE\nEND\nPLACE 0,0,NORTH\nREPEAT 2\nCALL HOP\nEND\nCALL hop\nREPORT\n")
+        with self.assertRaises(KeyboardInterrupt):
+            sink = ListSink()
+            CheckpointRunner(InterruptingDispatcher(sink, 7), self.path, 1).run(
+                self.source, self.make_robot(sink), self.table)
+        checkpoint = load_checkpoint(self.path)
+        # No checkpoint is saved while a block is being recorded
+        self.assertEqual(checkpoint.commands, 5)
+        self.assertEqual(checkpoint.definitions, "DEFINE HOP\nMOVE\nMOVE\nEND")
+
+        sink = ListSink()
+        CheckpointRunner(CommandDispatcher(sink), self.path, 1).run(self.source, self.make_robot(sink), self.table,
+                                                                     resume=True)
+        self.assertEqual(sink.messages, ["0,4,NORTH"])
+
+    @parameterized.expand([
+        ("edited", lambda text: text.replace("PLACE 0,0,NORTH", "PLACE 1,0,NORTH")),
+        ("truncated", lambda text: text[:10]),
+        ("replaced", lambda text: "PLACE 3,3,WEST\nREPORT\n" * 5),
+    ])
+    def test_resume_refuses_a_different_input(self, name, change):
+        with self.assertRaises(KeyboardInterrupt):
+            sink = ListSink()
+            CheckpointRunner(InterruptingDispatcher(sink, 9), self.path, 4).run(
+                self.source, self.make_robot(sink), self.table)
+        with open(self.source, newline="") as f:
+            text = f.read()
+        with open(self.source, 'w', newline="") as f:
+            f.write(change(text))
+
+        sink = ListSink()
+        with self.assertRaisesRegex(ValueError, "was not made from"):
+            CheckpointRunner(CommandDispatcher(sink), self.path, 4).run(self.source, self.make_robot(sink), self.table,
+                                                                         resume=True)
+        self.assertEqual(sink.messages, [])
+        self.assertTrue(os.path.exists(self.path))  # Kept, so the original input can still be resumed
+
+    def test_resume_after_appending_to_the_input(self):
+        with self.assertRaises(KeyboardInterrupt):
+            sink = ListSink()
+            CheckpointRunner(InterruptingDispatcher(sink, 9), self.path, 4).run(
+                self.source, self.make_robot(sink), self.table)
+        with open(self.source, 'a') as f:
+            f.write("\nPLACE 2,2,EAST\nREPORT\n")
+
+        sink = ListSink()
+        robot = self.make_robot(sink)
+        CheckpointRunner(CommandDispatcher(sink), self.path, 4).run(self.source, robot, self.table, resume=True)
+        self.assertEqual(sink.messages[-1], "2,2,EAST")
+
+    def test_exit_stops_the_run(self):
+        with open(self.source, 'w') as f:
+            f.write("PLACE 1,1,EAST\nEXIT\nREPORT\n")
+        sink = ListSink()
+        status = CheckpointRunner(CommandDispatcher(sink), self.path, 1).run(self.source, self.make_robot(sink), self.table)
+        self.assertEqual(status, STATUS_EXIT)
+        self.assertEqual(sink.messages, ["Goodbye!"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Filename: test_command_dispatcher.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the CommandDispatcher class. Validates the status code
+    and output of each command, including ignored and invalid commands.
+"""
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from parameterized import parameterized
+from toyrobot.command_dispatcher import (
+    CommandDispatcher, STATUS_OK, STATUS_IGNORED, STATUS_ERROR, STATUS_EXIT
+)
+from toyrobot.robot import Robot
+from toyrobot.table import Table
+
+class TestCommandDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.table = Table(5, 5)
+        self.directions = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+        self.robot = Robot(self.directions)
+        self.dispatcher = CommandDispatcher()
+
+    def dispatch(self, command):
+        captured_output = StringIO()
+        with redirect_stdout(captured_output):
+            status = self.dispatcher.dispatch(command, self.robot, self.table)
+        return status, captured_output.getvalue()
+
+    @parameterized.expand([
+        ("move", "MOVE", STATUS_IGNORED, "Command ignored: Robot not placed on the table.\n"),
+        ("report", "REPORT", STATUS_IGNORED, "Command ignored: Robot not placed on the table.\n"),
+        ("exit", "EXIT", STATUS_IGNORED, "Command ignored: Robot not placed on the table.\n"),
+        ("unknown", "JUMP", STATUS_IGNORED, "Command ignored: Robot not placed on the table.\n"),
+        ("blank", "", STATUS_OK, ""),
+    ])
+    def test_commands_before_place(self, name, command, expected_status, expected_output):
+        self.assertEqual(self.dispatch(command), (expected_status, expected_output))
+
+    @parameterized.expand([
+        ("report", "REPORT", STATUS_OK, "1,2,NORTH\n"),
+        ("move", "MOVE", STATUS_OK, ""),
+        ("exit", "EXIT", STATUS_EXIT, "Goodbye!\n"),
+        ("unknown", "JUMP", STATUS_ERROR, "Error: Unknown command 'JUMP'\n"),
+        ("bare_place", "PLACE", STATUS_ERROR, "Error: Unknown command 'PLACE'\n"),
+        ("out_of_bounds", "PLACE 5,0,NORTH", STATUS_ERROR,
+         "Error: Invalid PLACE command - Invalid PLACE command: 5,0,NORTH. "
+         "Error: Placement out of table bounds.\n"),
+        ("invalid_direction", "PLACE 0,0,UP", STATUS_ERROR,
+         "Error: Invalid PLACE command - Invalid PLACE command: 0,0,UP. Error: 'UP'\n"),
+        ("missing_arguments", "PLACE 1,NORTH", STATUS_ERROR,
+         "Error: Invalid PLACE command - Invalid PLACE command: 1,NORTH. "
+         "Error: invalid literal for int() with base 10: 'NORTH'\n"),
+        ("too_few_arguments", "PLACE 1,2", STATUS_ERROR,
+         "Error: Invalid PLACE command - Invalid PLACE command: 1,2. "
+         "Error: list index out of range\n"),
+    ])
+    def test_commands_after_place(self, name, command, expected_status, expected_output):
+        self.dispatch("PLACE 1,2,NORTH")
+        self.assertEqual(self.dispatch(command), (expected_status, expected_output))
+
+    def test_invalid_place_keeps_position(self):
+        self.dispatch("PLACE 1,2,NORTH")
+        self.dispatch("PLACE 9,9,EAST")
+        self.assertEqual(self.dispatch("REPORT"), (STATUS_OK, "1,2,NORTH\n"))
+
+    @parameterized.expand([
+        ("beyond_float_precision", 2**53 + 3),
+        ("side_10_18", 10**18),
+    ])
+    def test_large_table_is_exact(self, name, size):
+        self.table = Table(size, size)
+        corner = size - 2
+        self.dispatch(f"PLACE {corner},{corner},NORTH")
+        outputs = [self.dispatch(command)[1] for command in ("MOVE", "MOVE", "REPORT", "LEFT", "MOVE", "REPORT")]
+        self.assertEqual(outputs[2], f"{corner},{corner + 1},NORTH\n")
+        self.assertEqual(outputs[5], f"{corner - 1},{corner + 1},WEST\n")
+        self.assertEqual(self.dispatch(f"PLACE {size},0,EAST")[0], STATUS_ERROR)
+
+    @parameterized.expand([
+        ("valid", "OBSTACLE 2,2", STATUS_OK, ""),
+        ("repeated", "OBSTACLE 1,1", STATUS_OK, ""),
+        ("robot_cell", "OBSTACLE 1,0", STATUS_ERROR,
+         "Error: Invalid OBSTACLE command - Invalid OBSTACLE command: 1,0. Error: Cell is occupied by the robot.\n"),
+        ("out_of_bounds", "OBSTACLE 5,0", STATUS_ERROR,
+         "Error: Invalid OBSTACLE command - Invalid OBSTACLE command: 5,0. Error: Obstacle out of table bounds.\n"),
+        ("malformed", "OBSTACLE 1,2,3", STATUS_ERROR,
+         "Error: Invalid OBSTACLE command - Invalid OBSTACLE command: 1,2,3. Error: expected X,Y\n"),
+        ("bare", "OBSTACLE", STATUS_ERROR, "Error: Unknown command 'OBSTACLE'\n"),
+    ])
+    def test_obstacle_command(self, name, command, expected_status, expected_output):
+        self.assertEqual(self.dispatch("OBSTACLE 1,1"), (STATUS_OK, ""))  # Allowed before PLACE
+        self.dispatch("PLACE 1,0,NORTH")
+        self.assertEqual(self.dispatch(command), (expected_status, expected_output))
+
+    def test_obstacles_block_move_and_place(self):
+        self.dispatch("OBSTACLE 1,1")
+        self.assertEqual(self.dispatch("PLACE 1,1,NORTH"), (STATUS_ERROR,
+                         "Error: Invalid PLACE command - Invalid PLACE command: 1,1,NORTH. "
+                         "Error: Placement blocked by an obstacle.\n"))
+        self.dispatch("PLACE 1,0,NORTH")
+        self.dispatch("MOVE")
+        self.assertEqual(self.dispatch("REPORT"), (STATUS_OK, "1,0,NORTH\n"))
+        self.dispatch("RIGHT")
+        self.dispatch("MOVE")
+        self.dispatch("LEFT")
+        self.dispatch("MOVE")
+        self.assertEqual(self.dispatch("REPORT"), (STATUS_OK, "2,1,NORTH\n"))
+
+if __name__ == "__main__":
+    unittest.main()
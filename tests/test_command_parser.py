@@ -0,0 +1,57 @@
+"""
+Filename: test_command_parser.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the command tokenizer. Validates that command lines are
+    converted into the expected opcode and argument, including blank,
+    lower case and malformed lines.
+"""
+import unittest
+from parameterized import parameterized
+from toyrobot.command_parser import (
+    tokenize, format_token, OP_NOP, OP_PLACE, OP_MOVE, OP_LEFT, OP_RIGHT, OP_REPORT, OP_EXIT, OP_UNKNOWN,
+    OP_OBSTACLE, OP_DEFINE, OP_REPEAT, OP_END, OP_CALL, OP_PATH
+)
+
+class TestCommandParser(unittest.TestCase):
+    @parameterized.expand([
+        ("place", "PLACE 1,2,NORTH\n", OP_PLACE, "1,2,NORTH"),
+        ("place_extra_words", "PLACE 1,2,NORTH now", OP_PLACE, "1,2,NORTH"),
+        ("place_double_space", "PLACE  1,2,NORTH", OP_PLACE, ""),
+        ("bare_place", "PLACE", OP_UNKNOWN, "PLACE"),
+        ("move", "MOVE\n", OP_MOVE, None),
+        ("lower_case", "left", OP_LEFT, None),
+        ("padded", "  RIGHT  ", OP_RIGHT, None),
+        ("trailing_words", "REPORT please", OP_REPORT, None),
+        ("exit", "EXIT", OP_EXIT, None),
+        ("obstacle", "obstacle 3,4\n", OP_OBSTACLE, "3,4"),
+        ("bare_obstacle", "OBSTACLE", OP_UNKNOWN, "OBSTACLE"),
+        ("define", "define Square\n", OP_DEFINE, "Square"),
+        ("repeat", "REPEAT 10", OP_REPEAT, "10"),
+        ("bare_repeat", "REPEAT", OP_UNKNOWN, "REPEAT"),
+        ("end", "end", OP_END, None),
+        ("call", "CALL square", OP_CALL, "square"),
+        ("path", "path 3,4,EAST", OP_PATH, "3,4,EAST"),
+        ("unknown", "jump", OP_UNKNOWN, "JUMP"),
+        ("blank", "   \n", OP_NOP, None),
+    ])
+    def test_tokenize(self, name, command, expected_opcode, expected_argument):
+        self.assertEqual(tokenize(command), (expected_opcode, expected_argument))
+
+    @parameterized.expand([
+        ("place", "place 1,2,NORTH"),
+        ("place_double_space", "PLACE  1,2,NORTH"),
+        ("obstacle_double_space", "OBSTACLE  3,4"),
+        ("move", "move"),
+        ("end", "END"),
+        ("repeat", "REPEAT 5"),
+        ("unknown", "jump"),
+    ])
+    def test_format_token_round_trip(self, name, command):
+        token = tokenize(command)
+        self.assertEqual(tokenize(format_token(*token)), token)
+
+if __name__ == "__main__":
+    unittest.main()
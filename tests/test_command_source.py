@@ -0,0 +1,65 @@
+"""
+Filename: test_command_source.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the streaming command sources. Validates that file,
+    memory-mapped and stream sources yield the same command lines lazily.
+"""
+import os
+import tempfile
+import unittest
+from io import StringIO
+from parameterized import parameterized
+from toyrobot.command_source import open_command_source, iter_stream_commands, iter_file_range_commands
+
+COMMANDS = "PLACE 0,0,NORTH\nMOVE\nREPORT\nLEFT\nREPORT"
+
+class TestCommandSource(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, 'w') as f:
+            f.write(COMMANDS)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    @parameterized.expand([
+        ("buffered_file", False),
+        ("memory_mapped_file", True),
+    ])
+    def test_file_sources(self, name, use_mmap):
+        commands = list(open_command_source(self.path, use_mmap=use_mmap))
+        self.assertEqual(commands, COMMANDS.splitlines(keepends=True))
+
+    @parameterized.expand([
+        ("buffered_file", False),
+        ("memory_mapped_file", True),
+    ])
+    def test_empty_file(self, name, use_mmap):
+        with open(self.path, 'w'):
+            pass
+        self.assertEqual(list(open_command_source(self.path, use_mmap=use_mmap)), [])
+
+    def test_sources_are_lazy(self):
+        commands = open_command_source("missing_file.txt")
+        # Nothing is opened until the first command is requested
+        with self.assertRaises(FileNotFoundError):
+            next(commands)
+
+    @parameterized.expand([
+        ("whole_file", 0, None, COMMANDS.splitlines(keepends=True)),
+        ("middle", 16, 28, ["MOVE\n", "REPORT\n"]),
+        ("to_end", 33, None, ["REPORT"]),
+        ("empty", 16, 16, []),
+    ])
+    def test_file_range(self, name, start, end, expected):
+        self.assertEqual(list(iter_file_range_commands(self.path, start, end)), expected)
+
+    def test_stream_source(self):
+        commands = list(iter_stream_commands(StringIO(COMMANDS)))
+        self.assertEqual(commands, COMMANDS.splitlines(keepends=True))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Filename: test_config.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for loading and compiling the configuration. Validates the
+    compiled bounds, the fallback to the default configuration, that
+    invalid configurations are rejected up front, and the compiled
+    configuration cache.
+"""
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from parameterized import parameterized
+from toyrobot.config import compile_config, load_config, config_cache_path, DEFAULT_CONFIG
+
+class TestConfig(unittest.TestCase):
+    def test_compile_config(self):
+        config = compile_config({"table_size": {"width": 3, "length": 7},
+                                 "directions": DEFAULT_CONFIG["directions"]})
+        self.assertEqual((config.max_x, config.max_y), (6, 2))
+        self.assertEqual(config["table_size"], {"width": 3, "length": 7})
+        self.assertEqual(config.directions.name_for(270), "SOUTH")
+        self.assertIs(compile_config(config), config)
+        self.assertEqual(config.obstacles, ())
+
+    def test_compile_config_with_obstacles(self):
+        config = compile_config({"table_size": {"width": 3, "length": 7}, "directions": DEFAULT_CONFIG["directions"],
+                                 "obstacles": [[6, 2], [0, 1]]})
+        self.assertEqual(config.obstacles, ((6, 2), (0, 1)))
+        self.assertEqual(config["obstacles"], [[6, 2], [0, 1]])
+        self.assertEqual(pickle.loads(pickle.dumps(config)).obstacles, config.obstacles)
+
+    @parameterized.expand([
+        ("missing_table_size", {"directions": {"NORTH": 90}}),
+        ("zero_width", {"table_size": {"width": 0, "length": 5}, "directions": {"NORTH": 90}}),
+        ("non_integer_length", {"table_size": {"width": 5, "length": "5"}, "directions": {"NORTH": 90}}),
+        ("duplicate_angle", {"table_size": {"width": 5, "length": 5}, "directions": {"NORTH": 90, "UP": 90}}),
+        ("obstacle_off_table", {"table_size": {"width": 5, "length": 5}, "directions": {"NORTH": 90},
+                                "obstacles": [[1, 1], [5, 0]]}),
+        ("obstacle_not_a_pair", {"table_size": {"width": 5, "length": 5}, "directions": {"NORTH": 90},
+                                 "obstacles": [[1, 1, 1]]}),
+        ("obstacle_not_a_list", {"table_size": {"width": 5, "length": 5}, "directions": {"NORTH": 90},
+                                 "obstacles": [1, 1]}),
+    ])
+    def test_rejects_invalid_config(self, name, config):
+        with self.assertRaises(ValueError):
+            compile_config(config)
+
+    def test_load_config_falls_back_to_default(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = StringIO()
+            with redirect_stdout(output):
+                config = load_config(os.path.join(directory, "missing.json"))
+        self.assertIn("Using default configuration.", output.getvalue())
+        self.assertEqual(dict(config.directions), DEFAULT_CONFIG["directions"])
+
+    def test_load_config_rejects_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "config.json")
+            with open(path, "w") as f:
+                json.dump({"table_size": {"width": 5, "length": 5}, "directions": {"NORTHEAST": 45}}, f)
+            with self.assertRaises(ValueError):
+                load_config(path)
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "config.json")
+        self.write_config(5, 5)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_config(self, width, length, mtime_ns=None, obstacles=()):
+        with open(self.path, "w") as f:
+            json.dump({"table_size": {"width": width, "length": length}, "directions": DEFAULT_CONFIG["directions"],
+                       "obstacles": list(obstacles)}, f)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_cache_is_written_and_reused(self):
+        first = load_config(self.path)
+        self.assertTrue(os.path.exists(config_cache_path(self.path)))
+        # Corrupt the file without changing its size or mtime: only the cache can answer
+        stat = os.stat(self.path)
+        with open(self.path, "w") as f:
+            f.write("x" * stat.st_size)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        second = load_config(self.path)
+        self.assertEqual((second.width, second.length, dict(second.directions)),
+                         (first.width, first.length, dict(first.directions)))
+
+    def test_cache_keeps_obstacles(self):
+        self.write_config(5, 5, obstacles=[[1, 2], [3, 4]])
+        load_config(self.path)
+        self.assertEqual(load_config(self.path).obstacles, ((1, 2), (3, 4)))
+
+    def test_changed_file_invalidates_cache(self):
+        self.write_config(5, 5, mtime_ns=1_000_000_000)
+        load_config(self.path)
+        self.write_config(3, 7, mtime_ns=2_000_000_000)
+        config = load_config(self.path)
+        self.assertEqual((config.width, config.length), (3, 7))
+
+    @parameterized.expand([
+        ("garbage", b"not a cache"),
+        ("empty", b""),
+    ])
+    def test_unreadable_cache_is_ignored(self, name, data):
+        load_config(self.path)
+        with open(config_cache_path(self.path), "wb") as f:
+            f.write(data)
+        self.assertEqual(load_config(self.path).width, 5)
+
+    def test_cache_disabled(self):
+        load_config(self.path, use_cache=False)
+        self.assertFalse(os.path.exists(config_cache_path(self.path)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Filename: test_direction_model.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the DirectionModel class. Validates the precomputed
+    lookups and that invalid direction configurations are rejected.
+"""
+import unittest
+from parameterized import parameterized
+from toyrobot.direction_model import DirectionModel, compile_directions
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+
+class TestDirectionModel(unittest.TestCase):
+    def setUp(self):
+        self.model = DirectionModel(DIRECTIONS)
+
+    def test_behaves_like_directions_dict(self):
+        self.assertEqual(dict(self.model), DIRECTIONS)
+        self.assertEqual(self.model["NORTH"], 90)
+        self.assertIn("WEST", self.model)
+
+    @parameterized.expand([
+        ("exact", "NORTH", 90),
+        ("lowercase", "south", 270),
+        ("mixed_case_padded", " West\t", 180),
+        ("unknown", "UP", None),
+    ])
+    def test_angle_for(self, name, direction, expected_angle):
+        self.assertEqual(self.model.angle_for(direction), expected_angle)
+
+    @parameterized.expand([
+        ("east", 0, "EAST"),
+        ("north", 90, "NORTH"),
+        ("full_turn", 450, "NORTH"),
+        ("negative", -90, "SOUTH"),
+        ("float", 180.0, "WEST"),
+        ("not_configured", 45, None),
+    ])
+    def test_name_for(self, name, angle, expected_name):
+        self.assertEqual(self.model.name_for(angle), expected_name)
+
+    def test_heading_and_steps(self):
+        self.assertEqual([self.model.heading_for(name) for name in ("EAST", "NORTH", "WEST", "SOUTH")], [0, 1, 2, 3])
+        self.assertEqual(self.model.steps_by_angle[90], (0, 1))
+        self.assertEqual(self.model.steps_by_angle[270], (0, -1))
+
+    @parameterized.expand([
+        ("empty", {}),
+        ("not_right_angle", {"NORTHEAST": 45}),
+        ("duplicate_angle", {"NORTH": 90, "UP": 90}),
+        ("duplicate_angle_after_normalising", {"EAST": 0, "AROUND": 360}),
+        ("duplicate_name_ignoring_case", {"NORTH": 90, "north": 0}),
+        ("non_numeric_angle", {"NORTH": "90"}),
+    ])
+    def test_rejects_invalid_directions(self, name, directions):
+        with self.assertRaises(ValueError):
+            DirectionModel(directions)
+
+    def test_compile_directions_reuses_models(self):
+        self.assertIs(compile_directions(dict(DIRECTIONS)), compile_directions(dict(DIRECTIONS)))
+        self.assertIs(compile_directions(self.model), self.model)
+
+if __name__ == "__main__":
+    unittest.main()
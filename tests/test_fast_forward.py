@@ -0,0 +1,76 @@
+"""
+Filename: test_fast_forward.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the FastForwardRunner class. Validates that folding runs
+    of MOVE and turn commands produces exactly the same output as executing
+    every command, and that folded commands are counted.
+"""
+import random
+import unittest
+from parameterized import parameterized
+from toyrobot.command_dispatcher import CommandDispatcher, STATUS_EXIT
+from toyrobot.fast_forward import FastForwardRunner
+from toyrobot.output_sink import ListSink
+from toyrobot.robot import Robot
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.table import Table
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+
+def create_robot():
+    sink = ListSink()
+    return Robot(DIRECTIONS, robot_reporter=RobotReporter(sink)), CommandDispatcher(sink), sink
+
+class TestFastForward(unittest.TestCase):
+    def setUp(self):
+        self.table = Table(5, 7)
+
+    def run_both(self, commands):
+        # Each run gets its own table, as OBSTACLE commands change it
+        robot, dispatcher, expected = create_robot()
+        table = Table(self.table.width, self.table.length)
+        for command in commands:
+            if dispatcher.dispatch(command, robot, table) == STATUS_EXIT:
+                break
+
+        robot, dispatcher, actual = create_robot()
+        runner = FastForwardRunner(dispatcher)
+        runner.run(commands, robot, Table(self.table.width, self.table.length))
+        return expected.records, actual.records, runner.folded
+
+    @parameterized.expand([(seed,) for seed in range(5)])
+    def test_matches_unfolded_output(self, seed):
+        rng = random.Random(seed)
+        commands = rng.choices(
+            ["MOVE", "LEFT", "RIGHT", "REPORT", "", "JUMP", "PLACE 0,0,NORTH", "PLACE 4,6,WEST", "EXIT"],
+            [40, 6, 6, 5, 2, 1, 1, 1, 0.1], k=2000)
+        expected, actual, _ = self.run_both(commands)
+        self.assertEqual(actual, expected)
+
+    def test_folded_count(self):
+        commands = ["MOVE", "PLACE 0,0,NORTH"] + ["MOVE"] * 10 + ["LEFT", "RIGHT", "RIGHT", "REPORT"]
+        expected, actual, folded = self.run_both(commands)
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual[-1][1], "0,4,EAST")
+        self.assertEqual(folded, 9 + 2)
+
+    @parameterized.expand([(seed,) for seed in range(3)])
+    def test_matches_unfolded_output_with_obstacles(self, seed):
+        rng = random.Random(seed)
+        commands = ["OBSTACLE 2,3", "OBSTACLE 3,0"] + rng.choices(
+            ["MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 0,0,NORTH", "PLACE 4,3,WEST", "OBSTACLE 1,4", "OBSTACLE 5,1"],
+            [40, 6, 6, 5, 1, 1, 0.5, 0.5], k=2000)
+        expected, actual, _ = self.run_both(commands)
+        self.assertEqual(actual, expected)
+
+    def test_matches_unfolded_output_with_blocks(self):
+        commands = ["PLACE 0,0,NORTH", "MOVE", "MOVE", "DEFINE TURN", "RIGHT", "MOVE", "END", "REPEAT 1000000",
+                    "MOVE", "CALL TURN", "END", "REPORT", "MOVE", "MOVE", "REPEAT 2", "REPORT", "LEFT", "END"]
+        expected, actual, _ = self.run_both(commands)
+        self.assertEqual(actual, expected)
+
+if __name__ == "__main__":
+    unittest.main()
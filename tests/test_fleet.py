@@ -0,0 +1,120 @@
+"""
+Filename: test_fleet.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the Fleet class. Validates that every robot in a
+    vectorised fleet produces exactly the output of the scalar Robot path.
+"""
+import random
+import unittest
+from parameterized import parameterized
+from toyrobot.command_dispatcher import CommandDispatcher, STATUS_EXIT, ANALYTICS_DISABLED_MESSAGE
+from toyrobot.fleet import Fleet
+from toyrobot.output_sink import ListSink
+from toyrobot.robot import Robot
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.table import Table
+
+COMMANDS = ["MOVE", "LEFT", "RIGHT", "REPORT", "JUMP", "", "EXIT", "PLACE",
+            "PLACE 1,2,NORTH", "PLACE 0,0,EAST", "PLACE 4,4,SOUTH", "PLACE 2,3,WEST",
+            "PLACE 5,5,NORTH", "PLACE 1,1,UP", "PLACE 1,NORTH"]
+
+def run_scalar(commands, table, directions):
+    """Runs commands through a single scalar robot and returns its output."""
+    sink = ListSink()
+    robot = Robot(directions, robot_reporter=RobotReporter(sink))
+    dispatcher = CommandDispatcher(sink)
+    for command in commands:
+        if dispatcher.dispatch(command, robot, table) == STATUS_EXIT:
+            break
+    return sink.messages
+
+class TestFleet(unittest.TestCase):
+    def setUp(self):
+        self.directions = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+
+    @parameterized.expand([
+        ("square_table", 5, 5, []),
+        ("wide_table", 3, 7, []),
+        ("dense_obstacles", 5, 5, [(1, 3), (2, 2), (0, 1), (4, 3)]),
+        ("sparse_obstacles", 10**4, 10**4, [(1, 3), (2, 2), (0, 1), (4, 3)]),
+    ])
+    def test_matches_scalar_robots(self, name, width, length, obstacles):
+        table = Table(width, length, obstacles)
+        rng = random.Random(width * 100 + length)
+        weights = [8, 3, 3, 4, 1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1]
+        columns = [rng.choices(COMMANDS, weights, k=rng.randint(0, 60)) for _ in range(50)]
+
+        fleet = Fleet(len(columns), table, self.directions)
+        outputs = fleet.run(columns)
+
+        for index, column in enumerate(columns):
+            with self.subTest(robot=index):
+                self.assertEqual(outputs[index], run_scalar(column, table, self.directions))
+
+    def test_empty_and_shared_columns(self):
+        table = Table(5, 5)
+        self.assertEqual(Fleet(2, table, self.directions).run([[], []]), [[], []])
+        shared = ["PLACE 1,2,NORTH", "MOVE", "REPORT", "JUMP", "REPORT"]
+        outputs = Fleet(3, table, self.directions).run([shared, [], shared[:3]])
+        self.assertEqual(outputs, [run_scalar(shared, table, self.directions), [], ["1,3,NORTH"]])
+
+    def test_execute_broadcasts_command(self):
+        fleet = Fleet(3, Table(5, 5), self.directions)
+        for command in ("PLACE 0,0,NORTH", "MOVE", "MOVE", "RIGHT", "MOVE", "REPORT"):
+            fleet.execute(command)
+        self.assertEqual(fleet.outputs, [["1,2,EAST"]] * 3)
+        self.assertEqual(fleet.states(), [(1, 2, 0)] * 3)
+
+    def test_rejects_non_compass_directions(self):
+        with self.assertRaises(ValueError):
+            Fleet(1, Table(5, 5), {"NORTHEAST": 45})
+
+    def test_large_table(self):
+        side = 10**18
+        fleet = Fleet(2, Table(side, side), self.directions)
+        for command in (f"PLACE {side - 2},{side - 2},NORTH", "MOVE", "MOVE", "RIGHT", "MOVE", "MOVE", "REPORT"):
+            fleet.execute(command)
+        self.assertEqual(fleet.outputs, [[f"{side - 1},{side - 1},EAST"]] * 2)
+
+    def test_obstacle_commands_are_rejected(self):
+        fleet = Fleet(2, Table(5, 5), self.directions)
+        fleet.execute("OBSTACLE 1,1")
+        self.assertIsNone(fleet.table.obstacles)
+        self.assertEqual(fleet.outputs, [["Error: Invalid OBSTACLE command - Invalid OBSTACLE command: 1,1. "
+                                          "Error: Obstacles must be set on the fleet's shared Table."]] * 2)
+
+    def test_block_commands_are_rejected(self):
+        fleet = Fleet(2, Table(5, 5), self.directions)
+        fleet.execute("REPEAT 3")
+        fleet.execute("MOVE")
+        self.assertEqual(fleet.outputs, [["Error: Invalid REPEAT command - Invalid REPEAT command: 3. "
+                                          "Error: DEFINE, REPEAT, END and CALL are not supported by the fleet.",
+                                          "Command ignored: Robot not placed on the table."]] * 2)
+
+    def test_heatmap_matches_scalar_robots(self):
+        table = Table(5, 5)
+        columns = [["HEATMAP", "PLACE 0,0,NORTH", "HEATMAP"], ["STATS", "HEATMAP"]]
+        outputs = Fleet(2, table, self.directions).run(columns)
+        self.assertEqual(outputs, [run_scalar(column, table, self.directions) for column in columns])
+        self.assertEqual(outputs[0], [ANALYTICS_DISABLED_MESSAGE] * 2)
+
+    def test_path_is_planned_per_robot(self):
+        fleet = Fleet(3, Table(5, 5, [(1, 1)]), self.directions)
+        fleet.run([["PLACE 0,0,NORTH", "PATH 2,1,NORTH"], ["PLACE 2,2,SOUTH", "PATH 2,1,NORTH"],
+                   ["PATH 2,1,NORTH", "PLACE 0,0,EAST", "PATH 1,1,EAST"]])
+        self.assertEqual(fleet.outputs, [
+            ["Path: RIGHT MOVE MOVE LEFT MOVE"],
+            ["Path: MOVE LEFT LEFT"],
+            ["Command ignored: Robot not placed on the table.",
+             "Error: Invalid PATH command - Invalid PATH command: 1,1,EAST. Error: Placement blocked by an obstacle."],
+        ])
+
+    def test_rejects_tables_beyond_64_bits(self):
+        with self.assertRaises(ValueError):
+            Fleet(1, Table(5, 2**63), self.directions)
+
+if __name__ == "__main__":
+    unittest.main()
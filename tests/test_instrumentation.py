@@ -0,0 +1,122 @@
+"""
+Filename: test_instrumentation.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for per-command instrumentation. Validates the counters and
+    latency histograms, the STATS command with and without instrumentation,
+    and that instrumenting a session leaves its output unchanged.
+"""
+import json
+import unittest
+from parameterized import parameterized
+from toyrobot.command_dispatcher import CommandDispatcher, STATS_DISABLED_MESSAGE, STATUS_OK
+from toyrobot.command_parser import OP_STATS
+from toyrobot.instrumentation import CommandStats, Instrumentation
+from toyrobot.output_sink import ListSink, KIND_INFO
+from toyrobot.robot import Robot
+from toyrobot.session import Session
+from toyrobot.table import Table
+
+CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+}
+COMMANDS = ["MOVE", "PLACE 0,0,NORTH", "MOVE", "MOVE", "LEFT", "RIGHT", "REPORT", "", "JUMP", "PLACE 9,9,EAST",
+            "REPORT"]
+
+class FakeClock:
+    """A clock that advances by a fixed number of nanoseconds on every reading."""
+    def __init__(self, step):
+        self.now = 0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+class TestCommandStats(unittest.TestCase):
+    @parameterized.expand([
+        ("single", [100], 50, 100),
+        ("bucket_bound", [100, 100, 100, 3000], 50, 128),
+        ("tail", [100, 100, 100, 3000], 99, 3000),
+        ("empty", [], 50, 0),
+    ])
+    def test_percentile(self, name, samples, percent, expected):
+        stats = CommandStats()
+        for sample in samples:
+            stats.record(sample)
+        self.assertEqual(stats.percentile(percent), expected)
+
+    def test_to_dict(self):
+        stats = CommandStats()
+        for sample in (100, 120, 5000):
+            stats.record(sample)
+        data = stats.to_dict()
+        self.assertEqual((data["count"], data["total_ns"], data["mean_ns"], data["max_ns"]), (3, 5220, 1740, 5000))
+        self.assertEqual(data["histogram"], {"128": 2, "8192": 1})
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.sink = ListSink()
+        self.instrumentation = Instrumentation(clock=FakeClock(10))
+        self.session = Session(CONFIG, self.sink, self.instrumentation)
+
+    def test_counts_per_command(self):
+        self.session.run(COMMANDS)
+        commands = self.instrumentation.snapshot()["commands"]
+        counts = {name: (stats["count"], stats["errors"], stats["ignored"]) for name, stats in commands.items()}
+        self.assertEqual(counts, {
+            "LEFT": (1, 0, 0), "MOVE": (3, 0, 1), "PLACE": (2, 1, 0), "REPORT": (2, 0, 0),
+            "RIGHT": (1, 0, 0), "UNKNOWN": (1, 1, 0),
+        })
+
+    def test_component_timing(self):
+        self.session.run(COMMANDS)
+        components = self.instrumentation.snapshot()["components"]
+        self.assertEqual(components["RobotPlacer.try_place"]["count"], 2)
+        self.assertEqual(components["RobotMover.move_one_space"]["count"], 2)
+        self.assertEqual(components["RobotReporter.report"]["count"], 2)
+        self.assertEqual(components["RobotMover.move_one_space"]["max_ns"], 10)
+
+    def test_output_unchanged(self):
+        plain = ListSink()
+        Session(CONFIG, plain).run(COMMANDS)
+        self.session.run(COMMANDS)
+        self.assertEqual(self.sink.records, plain.records)
+
+    def test_snapshot_is_json(self):
+        self.session.run(COMMANDS)
+        snapshot = self.instrumentation.snapshot()
+        self.assertEqual(json.loads(json.dumps(snapshot)), snapshot)
+
+    def test_reset(self):
+        self.session.run(COMMANDS)
+        self.instrumentation.reset()
+        self.session.run(["MOVE"])
+        snapshot = self.instrumentation.snapshot()
+        self.assertEqual(snapshot["commands"]["MOVE"]["count"], 1)
+        self.assertEqual(snapshot["commands"]["PLACE"]["count"], 0)
+        self.assertEqual(snapshot["components"]["RobotMover.move_one_space"]["count"], 1)
+
+    def test_stats_command(self):
+        self.session.run(["STATS", "PLACE 0,0,NORTH", "MOVE", "STATS"])
+        kinds = {kind for kind, _ in self.sink.records}
+        self.assertEqual(kinds, {KIND_INFO})
+        self.assertEqual(self.sink.messages[0], "STATS: no commands recorded.")
+        self.assertTrue(self.sink.messages[-1].startswith("STATS STATS: count=1 "))
+        # The command spans the component call, which reads the clock twice more
+        self.assertIn("STATS MOVE: count=1 errors=0 ignored=0 mean=30ns p50=30ns p90=30ns p99=30ns max=30ns",
+                      self.sink.messages)
+
+class TestStatsDisabled(unittest.TestCase):
+    def test_stats_without_instrumentation(self):
+        sink = ListSink()
+        dispatcher = CommandDispatcher(sink)
+        robot = Robot(CONFIG["directions"])
+        self.assertEqual(dispatcher.execute(OP_STATS, None, robot, Table(5, 5)), STATUS_OK)
+        self.assertEqual(sink.records, [(KIND_INFO, STATS_DISABLED_MESSAGE)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Filename: test_movement_engine.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the movement engines. Validates that the integer
+    LookupMovementEngine produces exactly the same positions as the
+    reference ComplexMovementEngine, including clamping at the table edges
+    and stopping in front of obstacles.
+"""
+import unittest
+from parameterized import parameterized
+from toyrobot.movement_engine import ComplexMovementEngine, LookupMovementEngine, unit_step
+from toyrobot.robot import Robot
+from toyrobot.table import Table
+from toyrobot.position import Position
+
+class TestMovementEngine(unittest.TestCase):
+    def setUp(self):
+        self.directions = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+
+    @parameterized.expand([
+        ("east", 0, (1, 0)),
+        ("north", 90, (0, 1)),
+        ("west", 180, (-1, 0)),
+        ("south", 270, (0, -1)),
+        ("negative_angle", -90, (0, -1)),
+        ("diagonal", 45, None),
+    ])
+    def test_unit_step(self, name, angle, expected_step):
+        self.assertEqual(unit_step(angle), expected_step)
+
+    @parameterized.expand([
+        ("square_table", 5, 5),
+        ("wide_table", 3, 7),
+        ("single_cell", 1, 1),
+    ])
+    def test_engines_agree(self, name, width, length):
+        table = Table(width, length)
+        reference = ComplexMovementEngine()
+        lookup = LookupMovementEngine(self.directions)
+
+        for x in range(length):
+            for y in range(width):
+                for angle in (0, 90, 180, 270, 45, 135):
+                    for distance in (1, 2, 10):
+                        expected_robot = Robot(self.directions)
+                        expected_robot.position = Position(x, y)
+                        expected_robot.facing_angle = angle
+                        reference.move(expected_robot, table, distance)
+
+                        robot = Robot(self.directions)
+                        robot.position = Position(x, y)
+                        robot.facing_angle = angle
+                        lookup.move(robot, table, distance)
+
+                        with self.subTest(x=x, y=y, angle=angle, distance=distance):
+                            self.assertEqual(robot.position.x, expected_robot.position.x)
+                            self.assertEqual(robot.position.y, expected_robot.position.y)
+
+    @parameterized.expand([
+        ("beyond_float_precision", 2**53 + 1),
+        ("side_10_18", 10**18),
+    ])
+    def test_engines_agree_on_large_tables(self, name, size):
+        table = Table(size, size)
+        reference = ComplexMovementEngine()
+        lookup = LookupMovementEngine(self.directions)
+
+        for x in (0, 1, size // 2, size - 2, size - 1):
+            for angle in (0, 90, 180, 270):
+                expected_robot = Robot(self.directions)
+                expected_robot.position = Position(x, size - 1 - x)
+                expected_robot.facing_angle = angle
+                reference.move(expected_robot, table, 1)
+
+                robot = Robot(self.directions)
+                robot.position = Position(x, size - 1 - x)
+                robot.facing_angle = angle
+                lookup.move(robot, table, 1)
+
+                with self.subTest(x=x, angle=angle):
+                    self.assertEqual((robot.position.x, robot.position.y),
+                                     (expected_robot.position.x, expected_robot.position.y))
+
+    @parameterized.expand([
+        # name, angle, distance, expected position
+        ("blocked", 0, 1, (1, 2)),
+        ("stops_before_obstacle", 0, 3, (2, 2)),
+        ("clear_path", 90, 10, (1, 4)),
+        ("backwards_into_edge", 180, 3, (0, 2)),
+    ])
+    def test_lookup_engine_obstacles(self, name, angle, distance, expected):
+        table = Table(5, 5, [(3, 2)])
+        robot = Robot(self.directions)
+        robot.position = Position(1, 2)
+        robot.facing_angle = angle
+        if name == "blocked":
+            table.add_obstacle(2, 2)
+        LookupMovementEngine(self.directions).move(robot, table, distance)
+        self.assertEqual((robot.position.x, robot.position.y), expected)
+
+    @parameterized.expand([
+        ("one_obstacle", 5, 5, [(0, 2)]),
+        ("wall", 5, 5, [(2, 0), (2, 1), (2, 2), (2, 3), (2, 4)]),
+        ("scattered", 6, 4, [(1, 1), (3, 0), (0, 3), (2, 2), (3, 3)]),
+    ])
+    def test_engines_agree_with_obstacles(self, name, width, length, obstacles):
+        table = Table(width, length, obstacles)
+        reference = ComplexMovementEngine()
+        lookup = LookupMovementEngine(self.directions)
+
+        for x in range(length):
+            for y in range(width):
+                if (x, y) in obstacles:
+                    continue
+                for angle in (0, 90, 180, 270):
+                    for distance in (1, 2, 3, 10, -1, -2, -3, -10):
+                        expected_robot = Robot(self.directions)
+                        expected_robot.position = Position(x, y)
+                        expected_robot.facing_angle = angle
+                        reference.move(expected_robot, table, distance)
+
+                        robot = Robot(self.directions)
+                        robot.position = Position(x, y)
+                        robot.facing_angle = angle
+                        lookup.move(robot, table, distance)
+
+                        with self.subTest(x=x, y=y, angle=angle, distance=distance):
+                            self.assertEqual((robot.position.x, robot.position.y),
+                                             (expected_robot.position.x, expected_robot.position.y))
+
+    def test_complex_engine_stops_before_obstacle(self):
+        table = Table(5, 5, [(0, 2)])
+        robot = Robot(self.directions)
+        robot.position = Position(0, 0)
+        robot.facing_angle = 90
+        ComplexMovementEngine().move(robot, table, 3)
+        self.assertEqual((robot.position.x, robot.position.y), (0, 1))
+
+    def test_complex_engine_stops_before_obstacle_backwards(self):
+        table = Table(5, 5, [(2, 1)])
+        robot = Robot(self.directions)
+        robot.position = Position(2, 3)
+        robot.facing_angle = 90
+        ComplexMovementEngine().move(robot, table, -3)
+        self.assertEqual((robot.position.x, robot.position.y), (2, 2))
+        ComplexMovementEngine().move(robot, table, -2.5)
+        self.assertEqual((robot.position.x, robot.position.y), (2, 2))
+
+    def test_complex_engine_ignores_blocked_destination(self):
+        table = Table(5, 5, [(1, 1)])
+        robot = Robot(self.directions)
+        robot.position = Position(0, 0)
+        robot.facing_angle = 45
+        ComplexMovementEngine().move(robot, table, 2 ** 0.5)
+        self.assertEqual((robot.position.x, robot.position.y), (0, 0))
+        robot.facing_angle = 90
+        ComplexMovementEngine().move(robot, table, 1)
+        self.assertEqual((robot.position.x, robot.position.y), (0, 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Filename: test_obstacle_map.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the obstacle maps. Validates that the dense and sparse
+    maps agree, that the table picks the right one for its size, and that
+    OBSTACLE arguments are parsed and checked against the table bounds.
+"""
+import unittest
+import numpy as np
+from parameterized import parameterized
+from toyrobot.obstacle_map import (
+    DenseObstacleMap, SparseObstacleMap, make_obstacle_map, parse_obstacle, DENSE_CELL_LIMIT
+)
+from toyrobot.table import Table
+
+CELLS = [(0, 0), (4, 2), (2, 4), (3, 1), (4, 2)]
+
+class TestObstacleMap(unittest.TestCase):
+    @parameterized.expand([
+        ("dense", DenseObstacleMap),
+        ("sparse", SparseObstacleMap),
+    ])
+    def test_blocked_cells(self, name, map_class):
+        obstacles = map_class(5, 5)
+        for x, y in CELLS:
+            obstacles.add(x, y)
+        self.assertEqual(len(obstacles), 4)  # Blocking a cell twice counts once
+        self.assertEqual(list(obstacles), [(0, 0), (3, 1), (4, 2), (2, 4)])
+        for x in range(5):
+            for y in range(5):
+                with self.subTest(x=x, y=y):
+                    self.assertEqual(obstacles.blocked(x, y), (x, y) in CELLS)
+
+    @parameterized.expand([
+        ("dense", DenseObstacleMap),
+        ("sparse", SparseObstacleMap),
+    ])
+    def test_blocked_mask(self, name, map_class):
+        obstacles = map_class(5, 5)
+        for x, y in CELLS:
+            obstacles.add(x, y)
+        xs = np.array([0, 1, 4, 2], dtype=np.int64)
+        ys = np.array([0, 0, 2, 4], dtype=np.int64)
+        self.assertEqual(obstacles.blocked_mask(xs, ys).tolist(), [True, False, True, True])
+
+    @parameterized.expand([
+        ("small_table", 5, 5, DenseObstacleMap),
+        ("at_dense_limit", 1, DENSE_CELL_LIMIT, DenseObstacleMap),
+        ("huge_table", 10**18, 10**18, SparseObstacleMap),
+    ])
+    def test_make_obstacle_map(self, name, width, length, expected_class):
+        self.assertIsInstance(make_obstacle_map(width, length), expected_class)
+
+    def test_table_obstacles(self):
+        table = Table(5, 5)
+        self.assertIsNone(table.obstacles)
+        self.assertFalse(table.is_blocked(1, 1))
+        table.add_obstacle(1, 1)
+        self.assertTrue(table.is_blocked(1, 1))
+        self.assertFalse(table.is_blocked(1, 2))
+        self.assertEqual(list(Table(10**9, 10**9, [(10**9 - 1, 7)]).obstacles), [(10**9 - 1, 7)])
+
+    @parameterized.expand([
+        ("valid", "1,2", (1, 2, None)),
+        ("far_corner", "4,3", (4, 3, None)),
+        ("out_of_bounds", "5,0", (None, None, "Obstacle out of table bounds.")),
+        ("negative", "-1,0", (None, None, "Obstacle out of table bounds.")),
+        ("missing_y", "1", (None, None, "expected X,Y")),
+        ("extra_value", "1,2,NORTH", (None, None, "expected X,Y")),
+        ("invalid_x", "a,2", (None, None, "invalid coordinate 'a'")),
+        ("invalid_y", "1,b", (None, None, "invalid coordinate 'b'")),
+    ])
+    def test_parse_obstacle(self, name, argument, expected):
+        self.assertEqual(parse_obstacle(argument, Table(4, 5)), expected)
+
+if __name__ == "__main__":
+    unittest.main()
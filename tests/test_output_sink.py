@@ -0,0 +1,75 @@
+"""
+Filename: test_output_sink.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the output sinks. Validates buffering and flushing,
+    JSON lines formatting, in-memory collection and the background writer.
+"""
+import json
+import unittest
+from io import StringIO
+from toyrobot.output_sink import (
+    StdoutSink, JsonLinesSink, ListSink, BackgroundWriterSink, KIND_REPORT, KIND_ERROR
+)
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.robot import Robot
+from toyrobot.position import Position
+
+class TestOutputSink(unittest.TestCase):
+    def test_unbuffered_stdout_sink(self):
+        stream = StringIO()
+        sink = StdoutSink(stream)
+        sink.write("0,1,NORTH")
+        self.assertEqual(stream.getvalue(), "0,1,NORTH\n")
+
+    def test_buffered_stdout_sink(self):
+        stream = StringIO()
+        sink = StdoutSink(stream, flush_every=3)
+        sink.write("1")
+        sink.write("2")
+        self.assertEqual(stream.getvalue(), "")
+        sink.write("3")
+        self.assertEqual(stream.getvalue(), "1\n2\n3\n")
+        sink.write("4")
+        sink.close()
+        self.assertEqual(stream.getvalue(), "1\n2\n3\n4\n")
+
+    def test_json_lines_sink(self):
+        stream = StringIO()
+        sink = JsonLinesSink(stream)
+        sink.write("0,1,NORTH", KIND_REPORT)
+        sink.write("Error: Unknown command 'JUMP'", KIND_ERROR)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(records, [
+            {"type": "report", "message": "0,1,NORTH"},
+            {"type": "error", "message": "Error: Unknown command 'JUMP'"},
+        ])
+
+    def test_list_sink(self):
+        sink = ListSink()
+        sink.write("0,1,NORTH")
+        sink.write("Error: Unknown command 'JUMP'", KIND_ERROR)
+        self.assertEqual(sink.records, [(KIND_REPORT, "0,1,NORTH"), (KIND_ERROR, "Error: Unknown command 'JUMP'")])
+        self.assertEqual(sink.messages, ["0,1,NORTH", "Error: Unknown command 'JUMP'"])
+
+    def test_background_writer_preserves_order(self):
+        inner = ListSink()
+        sink = BackgroundWriterSink(inner, batch_size=7)
+        for i in range(100):
+            sink.write(str(i))
+        sink.flush()
+        self.assertEqual(inner.messages, [str(i) for i in range(100)])
+        sink.close()
+
+    def test_reporter_writes_to_sink(self):
+        sink = ListSink()
+        robot = Robot({"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180})
+        robot.position = Position(1, 2)
+        robot.facing_angle = 90
+        RobotReporter(sink).report(robot)
+        self.assertEqual(sink.records, [(KIND_REPORT, "1,2,NORTH")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Filename: test_path_planner.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the PathPlanner and the PATH command. Validates that
+    planned paths take the robot to the target when run, that they are as
+    short as a forward search through the simulator finds, that distance
+    tables are cached and evicted, and that invalid targets are reported.
+"""
+import random
+import unittest
+from parameterized import parameterized
+from toyrobot.command_dispatcher import STATUS_OK, STATUS_ERROR, STATUS_IGNORED
+from toyrobot.output_sink import ListSink
+from toyrobot.path_planner import PathPlanner, MAX_PATH_STATES
+from toyrobot.session import Session
+from toyrobot.table import Table
+
+DIRECTIONS = {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+NAMES = ["EAST", "NORTH", "WEST", "SOUTH"]
+
+def make_session(width, length, obstacles):
+    return Session({"table_size": {"width": width, "length": length}, "directions": DIRECTIONS,
+                    "obstacles": [list(cell) for cell in obstacles]}, ListSink())
+
+def run_from(session, state, commands):
+    """Places the robot in a state, runs commands and returns the state it ends in."""
+    sink = session.output_sink
+    session.run([f"PLACE {state[0]},{state[1]},{state[2]}", *commands, "REPORT"])
+    x, y, facing = sink.messages[-1].split(",")
+    sink.clear()
+    return int(x), int(y), facing
+
+def forward_distance(session, start, target):
+    """Counts the fewest commands from start to target by running every command in the simulator."""
+    seen = {start}
+    frontier = [start]
+    distance = 0
+    while frontier:
+        if target in seen:
+            return distance
+        distance += 1
+        frontier = [state for state in (run_from(session, current, [command]) for current in frontier
+                                        for command in ("MOVE", "LEFT", "RIGHT"))
+                    if state not in seen and not seen.add(state)]
+    return None
+
+class TestPathPlanner(unittest.TestCase):
+    @parameterized.expand([(seed,) for seed in range(6)])
+    def test_paths_are_shortest(self, seed):
+        rng = random.Random(seed)
+        width, length = rng.randint(1, 6), rng.randint(1, 6)
+        cells = [(x, y) for x in range(length) for y in range(width)]
+        obstacles = rng.sample(cells, len(cells) // 4)
+        free = [cell for cell in cells if cell not in obstacles]
+        session = make_session(width, length, obstacles)
+        planner = PathPlanner(session.table, DIRECTIONS)
+        for _ in range(15):
+            start = (*rng.choice(free), rng.choice(NAMES))
+            target = (*rng.choice(free), rng.choice(NAMES))
+            with self.subTest(start=start, target=target):
+                path = planner.path(start, target)
+                distance = forward_distance(session, start, target)
+                if distance is None:
+                    self.assertIsNone(path)
+                    continue
+                self.assertEqual(len(path), distance)
+                self.assertEqual(run_from(session, start, path), target)
+
+    def test_clamping_and_obstacles(self):
+        planner = PathPlanner(Table(3, 3, [(1, 0), (1, 1)]), DIRECTIONS)
+        self.assertEqual(planner.path((0, 0, "EAST"), (2, 0, "SOUTH")),
+                         ["LEFT", "MOVE", "MOVE", "RIGHT", "MOVE", "MOVE", "RIGHT", "MOVE", "MOVE"])
+        self.assertEqual(planner.path((0, 0, "EAST"), (0, 0, "EAST")), [])
+        self.assertEqual(planner.path((0, 0, "EAST"), (0, 0, "WEST")), ["LEFT", "LEFT"])
+        self.assertIsNone(PathPlanner(Table(1, 3, [(1, 0)]), DIRECTIONS).path((0, 0, "EAST"), (2, 0, "EAST")))
+
+    def test_distance_tables_are_cached(self):
+        table = Table(4, 4)
+        planner = PathPlanner(table, DIRECTIONS, cache_states=2 * 4 * 16)
+        for target in [(3, 3, "NORTH"), (3, 3, "NORTH"), (0, 3, "EAST"), (3, 3, "NORTH"), (1, 1, "WEST"),
+                       (0, 3, "EAST")]:
+            planner.path((0, 0, "NORTH"), target)
+        # The third target evicted the least recently used one, (0, 3, EAST)
+        self.assertEqual((planner.hits, planner.misses), (2, 4))
+        self.assertEqual(len(planner._cache), 2)
+
+        # Adding an obstacle changes the key, so the old table is not used
+        table.add_obstacle(0, 1)
+        self.assertEqual(planner.path((0, 0, "NORTH"), (0, 2, "NORTH")),
+                         ["RIGHT", "MOVE", "LEFT", "MOVE", "MOVE", "LEFT", "MOVE", "RIGHT"])
+
+    @parameterized.expand([
+        ("off_table", (5, 0, "NORTH")),
+        ("on_obstacle", (2, 2, "NORTH")),
+        ("unknown_direction", (0, 0, "UP")),
+    ])
+    def test_invalid_states(self, name, state):
+        planner = PathPlanner(Table(5, 5, [(2, 2)]), DIRECTIONS)
+        with self.assertRaises(ValueError):
+            planner.path(state, (0, 0, "NORTH"))
+        with self.assertRaises(ValueError):
+            planner.path((0, 0, "NORTH"), state)
+
+    def test_rejects_large_tables(self):
+        with self.assertRaises(ValueError):
+            PathPlanner(Table(MAX_PATH_STATES // 4 + 1, 1), DIRECTIONS)
+
+    @parameterized.expand([
+        ("path", "PATH 2,1,EAST", STATUS_OK, ["Path: MOVE RIGHT MOVE MOVE"]),
+        ("already_there", "path 0,0,north", STATUS_OK, ["Path:"]),
+        ("off_table", "PATH 5,5,EAST", STATUS_ERROR,
+         ["Error: Invalid PATH command - Invalid PATH command: 5,5,EAST. Error: Placement out of table bounds."]),
+        ("unreachable", "PATH 4,4,EAST", STATUS_ERROR,
+         ["Error: Invalid PATH command - Invalid PATH command: 4,4,EAST. Error: Target cannot be reached."]),
+        ("bad_direction", "PATH 1,1,UP", STATUS_ERROR,
+         ["Error: Invalid PATH command - Invalid PATH command: 1,1,UP. Error: 'UP'"]),
+    ])
+    def test_path_command(self, name, command, expected_status, expected_output):
+        session = make_session(5, 5, [(3, 4), (4, 3)])
+        self.assertEqual(session.dispatcher.dispatch(command, session.robot, session.table), STATUS_IGNORED)
+        session.run(["PLACE 0,0,NORTH"])
+        session.output_sink.clear()
+        self.assertEqual(session.dispatcher.dispatch(command, session.robot, session.table), expected_status)
+        self.assertEqual(session.output_sink.messages, expected_output)
+        # Planning a path does not move the robot
+        self.assertEqual((session.robot.position.x, session.robot.position.y, session.robot.facing_angle), (0, 0, 90))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,6 +40,19 @@ class TestPosition(unittest.TestCase):
         self.assertAlmostEqual(new_pos.x, expected_x)
         self.assertAlmostEqual(new_pos.y, expected_y)
 
+    @parameterized.expand([
+        # name, start_x, start_y, distance, angle, expected_x, expected_y
+        ("north_beyond_float_precision", 2**53 + 1, 2**53 + 1, 1, 90, 2**53 + 1, 2**53 + 2),
+        ("west_from_10_18", 10**18, 10**18, 1, 180, 10**18 - 1, 10**18),
+        ("float_angle", 10**18, 0, 1, 0.0, 10**18 + 1, 0),
+        ("long_distance", 0, 10**18, 10**18, 270, 0, 0),
+        ("diagonal", 10**18, 10**18, math.sqrt(2), 45, 10**18 + 1, 10**18 + 1),
+        ("half_rounds_to_even", 2**53 + 1, 0, 0.5, 0, 2**53 + 2, 0),
+    ])
+    def test_move_in_direction_is_exact(self, name, start_x, start_y, distance, angle, expected_x, expected_y):
+        new_pos = Position(start_x, start_y).move_in_direction(distance, angle)
+        self.assertEqual((new_pos.x, new_pos.y), (expected_x, expected_y))
+
     @parameterized.expand([
         # name, pos_x, pos_y, min_x, max_x, min_y, max_y, expected_x, expected_y
         ("within_bounds", 2, 3, 0, 4, 0, 4, 2, 3), 
@@ -70,6 +83,15 @@ class TestPosition(unittest.TestCase):
         self.assertNotEqual(pos1.x, pos3.x)
         self.assertNotEqual(pos1.y, pos3.y)
 
+    def test_move_to(self):
+        pos = Position(3, 4)
+        pos.move_to(1, 2)
+        self.assertEqual((pos.x, pos.y), (1, 2))
+
+    def test_compact_representation(self):
+        # Positions use __slots__, so there is no per-instance __dict__
+        self.assertFalse(hasattr(Position(3, 4), "__dict__"))
+
     def test_rounding(self):
         # Test that positions with floating point values are rounded correctly
         pos = Position(1.4, 2.7)
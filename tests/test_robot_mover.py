@@ -34,5 +34,13 @@ class TestRobotMover(unittest.TestCase):
         self.assertEqual(self.robot.position.x, expected_position.x)
         self.assertEqual(self.robot.position.y, expected_position.y)
 
+    def test_move_updates_position_in_place(self):
+        position = Position(0, 0)
+        self.robot.position = position
+        self.robot.facing_angle = 90
+        self.mover.move_one_space(self.robot, self.table)
+        self.assertIs(self.robot.position, position)
+        self.assertEqual((position.x, position.y), (0, 1))
+
 if __name__ == "__main__":
     unittest.main()
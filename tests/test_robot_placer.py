@@ -25,6 +25,7 @@ class TestRobotPlacer(unittest.TestCase):
         ("valid_place_1", "1,2,NORTH", 1, 2, 90),
         ("valid_place_2", "0,0,EAST", 0, 0, 0),
         ("valid_place_3", "4,4,SOUTH", 4, 4, 270),
+        ("lowercase_direction", "2,3,west", 2, 3, 180),
     ])
     def test_valid_place(self, name, place_command, expected_x, expected_y, expected_angle):
         self.placer.place(place_command, self.robot, self.table)
@@ -43,5 +44,17 @@ class TestRobotPlacer(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.placer.place(place_command, self.robot, self.table)
 
+    @parameterized.expand([
+        ("valid_place", "1,2,NORTH", None),
+        ("out_of_bounds", "6,6,NORTH",
+         "Invalid PLACE command: 6,6,NORTH. Error: Placement out of table bounds."),
+        ("invalid_direction", "1,1,NORTHEAST",
+         "Invalid PLACE command: 1,1,NORTHEAST. Error: 'NORTHEAST'"),
+        ("missing_arguments", "1,2",
+         "Invalid PLACE command: 1,2. Error: list index out of range"),
+    ])
+    def test_try_place(self, name, place_command, expected_error):
+        self.assertEqual(self.placer.try_place(place_command, self.robot, self.table), expected_error)
+
 if __name__ == "__main__":
     unittest.main()
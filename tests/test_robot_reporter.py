@@ -36,5 +36,15 @@ class TestRobotReporter(unittest.TestCase):
         # Assert the captured output
         self.assertIn("1,2,NORTH", captured_output.getvalue().strip())
 
+    def test_report_does_not_change_facing_angle(self):
+        self.robot.position = Position(1, 2)
+        self.robot.facing_angle = 450  # NORTH after a full turn
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        self.reporter.report(self.robot)
+        sys.stdout = sys.__stdout__
+        self.assertEqual(captured_output.getvalue().strip(), "1,2,NORTH")
+        self.assertEqual(self.robot.facing_angle, 450)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+"""
+Filename: test_run.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the command line entry point. Validates that the fast
+    path for runs without options produces the same arguments as argparse.
+"""
+import sys
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from parameterized import parameterized
+import run
+
+class TestParseArgs(unittest.TestCase):
+    @parameterized.expand([
+        ("file", ["commands.txt"]),
+        ("stdin", ["-"]),
+        ("interactive", []),
+    ])
+    def test_fast_path_matches_argparse(self, name, argv):
+        self.assertEqual(vars(run.parse_args(argv)), vars(run.build_parser().parse_args(argv)))
+
+    def test_fast_path_skips_argparse(self):
+        argparse = sys.modules.pop("argparse", None)
+        try:
+            run.parse_args(["commands.txt"])
+            self.assertNotIn("argparse", sys.modules)
+        finally:
+            if argparse is not None:
+                sys.modules["argparse"] = argparse
+
+    def test_options_use_argparse(self):
+        args = run.parse_args(["--stats-file", "stats.json", "commands.txt"])
+        self.assertEqual((args.file, args.stats, args.stats_file), ("commands.txt", True, "stats.json"))
+
+    @parameterized.expand([
+        ("stats", ["--stats", "--fast-forward", "commands.txt"]),
+        ("stats_file", ["--stats-file", "stats.json", "--fast-forward", "commands.txt"]),
+    ])
+    def test_stats_rejects_fast_forward(self, name, argv):
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()):
+            run.parse_args(argv)
+
+    @parameterized.expand([
+        ("no_file", ["--checkpoint", "state.ckpt"]),
+        ("stdin", ["--checkpoint", "state.ckpt", "-"]),
+        ("stdin_resume", ["--checkpoint", "state.ckpt", "--resume", "-"]),
+    ])
+    def test_checkpoint_rejects_stdin(self, name, argv):
+        self.assertEqual(run.parse_args(["--checkpoint", "state.ckpt", "commands.txt"]).checkpoint, "state.ckpt")
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()):
+            run.parse_args(argv)
+
+    @parameterized.expand([
+        ("port_not_a_number", ["--serve", "localhost:notaport"]),
+        ("port_out_of_range", ["--serve", "localhost:99999"]),
+        ("negative_idle_timeout", ["--serve", "8000", "--idle-timeout", "-1"]),
+        ("zero_idle_timeout", ["--unix-socket", "robot.sock", "--idle-timeout", "0"]),
+    ])
+    def test_server_rejects_invalid_options(self, name, argv):
+        self.assertEqual(run.parse_args(["--serve", "localhost:8000", "--idle-timeout", "5"]).serve, "localhost:8000")
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()):
+            run.parse_args(argv)
+
+    def test_world_rejects_incompatible_options(self):
+        self.assertTrue(run.parse_args(["--world", "commands.txt"]).world)
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()):
+            run.parse_args(["--world", "--fast-forward", "commands.txt"])
+
+    @parameterized.expand([
+        ("no_file", ["--parallel"]),
+        ("stdin", ["--parallel", "-"]),
+        ("with_world", ["--parallel", "--world", "commands.txt"]),
+        ("with_checkpoint", ["--parallel", "--checkpoint", "state.ckpt", "commands.txt"]),
+    ])
+    def test_parallel_rejects_invalid_options(self, name, argv):
+        self.assertTrue(run.parse_args(["--parallel", "--jobs", "4", "commands.txt"]).parallel)
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()):
+            run.parse_args(argv)
+
+    @parameterized.expand([
+        ("bad_extension", ["--analytics", "heatmap.txt", "commands.txt"]),
+        ("with_world", ["--analytics", "heatmap.npy", "--world", "commands.txt"]),
+        ("with_parallel", ["--analytics", "heatmap.npy", "--parallel", "commands.txt"]),
+        ("with_batch", ["--analytics", "heatmap.csv", "--batch", "*.txt"]),
+    ])
+    def test_analytics_rejects_invalid_options(self, name, argv):
+        self.assertEqual(run.parse_args(["--analytics", "heatmap.CSV", "--fast-forward", "commands.txt"]).analytics,
+                         "heatmap.CSV")
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()):
+            run.parse_args(argv)
+
+    @parameterized.expand([
+        ("no_file", ["--all-starts"]),
+        ("with_world", ["--all-starts", "--world", "script.txt"]),
+        ("with_fast_forward", ["--all-starts", "--fast-forward", "script.txt"]),
+        ("with_analytics", ["--all-starts", "--analytics", "heatmap.npy", "script.txt"]),
+    ])
+    def test_all_starts_rejects_invalid_options(self, name, argv):
+        self.assertTrue(run.parse_args(["--all-starts", "-"]).all_starts)
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()):
+            run.parse_args(argv)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Filename: test_segment_runner.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the segment runner. Validates that files are split only
+    at PLACE commands that place the robot, and that running the segments in
+    this process or on a process pool gives exactly the serial output,
+    including before the first PLACE, at EXIT and after OBSTACLE commands.
+"""
+import os
+import random
+import tempfile
+import unittest
+from parameterized import parameterized
+from toyrobot.config import compile_config
+from toyrobot.output_sink import ListSink, KIND_ERROR, KIND_IGNORED, KIND_REPORT
+from toyrobot.segment_runner import find_segment_starts, run_segmented, SpoolSink, replay_spool
+from toyrobot.session import Session
+
+CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+    "obstacles": [[2, 2]],
+}
+
+def random_commands(seed, count, extra=()):
+    """Returns a random command stream with valid and invalid PLACEs."""
+    rng = random.Random(seed)
+    choices = ["MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 1,2,NORTH", "PLACE 4,0,WEST", "PLACE 5,5,EAST",
+               "PLACE 2,2,NORTH", "PLACE 1,1,UP", "", "JUMP", *extra]
+    weights = [30, 5, 5, 5, 1, 1, 1, 1, 1, 1, 1] + [1] * len(extra)
+    return ["REPORT", "MOVE"] + rng.choices(choices, weights, k=count)
+
+class TestSegmentRunner(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".txt")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, commands):
+        with open(self.path, 'w') as f:
+            f.write("\n".join(commands) + "\n")
+
+    def serial_records(self, commands):
+        sink = ListSink()
+        session = Session(CONFIG, sink)
+        session.run(commands)
+        session.finish()
+        return sink.records
+
+    def test_segments_start_at_valid_places(self):
+        commands = ["MOVE", "PLACE 2,2,NORTH", "PLACE 5,0,NORTH", "PLACE 0,0,UP", "REPORT", "place 1,1,south",
+                    "MOVE", "PLACE 3,3,EAST", "MOVE"]
+        self.write(commands)
+        offsets = [sum(len(command) + 1 for command in commands[:index]) for index in range(len(commands))]
+        starts = find_segment_starts(self.path, compile_config(CONFIG), 20)
+        # Blocked, off-table and badly formed PLACEs do not reset the robot, so are never boundaries
+        self.assertEqual(starts, [0, offsets[5], offsets[7]])
+        self.assertEqual(find_segment_starts(self.path, compile_config(CONFIG), 1), [0])
+
+    @parameterized.expand([
+        ("in_process", 1, 7),
+        ("process_pool", 2, 5),
+    ])
+    def test_matches_serial_output(self, name, jobs, segments):
+        commands = random_commands(1, 3000)
+        self.write(commands)
+        sink = ListSink()
+        summary = run_segmented(self.path, CONFIG, sink, jobs=jobs, segments=segments)
+        self.assertEqual(sink.records, self.serial_records(commands))
+        self.assertEqual(summary.segments, segments)
+        self.assertEqual(summary.commands, len(commands))
+        self.assertIsNone(summary.serial_from)
+        self.assertEqual(sink.records[:2], [(KIND_IGNORED, "Command ignored: Robot not placed on the table.")] * 2)
+
+    def test_stops_at_exit(self):
+        commands = random_commands(2, 1000) + ["EXIT"] + random_commands(3, 1000)
+        self.write(commands)
+        sink = ListSink()
+        summary = run_segmented(self.path, CONFIG, sink, jobs=1, segments=8)
+        self.assertEqual(sink.records, self.serial_records(commands))
+        self.assertEqual(summary.commands, 1003)
+
+    def test_runs_serially_after_obstacle(self):
+        commands = random_commands(4, 3000, extra=["OBSTACLE 1,3", "OBSTACLE 4,1"])
+        self.write(commands)
+        sink = ListSink()
+        summary = run_segmented(self.path, CONFIG, sink, jobs=1, segments=8)
+        self.assertEqual(sink.records, self.serial_records(commands))
+        self.assertEqual(summary.commands, len(commands))
+        self.assertIsNotNone(summary.serial_from)
+
+    def test_runs_serially_from_blocks(self):
+        commands = random_commands(5, 3000, extra=["DEFINE HOP", "MOVE", "END", "REPEAT 3", "CALL HOP", "END"])
+        self.write(commands)
+        sink = ListSink()
+        summary = run_segmented(self.path, CONFIG, sink, jobs=1, segments=8)
+        self.assertEqual(sink.records, self.serial_records(commands))
+        self.assertEqual(summary.commands, len(commands))
+        self.assertIsNotNone(summary.serial_from)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            run_segmented("missing_file.txt", CONFIG, ListSink(), jobs=1)
+
+    def test_spool_round_trip(self):
+        records = [(KIND_REPORT, f"{i},0,NORTH") for i in range(10)] + [(KIND_ERROR, "Error: x\ry")]
+        sink = SpoolSink(self.path, batch_size=3)
+        for kind, message in records:
+            sink.write(message, kind)
+        sink.close()
+        output = ListSink()
+        replay_spool(self.path, output)
+        self.assertEqual(output.records, records)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Filename: test_server.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the network server. Validates that each connection gets
+    its own robot, that EXIT and idle timeouts close only their own session,
+    that commands split across reads are reassembled, and that blocks are
+    limited per connection.
+"""
+import asyncio
+import os
+import tempfile
+import unittest
+from parameterized import parameterized
+from toyrobot.server import RobotServer, parse_address, IDLE_MESSAGE
+
+CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+}
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = RobotServer(CONFIG, idle_timeout=5)
+        self.listener = await self.server.start("127.0.0.1", 0)
+        self.address = self.listener.sockets[0].getsockname()[:2]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def converse(self, *chunks):
+        """Sends each chunk of input, closes the sending side and returns every output line."""
+        reader, writer = await asyncio.open_connection(*self.address)
+        for chunk in chunks:
+            writer.write(chunk.encode())
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        writer.write_eof()
+        output = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+        return output.decode().splitlines()
+
+    async def test_sessions_are_independent(self):
+        first, second = await asyncio.gather(
+            self.converse("PLACE 0,0,NORTH\nMOVE\nREPORT\n"),
+            self.converse("REPORT\nPLACE 4,4,WEST\nREPORT\n"))
+        self.assertEqual(first, ["0,1,NORTH"])
+        self.assertEqual(second, ["Command ignored: Robot not placed on the table.", "4,4,WEST"])
+        self.assertEqual(self.server.total_sessions, 2)
+        self.assertEqual(self.server.commands_processed, 6)
+
+    async def test_exit_closes_the_session(self):
+        output = await self.converse("PLACE 1,1,EAST\nEXIT\nREPORT\n")
+        self.assertEqual(output, ["Goodbye!"])
+
+    async def test_commands_split_across_reads(self):
+        output = await self.converse("PLACE 2,", "2,SOUTH\nREP", "ORT\nJUMP")
+        self.assertEqual(output, ["2,2,SOUTH", "Error: Unknown command 'JUMP'"])
+
+    async def test_blocks_are_limited(self):
+        output = await self.converse("PLACE 0,0,NORTH\nREPEAT 1000000000000\nREPORT\nEND\nREPEAT 2\nMOVE\n"
+                                     "END\nREPORT\nREPEAT 1\n")
+        self.assertEqual(output, [
+            "Error: Invalid REPEAT command - Invalid REPEAT command: 1000000000000. Error: runs 1000000000000 "
+            "commands, more than the limit of 1000000",
+            "0,2,NORTH",
+            "Error: Invalid REPEAT command - unterminated REPEAT block at end of input.",
+        ])
+
+    async def test_idle_session_is_evicted(self):
+        self.server.idle_timeout = 0.05
+        reader, writer = await asyncio.open_connection(*self.address)
+        output = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        self.assertEqual(output.decode(), IDLE_MESSAGE + "\n")
+        self.assertEqual(self.server.evicted_sessions, 1)
+
+    async def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "robot.sock")
+            listener = await self.server.start(unix_path=path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"PLACE 3,1,NORTH\nREPORT\n")
+            writer.write_eof()
+            self.assertEqual(await reader.read(), b"3,1,NORTH\n")
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+
+class TestParseAddress(unittest.TestCase):
+    @parameterized.expand([
+        ("port_only", "8000", (None, 8000)),
+        ("host_and_port", "127.0.0.1:8000", ("127.0.0.1", 8000)),
+        ("highest_port", "localhost:65535", ("localhost", 65535)),
+    ])
+    def test_parse_address(self, name, address, expected):
+        self.assertEqual(parse_address(address), expected)
+
+    @parameterized.expand([
+        ("not_a_number", "localhost:notaport"),
+        ("out_of_range", "localhost:99999"),
+        ("negative", "-1"),
+        ("empty", "localhost:"),
+    ])
+    def test_parse_address_rejects_invalid_ports(self, name, address):
+        with self.assertRaises(ValueError):
+            parse_address(address)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Filename: test_simulator.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the Simulator library API. Validates that results are
+    returned as data and sorted by kind, that every run starts fresh however
+    the last one ended, and that run_iter yields the same messages in order.
+"""
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+from parameterized import parameterized
+from toyrobot.command_dispatcher import STATUS_OK, STATUS_EXIT
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+from toyrobot.simulator import Simulator, SimulationEvent
+
+CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+    "obstacles": [[2, 2]],
+}
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        self.simulator = Simulator(CONFIG)
+
+    def test_run_returns_results(self):
+        with redirect_stdout(io.StringIO()) as stdout:
+            result = self.simulator.run(["MOVE", "PLACE 0,0,NORTH", "MOVE", "REPORT", "JUMP", "RIGHT", "REPORT",
+                                         "EXIT", "REPORT"])
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(result.reports, ["0,1,NORTH", "0,1,EAST"])
+        self.assertEqual(result.errors, ["Error: Unknown command 'JUMP'"])
+        self.assertEqual(result.ignored, ["Command ignored: Robot not placed on the table."])
+        self.assertEqual(result.info, ["Goodbye!"])
+        self.assertEqual(result.status, STATUS_EXIT)
+        self.assertEqual(result.commands, 8)
+        self.assertEqual(result.state, (0, 1, "EAST"))
+
+    def test_run_accepts_a_string(self):
+        result = self.simulator.run("PLACE 4,4,SOUTH\nMOVE\nREPORT\n")
+        self.assertEqual((result.reports, result.status, result.state), (["4,3,SOUTH"], STATUS_OK, (4, 3, "SOUTH")))
+
+    @parameterized.expand([
+        ("placed_robot", ["PLACE 1,1,EAST", "MOVE"]),
+        ("obstacles", ["OBSTACLE 0,1", "OBSTACLE 1,0"]),
+        ("macros", ["DEFINE HOP", "MOVE", "END"]),
+        ("open_block", ["REPEAT 2", "MOVE"]),
+        ("exit", ["PLACE 3,3,NORTH", "EXIT"]),
+    ])
+    def test_runs_start_fresh(self, name, first_run):
+        self.simulator.run(first_run)
+        result = self.simulator.run(["REPORT", "CALL HOP", "PLACE 0,0,NORTH", "MOVE", "RIGHT", "MOVE", "MOVE",
+                                     "REPORT", "PLACE 2,2,NORTH"])
+        self.assertEqual(result.reports, ["2,1,EAST"])
+        self.assertEqual(result.ignored, ["Command ignored: Robot not placed on the table."])
+        self.assertEqual(result.errors, [
+            "Error: Invalid CALL command - Invalid CALL command: HOP. Error: no macro named HOP",
+            "Error: Invalid PLACE command - Invalid PLACE command: 2,2,NORTH. Error: Placement blocked by an obstacle."])
+        self.assertIsNone(self.simulator.run([]).state)
+
+    def test_matches_session(self):
+        rng = random.Random(5)
+        commands = rng.choices(["MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 1,2,NORTH", "PLACE 5,5,EAST", "JUMP",
+                                "OBSTACLE 3,1", ""], [30, 5, 5, 5, 1, 1, 1, 1, 1], k=2000)
+        expected = ListSink()
+        Session(CONFIG, expected).run(commands)
+        for _ in range(2):
+            result = self.simulator.run(commands)
+            self.assertEqual(result.reports, [m for kind, m in expected.records if kind == "report"])
+            self.assertEqual(result.errors, [m for kind, m in expected.records if kind == "error"])
+            self.assertEqual(result.ignored, [m for kind, m in expected.records if kind == "ignored"])
+            events = list(self.simulator.run_iter(commands))
+            self.assertEqual([(event.kind, event.message) for event in events], expected.records)
+
+    def test_run_iter_numbers_commands(self):
+        events = self.simulator.run_iter(["MOVE", "", "PLACE 0,0,NORTH", "REPEAT 2", "REPORT", "END", "EXIT",
+                                          "REPORT"])
+        self.assertEqual(list(events), [
+            SimulationEvent(1, "ignored", "Command ignored: Robot not placed on the table."),
+            SimulationEvent(6, "report", "0,0,NORTH"),
+            SimulationEvent(6, "report", "0,0,NORTH"),
+            SimulationEvent(7, "info", "Goodbye!"),
+        ])
+
+    def test_run_iter_is_lazy(self):
+        def commands():
+            yield "PLACE 0,0,NORTH"
+            while True:
+                yield "REPORT"
+        events = self.simulator.run_iter(commands())
+        self.assertEqual([next(events).line for _ in range(3)], [2, 3, 4])
+        events.close()
+        self.assertEqual(self.simulator.run(["REPORT"]).reports, [])
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            Simulator({"table_size": {"width": 0, "length": 5}, "directions": CONFIG["directions"]})
+
+if __name__ == "__main__":
+    unittest.main()
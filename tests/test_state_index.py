@@ -0,0 +1,127 @@
+"""
+Filename: test_state_index.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the prefix-state index. Validates "state after command k"
+    and range transitions against replaying the log through the dispatcher,
+    including after edits, for several block sizes.
+"""
+import random
+import unittest
+from parameterized import parameterized
+from toyrobot.command_dispatcher import STATUS_EXIT
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+from toyrobot.state_index import StateIndex, Transition, IndexedState
+from toyrobot.table import Table
+
+CONFIG = {
+    "table_size": {"width": 4, "length": 6},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+}
+COMMAND_POOL = ["MOVE"] * 6 + ["LEFT", "RIGHT", "REPORT", "JUMP", "PLACE 1,2,NORTH", "PLACE 5,3,west",
+                                "PLACE 9,9,EAST", "PLACE 0,0,SOUTH", "PLACE 1,NORTH", "", "EXIT"]
+
+def random_commands(rng, count):
+    """Returns a seeded random command log with occasional EXITs."""
+    weights = [0.02 if command == "EXIT" else 1 for command in COMMAND_POOL]
+    return rng.choices(COMMAND_POOL, weights=weights, k=count)
+
+def replay_states(commands):
+    """Returns the state after each prefix of the log, by running it through a session."""
+    session = Session(CONFIG, ListSink())
+    robot = session.robot
+    states = [None]
+    exited = False
+    for command in commands:
+        if not exited:
+            exited = session.dispatcher.dispatch(command, robot, session.table) == STATUS_EXIT
+        states.append(None if robot.position is None else
+                      (robot.position.x, robot.position.y, robot.directions.name_for(robot.facing_angle)))
+    return states
+
+class TestStateIndex(unittest.TestCase):
+    def make_index(self, commands, block_size):
+        return StateIndex(commands, Table(4, 6), CONFIG["directions"], block_size=block_size)
+
+    def assert_states_match(self, index, commands):
+        expected = replay_states(commands)
+        actual = [index.state_after(k) for k in range(len(commands) + 1)]
+        self.assertEqual([None if state is None else tuple(state) for state in actual], expected)
+
+    @parameterized.expand([(1,), (3,), (8,), (64,)])
+    def test_state_after_matches_replay(self, block_size):
+        rng = random.Random(block_size)
+        for _ in range(20):
+            commands = random_commands(rng, rng.randint(0, 150))
+            self.assert_states_match(self.make_index(commands, block_size), commands)
+
+    @parameterized.expand([(1,), (4,), (64,)])
+    def test_update_matches_replay(self, block_size):
+        rng = random.Random(block_size)
+        commands = random_commands(rng, 300)
+        index = self.make_index(commands, block_size)
+        for _ in range(30):
+            k = rng.randrange(len(commands))
+            commands[k] = rng.choice(COMMAND_POOL)
+            index.update(k, commands[k])
+        self.assert_states_match(index, commands)
+
+    def test_transition_composes(self):
+        rng = random.Random(7)
+        commands = random_commands(rng, 500)
+        index = self.make_index(commands, 16)
+        for _ in range(50):
+            i = rng.randint(0, len(commands))
+            j = rng.randint(i, len(commands))
+            before = index.transition(0, i).apply(None)
+            self.assertEqual(index.transition(i, j).apply(before), index.transition(0, j).apply(None))
+
+    @parameterized.expand([
+        ("placed_start", ["MOVE", "LEFT", "MOVE", "MOVE"], (5, 0, 0, False), (5, 2, 1, False)),
+        ("clamped_at_edge", ["MOVE", "MOVE", "LEFT", "LEFT", "MOVE"], (4, 0, 0, False), (4, 0, 2, False)),
+        ("unplaced_ignores_moves", ["MOVE", "PLACE 2,2,EAST", "MOVE"], None, (3, 2, 0, False)),
+        ("exit_freezes", ["MOVE", "EXIT", "MOVE"], (0, 0, 1, False), (0, 1, 1, True)),
+        ("unplaced_ignores_exit", ["EXIT", "PLACE 0,0,NORTH", "MOVE"], None, (0, 1, 1, False)),
+    ])
+    def test_transition_apply(self, name, commands, state, expected):
+        index = self.make_index(commands, 2)
+        self.assertEqual(index.transition(0, len(commands)).apply(state), expected)
+
+    def test_identity(self):
+        identity = Transition.identity(5, 3)
+        self.assertEqual(identity.apply((2, 1, 3, False)), (2, 1, 3, False))
+        self.assertIsNone(identity.apply(None))
+
+    def test_large_table(self):
+        index = StateIndex(["PLACE 999999999,0,EAST", "MOVE", "MOVE", "LEFT", "MOVE"], Table(10**9, 10**9),
+                           CONFIG["directions"])
+        self.assertEqual(index.state_after(5), IndexedState(999999999, 1, "NORTH"))
+
+    def test_rejects_obstacles(self):
+        with self.assertRaises(ValueError):
+            StateIndex(["PLACE 0,0,NORTH", "MOVE"], Table(4, 6, [(1, 1)]), CONFIG["directions"])
+        with self.assertRaises(ValueError):
+            self.make_index(["PLACE 0,0,NORTH", "OBSTACLE 1,1", "MOVE"], 2)
+        index = self.make_index(["PLACE 0,0,NORTH", "MOVE"], 2)
+        with self.assertRaises(ValueError):
+            index.update(1, "OBSTACLE 0,1")
+        self.assertEqual(index.state_after(2), IndexedState(0, 1, "NORTH"))
+
+    def test_rejects_blocks(self):
+        with self.assertRaises(ValueError):
+            self.make_index(["PLACE 0,0,NORTH", "REPEAT 3", "MOVE", "END"], 2)
+        index = self.make_index(["PLACE 0,0,NORTH", "MOVE"], 2)
+        with self.assertRaises(ValueError):
+            index.update(1, "CALL HOP")
+
+    @parameterized.expand([(-1,), (4,)])
+    def test_out_of_range(self, k):
+        index = self.make_index(["PLACE 0,0,NORTH", "MOVE", "REPORT"], 2)
+        with self.assertRaises(IndexError):
+            index.state_after(k)
+
+if __name__ == '__main__':
+    unittest.main()
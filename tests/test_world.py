@@ -0,0 +1,124 @@
+"""
+Filename: test_world.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    Test suite for the multi-robot World. Validates command routing by robot
+    name, that robots never share a cell on MOVE or PLACE, that the occupancy
+    map tracks every robot, and that a lone robot behaves like a Session.
+"""
+import random
+import unittest
+from parameterized import parameterized
+from toyrobot.command_dispatcher import STATUS_OK, STATUS_IGNORED, STATUS_ERROR, STATUS_EXIT
+from toyrobot.output_sink import ListSink
+from toyrobot.session import Session
+from toyrobot.world import World, OccupancyMap
+
+CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180},
+}
+
+class TestWorld(unittest.TestCase):
+    def setUp(self):
+        self.sink = ListSink()
+        self.world = World(CONFIG, self.sink)
+
+    def dispatch(self, command):
+        self.sink.clear()
+        status = self.world.dispatch(command)
+        return status, self.sink.messages
+
+    def test_routes_commands_by_name(self):
+        self.world.run(["PLACE R1 0,0,NORTH", "R2 PLACE 4,4,SOUTH", "R1 MOVE", "R2 RIGHT", "R2 MOVE"])
+        self.assertEqual(self.dispatch("R1 REPORT"), (STATUS_OK, ["R1: 0,1,NORTH"]))
+        self.assertEqual(self.dispatch("R2 report"), (STATUS_OK, ["R2: 3,4,WEST"]))
+
+    def test_move_into_robot_is_ignored(self):
+        self.world.run(["PLACE R1 0,0,NORTH", "PLACE R2 0,1,EAST", "R1 MOVE"])
+        self.assertEqual(self.dispatch("R1 REPORT"), (STATUS_OK, ["R1: 0,0,NORTH"]))
+        self.assertEqual(self.world.collisions, 1)
+        self.world.run(["R2 MOVE", "R1 MOVE"])
+        self.assertEqual(self.dispatch("R1 REPORT"), (STATUS_OK, ["R1: 0,1,NORTH"]))
+
+    def test_place_onto_robot_is_rejected(self):
+        self.dispatch("PLACE R1 2,2,NORTH")
+        self.assertEqual(self.dispatch("PLACE R2 2,2,EAST"), (STATUS_ERROR, [
+            "Error: Invalid PLACE command - Invalid PLACE command: 2,2,EAST. Error: Cell is occupied by robot R1."]))
+        self.assertNotIn("R2", self.world.robots)
+        # A robot can be placed again on its own cell
+        self.assertEqual(self.dispatch("PLACE R1 2,2,WEST"), (STATUS_OK, []))
+        self.assertEqual(self.dispatch("PLACE R1 3,3,SOUTH"), (STATUS_OK, []))
+        self.assertEqual(self.dispatch("PLACE R2 2,2,EAST"), (STATUS_OK, []))
+        self.assertEqual(dict(self.world.occupancy.cells), {3 * 5 + 3: "R1", 2 * 5 + 2: "R2"})
+
+    @parameterized.expand([
+        ("unplaced_robot", "R9 MOVE", STATUS_IGNORED, ["Command ignored: Robot not placed on the table."]),
+        ("missing_name", "MOVE", STATUS_ERROR, ["Error: Command 'MOVE' needs a robot name, e.g. R1 MOVE"]),
+        ("names_are_case_sensitive", "r1 MOVE", STATUS_IGNORED, ["Command ignored: Robot not placed on the table."]),
+        ("name_alone", "R1", STATUS_ERROR, ["Error: Unknown command 'R1'"]),
+        ("unknown_word", "JUMP", STATUS_ERROR, ["Error: Unknown command 'JUMP'"]),
+        ("unknown_robot_command", "R1 JUMP", STATUS_ERROR, ["Error: Unknown command 'JUMP'"]),
+        ("keyword_name", "PLACE MOVE 3,3,NORTH", STATUS_ERROR, [
+            "Error: Invalid PLACE command - Invalid PLACE command: 3,3,NORTH. "
+            "Error: 'MOVE' is a command and cannot be a robot name."]),
+        ("place_without_name", "PLACE 3,3,NORTH", STATUS_ERROR, [
+            "Error: Invalid PLACE command - Invalid PLACE command: 3,3,NORTH. Error: expected PLACE NAME X,Y,F"]),
+        ("place_off_table", "PLACE R2 5,0,NORTH", STATUS_ERROR, [
+            "Error: Invalid PLACE command - Invalid PLACE command: 5,0,NORTH. Error: Placement out of table bounds."]),
+        ("obstacle_on_robot", "OBSTACLE 1,1", STATUS_ERROR, [
+            "Error: Invalid OBSTACLE command - Invalid OBSTACLE command: 1,1. Error: Cell is occupied by robot R1."]),
+        ("repeat", "REPEAT 3", STATUS_ERROR, ["Error: Command 'REPEAT' is not supported with --world"]),
+        ("robot_call", "R1 CALL HOP", STATUS_ERROR, ["Error: Command 'CALL' is not supported with --world"]),
+        ("robot_path", "R1 PATH 3,3,EAST", STATUS_ERROR, ["Error: Command 'PATH' is not supported with --world"]),
+        ("heatmap", "HEATMAP", STATUS_OK, ["HEATMAP: analytics are not enabled (run with --analytics PATH)."]),
+        ("blank", "  ", STATUS_OK, []),
+        ("exit", "EXIT", STATUS_EXIT, ["Goodbye!"]),
+    ])
+    def test_commands(self, name, command, expected_status, expected_output):
+        self.dispatch("PLACE R1 1,1,NORTH")
+        self.assertEqual(self.dispatch(command), (expected_status, expected_output))
+
+    def test_world_commands_before_any_robot(self):
+        self.assertEqual(self.dispatch("OBSTACLE 0,1"), (STATUS_OK, []))
+        self.assertEqual(self.dispatch("PLACE R1 0,1,NORTH")[0], STATUS_ERROR)
+        self.dispatch("PLACE R1 0,0,NORTH")
+        self.dispatch("R1 MOVE")
+        self.assertEqual(self.dispatch("R1 REPORT"), (STATUS_OK, ["R1: 0,0,NORTH"]))
+
+    def test_single_robot_matches_session(self):
+        rng = random.Random(7)
+        commands = rng.choices(["MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 1,2,NORTH", "PLACE 4,0,WEST",
+                                "PLACE 5,5,EAST", "OBSTACLE 2,2", "OBSTACLE 3,4"], [20, 4, 4, 4, 1, 1, 1, 1, 1], k=500)
+        expected = ListSink()
+        Session(CONFIG, expected).run(commands)
+        self.world.run(("PLACE R1 " + command[6:]) if command.startswith("PLACE") else
+                       command if command.startswith("OBSTACLE") else f"R1 {command}" for command in commands)
+        messages = [message.replace("R1: ", "") for message in self.sink.messages]
+        self.assertEqual(messages, expected.messages)
+
+    def test_robots_never_share_a_cell(self):
+        rng = random.Random(3)
+        names = [f"R{i}" for i in range(12)]
+        commands = [f"PLACE {name} {i % 5},{i // 5},NORTH" for i, name in enumerate(names)]
+        commands += [f"{rng.choice(names)} {rng.choice(['MOVE', 'MOVE', 'LEFT', 'RIGHT'])}" for _ in range(3000)]
+        self.world.run(commands)
+        cells = {(robot.position.x, robot.position.y) for robot in self.world.robots.values()}
+        self.assertEqual(len(cells), len(names))
+        self.assertEqual({(index % 5, index // 5) for index in self.world.occupancy.cells}, cells)
+        self.assertGreater(self.world.collisions, 0)
+
+    def test_occupancy_map(self):
+        occupancy = OccupancyMap(10**18)
+        occupancy.enter(10**18 - 1, 3, "R1")
+        self.assertEqual(occupancy.occupant(10**18 - 1, 3), "R1")
+        occupancy.move(10**18 - 1, 3, 10**18 - 1, 4)
+        self.assertIsNone(occupancy.occupant(10**18 - 1, 3))
+        self.assertEqual(occupancy.occupant(10**18 - 1, 4), "R1")
+        occupancy.leave(10**18 - 1, 4)
+        self.assertEqual(len(occupancy), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,228 @@
+"""
+Filename: all_starts.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module runs one command script from every legal start state at
+    once: each free cell of the table with each configured direction, as if
+    the script were run after every possible PLACE X,Y,F:
+
+        result = AllStarts(load_config()).run(["MOVE", "RIGHT", "MOVE", "REPORT"])
+        result.finals    # Final (x, y, heading) of every start
+        result.reports   # (x, y, heading) of every start at each REPORT
+
+    A state is numbered (y * length + x) * 4 + heading, and MOVE, LEFT and
+    RIGHT are precomputed as tables from each state to the next, clamping at
+    the edges and stopping at obstacles exactly as a single robot does, so
+    each command moves every start with one NumPy lookup. The script is
+    tokenized and walked once, however many starts there are. Starts that
+    reach the same state behave the same from then on, so they are merged
+    from time to time and each command only moves the distinct states left;
+    a script that gathers the robot into a corner soon costs next to nothing
+    per command.
+
+    Only REPORT output differs between starts; every other message (errors
+    for invalid commands, STATS, EXIT) is the same for every start and is
+    returned once. OBSTACLE is not supported, as it would change the table
+    for some starts and not others, nor are DEFINE, REPEAT, END, CALL and
+    PATH.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from toyrobot.command_dispatcher import (
+    ERROR_FORMATS, STATS_DISABLED_MESSAGE, ANALYTICS_DISABLED_MESSAGE, STATUS_OK, STATUS_EXIT
+)
+from toyrobot.command_parser import (
+    tokenize, OPCODE_NAMES, OP_NOP, OP_PLACE, OP_MOVE, OP_LEFT, OP_RIGHT, OP_REPORT, OP_EXIT, OP_UNKNOWN,
+    OP_STATS, OP_HEATMAP
+)
+from toyrobot.config import compile_config
+from toyrobot.direction_model import HEADING_STEPS
+from toyrobot.output_sink import KIND_ERROR, KIND_INFO
+from toyrobot.robot_placer import parse_place
+from toyrobot.simulator import SimulationEvent
+from toyrobot.table import Table
+
+# Largest number of cells a table may have for all of its starts to be run at once
+MAX_ALL_STARTS_CELLS = 1 << 22
+
+# Commands between merges of starts in the same state, while merging keeps halving them
+MERGE_INTERVAL = 16
+
+# Reported for commands that cannot run from every start at once
+UNSUPPORTED_FORMAT = "Error: Command '{}' is not supported with --all-starts"
+
+# Result of a run. starts and finals are (n, 3) arrays of (x, y, heading) with heading
+# 0=East, 1=North, 2=West, 3=South, one row per start; reports is a (reports, n, 3) array
+# of the state each start reported at each REPORT; messages are the SimulationEvents
+# every start shares; status is STATUS_EXIT if EXIT stopped the run, otherwise STATUS_OK
+AllStartsResult = namedtuple("AllStartsResult", ["starts", "finals", "reports", "messages", "status", "commands"])
+
+
+class AllStarts:
+    def __init__(self, config):
+        """
+        Initialise the start states and transition tables for a configuration.
+
+        Args:
+            config: A SimulationConfig, or a dict with "table_size" and
+                "directions" in the format of config.json.
+
+        Raises:
+            ValueError: If the configuration is invalid, or the table has
+                more than MAX_ALL_STARTS_CELLS cells.
+        """
+        config = compile_config(config)
+        cells = config.width * config.length
+        if cells > MAX_ALL_STARTS_CELLS:
+            raise ValueError(f"All starts can only be run on tables of up to {MAX_ALL_STARTS_CELLS} cells, "
+                             f"got {cells}")
+        self.directions = config.directions
+        self.table = Table(config.width, config.length, config.obstacles)
+        self.length = length = config.length
+        self._names = [None] * 4  # Direction name by heading
+        for name in self.directions:
+            self._names[self.directions.heading_for(name)] = name
+
+        free = np.ones(cells, dtype=bool)
+        for x, y in config.obstacles:
+            free[y * length + x] = False
+
+        # The state after MOVE, LEFT and RIGHT from every state
+        states = np.arange(4 * cells, dtype=np.int32)
+        heading = states & 3
+        x = (states >> 2) % length
+        y = (states >> 2) // length
+        step_x = np.array([step[0] for step in HEADING_STEPS], dtype=np.int32)
+        step_y = np.array([step[1] for step in HEADING_STEPS], dtype=np.int32)
+        new_x = np.clip(x + step_x[heading], 0, length - 1)
+        new_y = np.clip(y + step_y[heading], 0, config.width - 1)
+        new_cell = new_y * length + new_x
+        moved = ((new_cell << 2) | heading).astype(np.int32)
+        self.transitions = {
+            OP_MOVE: np.where(free[new_cell], moved, states),  # Moves onto an obstacle are ignored
+            OP_LEFT: (states & ~3) | ((heading + 1) & 3),
+            OP_RIGHT: (states & ~3) | ((heading - 1) & 3),
+        }
+
+        # Every free cell with every configured direction, in row-major order of cells
+        configured = np.zeros(4, dtype=bool)
+        configured[[self.directions.heading_for(name) for name in self.directions]] = True
+        self.start_states = states[free[states >> 2] & configured[heading]]
+
+    def __len__(self):
+        """Returns the number of start states."""
+        return len(self.start_states)
+
+    def run(self, commands):
+        """
+        Runs a script from every start state, until it runs out or EXIT is reached.
+
+        Args:
+            commands: An iterable of command lines, or one string of lines.
+
+        Returns:
+            AllStartsResult: The start, final and reported states of every
+            start, and the messages they share.
+        """
+        if isinstance(commands, str):
+            commands = commands.splitlines()
+        transitions = self.transitions
+        # The distinct states of the starts, and the index into them of each start's state (None
+        # while every start has its own), so a start's state is states[owner[start]]
+        states = self.start_states
+        owner = None
+        reports = []
+        messages = []
+        status = STATUS_OK
+        line = 0
+        interval = since_merge = MERGE_INTERVAL
+
+        for command in commands:
+            line += 1
+            opcode, argument = tokenize(command)
+            transition = transitions.get(opcode)
+            if transition is not None:
+                states = transition[states]  # A new array, so REPORT can keep the old one as it is
+                since_merge -= 1
+                if not since_merge:
+                    count = len(states)
+                    states, owner = self.merge(states, owner)
+                    # Keep merging often while it pays, and back off while it does not
+                    interval = MERGE_INTERVAL if len(states) <= count // 2 else interval * 2
+                    since_merge = interval
+            elif opcode == OP_REPORT:
+                reports.append((states, owner))
+            elif opcode == OP_NOP:
+                continue
+            elif opcode == OP_PLACE:
+                x, y, facing_angle, error = parse_place(argument, self.directions, self.table)
+                if error is not None:
+                    message = ERROR_FORMATS[OP_PLACE].format(f"Invalid PLACE command: {argument}. Error: {error}")
+                    messages.append(SimulationEvent(line, KIND_ERROR, message))
+                else:
+                    # Every start is now in the same state
+                    state = ((y * self.length + x) << 2) | (int(facing_angle) % 360 // 90)
+                    states = np.array([state], dtype=np.int32)
+                    owner = np.zeros(len(self.start_states), dtype=np.int32)
+            elif opcode == OP_EXIT:
+                messages.append(SimulationEvent(line, KIND_INFO, "Goodbye!"))
+                status = STATUS_EXIT
+                break
+            elif opcode == OP_UNKNOWN:
+                messages.append(SimulationEvent(line, KIND_ERROR, ERROR_FORMATS[OP_UNKNOWN].format(argument)))
+            elif opcode == OP_STATS:
+                messages.append(SimulationEvent(line, KIND_INFO, STATS_DISABLED_MESSAGE))
+            elif opcode == OP_HEATMAP:
+                messages.append(SimulationEvent(line, KIND_INFO, ANALYTICS_DISABLED_MESSAGE))
+            else:
+                messages.append(SimulationEvent(line, KIND_ERROR, UNSUPPORTED_FORMAT.format(OPCODE_NAMES[opcode])))
+
+        reported = np.empty((len(reports), len(self.start_states), 3), dtype=np.int32)
+        for index, (report_states, report_owner) in enumerate(reports):
+            reported[index] = self.decode(report_states, report_owner)
+        return AllStartsResult(self.decode(self.start_states, None), self.decode(states, owner), reported, messages,
+                               status, line)
+
+    def merge(self, states, owner):
+        """
+        Merges starts in the same state.
+
+        Returns:
+            tuple: (states, owner) with each distinct state once, in order.
+        """
+        seen = np.zeros(len(self.transitions[OP_MOVE]), dtype=bool)
+        seen[states] = True
+        distinct = np.flatnonzero(seen).astype(np.int32)
+        if len(distinct) == len(states):
+            return states, owner
+        index = np.empty(len(seen), dtype=np.int32)
+        index[distinct] = np.arange(len(distinct), dtype=np.int32)
+        index = index[states]
+        return distinct, index if owner is None else index[owner]
+
+    def decode(self, states, owner):
+        """Returns each start's state as an (n, 3) array of (x, y, heading)."""
+        if owner is not None:
+            states = states[owner]
+        cells = states >> 2
+        return np.column_stack((cells % self.length, cells // self.length, states & 3))
+
+    def format_lines(self, result):
+        """
+        Yields one line per start: the start, the state it ends in and, if
+        the script reports, what it reported, e.g.
+        "0,0,NORTH -> 1,1,EAST (reports: 0,1,NORTH 1,1,EAST)".
+        """
+        names = self._names
+        starts = result.starts.tolist()
+        finals = result.finals.tolist()
+        reports = result.reports.transpose(1, 0, 2).tolist()  # Each start's reports together
+        for start, final, reported in zip(starts, finals, reports):
+            text = f"{start[0]},{start[1]},{names[start[2]]} -> {final[0]},{final[1]},{names[final[2]]}"
+            if reported:
+                text += " (reports: " + " ".join(f"{x},{y},{names[h]}" for x, y, h in reported) + ")"
+            yield text
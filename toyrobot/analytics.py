@@ -0,0 +1,219 @@
+"""
+Filename: analytics.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module records where a robot goes while its commands run, for
+    capacity analysis. For every cell of the table it counts:
+
+        visits          how many times the robot was placed on or moved onto it
+        edge_clamps     MOVEs swallowed because the robot stood at the table's
+                        edge, facing off it
+        obstacle_stops  MOVEs swallowed because an obstacle was in the way
+
+    The counts are one int64 NumPy array of shape (3, width, length), indexed
+    [count, y, x] and sized from the Table, so memory does not grow with the
+    number of commands. Analytics are opt-in: attach() wraps the robot's
+    placer and mover on that robot only, the way Instrumentation does, so
+    runs without them pay nothing. A MOVE adds a constant amount of work,
+    and a fast-forwarded run of n MOVEs adds one NumPy slice update.
+
+    export() writes the counts as a .npy file holding the whole array, or as
+    a CSV file with one x,y,visits,edge_clamps,obstacle_stops row for every
+    cell with a non-zero count.
+"""
+import numpy as np
+
+from toyrobot.direction_model import HEADING_STEPS
+
+# Largest number of cells a table may have for its analytics to be recorded
+MAX_ANALYTICS_CELLS = 1 << 22
+
+# Rows of the counts array
+VISITS = 0
+EDGE_CLAMPS = 1
+OBSTACLE_STOPS = 2
+
+# Export formats, by file extension
+EXPORT_FORMATS = (".npy", ".csv")
+
+CSV_HEADER = "x,y,visits,edge_clamps,obstacle_stops"
+
+# Edge names for each heading (0=East, 1=North, 2=West, 3=South)
+EDGE_NAMES = ("E", "N", "W", "S")
+
+
+def export_format(path):
+    """Returns the export format (".npy" or ".csv") for a path, or None if it has neither extension."""
+    for extension in EXPORT_FORMATS:
+        if str(path).lower().endswith(extension):
+            return extension
+    return None
+
+
+class Analytics:
+    def __init__(self, table, path=None):
+        """
+        Initialise empty counts for every cell of a table.
+
+        Args:
+            table (Table): The table the robot runs on. Its size is read once,
+                so the table must not be replaced while analytics are attached.
+            path (str): Optional file that export() writes by default, ending
+                in .npy or .csv.
+
+        Raises:
+            ValueError: If the table has more than MAX_ANALYTICS_CELLS cells,
+                or the path has neither extension.
+        """
+        cells = table.width * table.length
+        if cells > MAX_ANALYTICS_CELLS:
+            raise ValueError(f"Analytics can only be recorded on tables of up to {MAX_ANALYTICS_CELLS} cells, "
+                             f"got {cells}")
+        if path is not None and export_format(path) is None:
+            raise ValueError(f"Analytics file {path} must end in .npy or .csv")
+        self.table = table
+        self.path = path
+        self.width = table.width
+        self.length = table.length
+        self.counts = np.zeros((3, table.width, table.length), dtype=np.int64)
+        self.edges = [0, 0, 0, 0]  # Edge clamps by the heading the robot faced
+        # Single cells are updated through a flat view, which is much cheaper than indexing the array
+        self._cells = memoryview(self.counts).cast('B').cast('q')
+        self._cell_count = cells
+
+    @property
+    def visits(self):
+        """Visits per cell, indexed [y, x]."""
+        return self.counts[VISITS]
+
+    @property
+    def edge_clamps(self):
+        """MOVEs swallowed at the table's edge per cell, indexed [y, x]."""
+        return self.counts[EDGE_CLAMPS]
+
+    @property
+    def obstacle_stops(self):
+        """MOVEs swallowed by an obstacle per cell, indexed [y, x]."""
+        return self.counts[OBSTACLE_STOPS]
+
+    def attach(self, robot):
+        """
+        Wraps the robot's placer and mover so that every placement and move is counted.
+
+        Only this robot's components are wrapped, via instance attributes.
+        Moves made by RobotMover.move_one_space go through move, so both are
+        counted.
+        """
+        placer = robot.robot_placer
+        mover = robot.robot_mover
+        place = placer.try_place
+        move = mover.move
+        cells = self._cells
+        length = self.length
+        width = self.width
+        edge_clamps = EDGE_CLAMPS * self._cell_count
+        obstacle_stops = OBSTACLE_STOPS * self._cell_count
+        edges = self.edges
+        headings = {}  # Facing angle -> heading (0=East, 1=North, 2=West, 3=South)
+
+        def counted_place(argument, robot, table):
+            error = place(argument, robot, table)
+            if error is None:
+                position = robot.position
+                cells[position.y * length + position.x] += 1
+            return error
+
+        def count_stop(robot, swallowed):
+            # Swallowed MOVEs are an edge clamp if the cell ahead is off the table, otherwise an obstacle stop
+            position = robot.position
+            x, y = position.x, position.y
+            angle = robot.facing_angle
+            heading = headings.get(angle)
+            if heading is None:
+                heading = headings[angle] = int(angle) % 360 // 90
+            dx, dy = HEADING_STEPS[heading]
+            if 0 <= x + dx < length and 0 <= y + dy < width:
+                cells[obstacle_stops + y * length + x] += swallowed
+            else:
+                cells[edge_clamps + y * length + x] += swallowed
+                edges[heading] += swallowed
+
+        def counted_move(distance, robot, table):
+            position = robot.position
+            x, y = position.x, position.y
+            move(distance, robot, table)
+            position = robot.position
+            new_x, new_y = position.x, position.y
+            if distance == 1:  # The common case: a single MOVE either lands on the next cell or is swallowed
+                if new_x != x or new_y != y:
+                    cells[new_y * length + new_x] += 1
+                else:
+                    count_stop(robot, 1)
+                return
+            moved = abs(new_x - x) + abs(new_y - y)
+            if new_x != x and new_y != y:  # Diagonal headings only count the end
+                cells[new_y * length + new_x] += 1
+            elif moved:
+                self.record_run(x, y, new_x, new_y)
+            if moved < distance:
+                count_stop(robot, distance - moved)
+
+        placer.try_place = counted_place
+        mover.move = counted_move
+
+    def record_run(self, x, y, new_x, new_y):
+        """Counts a visit to every cell of a straight run from (x, y), exclusive, to (new_x, new_y)."""
+        visits = self.counts[VISITS]
+        if new_y == y:
+            low, high = (x + 1, new_x + 1) if new_x > x else (new_x, x)
+            visits[y, low:high] += 1
+        else:
+            low, high = (y + 1, new_y + 1) if new_y > y else (new_y, y)
+            visits[low:high, x] += 1
+
+    def summary(self):
+        """Returns a one-line summary of the counts."""
+        visits = self.counts[VISITS]
+        edges = "/".join(f"{name} {count:,}" for name, count in zip(EDGE_NAMES, self.edges))
+        return (f"{int(visits.sum()):,} visits to {int(np.count_nonzero(visits)):,} of {self._cell_count:,} cells, "
+                f"{int(self.counts[EDGE_CLAMPS].sum()):,} MOVEs clamped at the edge ({edges}), "
+                f"{int(self.counts[OBSTACLE_STOPS].sum()):,} stopped by obstacles")
+
+    def export(self, path=None):
+        """
+        Writes the counts to a .npy or .csv file.
+
+        Args:
+            path (str): The file to write. Defaults to the path given when
+                the analytics were created.
+
+        Returns:
+            str: The path written.
+
+        Raises:
+            ValueError: If there is no path, or it has neither extension.
+            OSError: If the file cannot be written.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("no analytics file given")
+        extension = export_format(path)
+        if extension == ".npy":
+            with open(path, "wb") as file:  # np.save would add .npy to any other name
+                np.save(file, self.counts)
+        elif extension == ".csv":
+            self.write_csv(path)
+        else:
+            raise ValueError(f"Analytics file {path} must end in .npy or .csv")
+        return path
+
+    def write_csv(self, path):
+        """Writes one row for every cell with a non-zero count."""
+        counts = self.counts
+        ys, xs = np.nonzero(counts.any(axis=0))
+        rows = np.column_stack((xs, ys, counts[:, ys, xs].T))
+        with open(path, "w", newline="") as file:
+            file.write(CSV_HEADER + "\n")
+            np.savetxt(file, rows, fmt="%d", delimiter=",")
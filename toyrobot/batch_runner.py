@@ -0,0 +1,194 @@
+"""
+Filename: batch_runner.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module runs many command files in one invocation. Each file is run
+    in its own Session (a fresh table and robot) on a process pool sized to
+    the machine's cores, and the output of each file is emitted in input
+    order or written to its own output file. Output files keep each input's
+    path relative to the inputs' common directory, so a/s.txt and b/s.txt
+    are written to DIR/a/s.out and DIR/b/s.out; inputs that would still
+    share an output file are reported before any file is run.
+"""
+import glob
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from toyrobot.command_source import iter_file_commands
+from toyrobot.output_sink import ListSink, StdoutSink, KIND_ERROR, KIND_INFO, DEFAULT_FLUSH_EVERY
+from toyrobot.session import Session
+
+# Result of running one file: records is a list of (kind, message), or None if written to a file
+FileResult = namedtuple("FileResult", ["path", "records", "commands"])
+
+# Characters that make a path a glob pattern
+GLOB_CHARACTERS = "*?["
+
+
+class BatchSummary:
+    def __init__(self, files, commands, seconds):
+        """
+        Initialise the summary of a batch run.
+
+        Args:
+            files (int): Number of files run.
+            commands (int): Total number of commands processed.
+            seconds (float): Wall clock time of the run.
+        """
+        self.files = files
+        self.commands = commands
+        self.seconds = seconds
+
+    def __str__(self):
+        seconds = max(self.seconds, 1e-9)
+        return (f"Ran {self.files} files ({self.commands} commands) in {self.seconds:.3f}s: "
+                f"{self.files / seconds:,.1f} files/sec, {self.commands / seconds:,.0f} commands/sec")
+
+
+def expand_paths(patterns):
+    """
+    Expands glob patterns into a sorted list of paths, keeping the order of the patterns.
+
+    Patterns that match nothing are kept as they are so they can be reported as missing.
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if any(c in pattern for c in GLOB_CHARACTERS) else []
+        paths.extend(matches or [pattern])
+    return paths
+
+
+def output_path_for(path, output_dir, root=None):
+    """
+    Returns the output file for a command file, e.g. DIR/example1.out.
+
+    Args:
+        path (str): The command file.
+        output_dir (str): The directory output files are written to.
+        root (str): Optional directory containing the command file; its
+            path below root is kept, e.g. DIR/nightly/example1.out.
+    """
+    name = os.path.splitext(os.path.basename(path))[0] + ".out"
+    if root is None:
+        return os.path.join(output_dir, name)
+    subdirectory = os.path.relpath(os.path.dirname(os.path.abspath(path)), root)
+    return os.path.normpath(os.path.join(output_dir, subdirectory, name))
+
+
+def output_paths_for(paths, output_dir):
+    """
+    Returns the output file for each command file, keeping their paths
+    relative to the directory that contains them all.
+
+    Raises:
+        ValueError: If two command files would be written to the same output file.
+    """
+    if not paths:
+        return []
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    outputs = [output_path_for(path, output_dir, root) for path in paths]
+    seen = {}
+    for path, output in zip(paths, outputs):
+        other = seen.setdefault(os.path.normcase(output), path)
+        if other is not path:
+            raise ValueError(f"{other} and {path} would both be written to {output}")
+    return outputs
+
+
+def run_file(path, config, output_path=None):
+    """
+    Runs a single command file in a fresh session.
+
+    Args:
+        path (str): The command file.
+        config (dict): Configuration for the session.
+        output_path (str): Optional file to write the file's output to.
+
+    Returns:
+        FileResult: The output records (unless written to a file) and command count.
+    """
+    if output_path is None:
+        sink = ListSink()
+        commands = _run_file_into(path, config, sink)
+        return FileResult(path, sink.records, commands)
+
+    with open(output_path, 'w') as f:
+        sink = StdoutSink(f, flush_every=DEFAULT_FLUSH_EVERY)
+        commands = _run_file_into(path, config, sink)
+        sink.close()
+    return FileResult(path, None, commands)
+
+
+def _run_batch_file(config, path, output_path):
+    """Runs one file of a batch; config comes first so it can be bound with partial."""
+    return run_file(path, config, output_path)
+
+
+def _run_file_into(path, config, sink):
+    """Runs a command file into a sink and returns the number of commands processed."""
+    session = Session(config, sink)
+    try:
+        session.run(iter_file_commands(path))
+        session.finish()
+    except FileNotFoundError:
+        sink.write(f"File {path} not found.", KIND_ERROR)
+    except Exception as e:
+        sink.write(f"Error processing file: {e}", KIND_ERROR)
+    return session.commands_processed
+
+
+def run_batch(patterns, config, output_sink, jobs=None, output_dir=None):
+    """
+    Runs every file matched by the patterns, each in its own session.
+
+    Args:
+        patterns (list): File paths or glob patterns.
+        config (dict): Configuration used for every session.
+        output_sink (OutputSink): Sink that receives each file's output, in
+            input order, preceded by a "==> path <==" header line.
+        jobs (int): Number of worker processes. Defaults to one per core;
+            1 runs every file in this process.
+        output_dir (str): Write each file's output to its own file in this
+            directory instead of the output sink.
+
+    Returns:
+        BatchSummary: Files and commands processed and the time taken.
+
+    Raises:
+        ValueError: If two files would be written to the same output file.
+    """
+    paths = expand_paths(patterns)
+    jobs = jobs or os.cpu_count() or 1
+    outputs = [None] * len(paths)
+    if output_dir is not None:
+        outputs = output_paths_for(paths, output_dir)
+        for directory in set(map(os.path.dirname, outputs)):
+            os.makedirs(directory, exist_ok=True)
+
+    start = time.perf_counter()
+    worker = partial(_run_batch_file, config)
+    files = commands = 0
+    executor = ProcessPoolExecutor(jobs) if jobs > 1 and len(paths) > 1 else None
+    try:
+        if executor is None:
+            results = map(worker, paths, outputs)
+        else:
+            results = executor.map(worker, paths, outputs, chunksize=max(1, len(paths) // (jobs * 4)))
+
+        # map() yields results in input order, whichever worker finishes first
+        for result in results:
+            files += 1
+            commands += result.commands
+            if result.records is not None:
+                output_sink.write(f"==> {result.path} <==", KIND_INFO)
+                for kind, message in result.records:
+                    output_sink.write(message, kind)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return BatchSummary(files, commands, time.perf_counter() - start)
@@ -0,0 +1,340 @@
+"""
+Filename: binary_format.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides a compact binary encoding of command files, converters
+    between the text and binary forms, and a memory-mapped reader that yields
+    already tokenized commands for CommandDispatcher.execute, so replaying a
+    binary file never decodes, strips, splits or upper-cases any text. Given
+    the robot's direction model, the reader yields packed PLACEs as parsed
+    Placements, so they are not formatted or parsed as text either.
+
+    File layout:
+        header   b"TRBC", version byte, direction count byte, each direction
+                 name as a length byte and its UTF-8 bytes, then a varint
+                 text count and each text as a varint length and UTF-8 bytes
+        commands one opcode byte each, using the parser's opcodes (all below 0x80):
+                 MOVE, LEFT, RIGHT, REPORT, EXIT, STATS  no operands
+                 PLACE         varint x, varint y, heading byte (an index
+                               into the direction names)
+                 UNKNOWN       varint index of the command word
+                 PLACE_TEXT    (0x80) varint index of the PLACE argument text
+                 COMMAND_TEXT  (0x81) varint index of a whole command line,
+                               for any other command with operands
+
+    A PLACE whose argument is exactly "X,Y,NAME" (non-negative integers without
+    signs or padding, and a name from the header) is packed; any other PLACE
+    argument is kept as text, so errors are reported exactly as for the text
+    file. Each distinct text is stored once in the header. Blank lines are
+    dropped. Varints are unsigned LEB128.
+
+    Usage: python -m toyrobot.binary_format encode|decode SOURCE DESTINATION
+"""
+import mmap
+import re
+import sys
+
+from toyrobot.command_parser import (
+    tokenize, format_token, TOKEN_CACHE_SIZE, OPCODE_NAMES,
+    OP_NOP, OP_PLACE, OP_MOVE, OP_LEFT, OP_RIGHT, OP_REPORT, OP_EXIT, OP_UNKNOWN, OP_STATS
+)
+from toyrobot.command_source import BINARY_MAGIC, is_binary_command_file
+from toyrobot.config import DEFAULT_CONFIG
+from toyrobot.robot_placer import Placement
+
+BINARY_VERSION = 2
+
+# A PLACE whose argument could not be packed, followed by the argument's text index
+OP_PLACE_TEXT = 0x80
+
+# Any other command with operands, followed by the text index of the whole line
+OP_COMMAND_TEXT = 0x81
+
+# Opcodes without operands, and the keyword each one is written back as
+SIMPLE_OPCODES = {opcode: OPCODE_NAMES[opcode] for opcode in (OP_MOVE, OP_LEFT, OP_RIGHT, OP_REPORT, OP_EXIT, OP_STATS)}
+
+# Tokens for the operand-free opcodes, shared rather than built per command
+_SIMPLE_TOKENS = [None] * 256
+for _opcode in SIMPLE_OPCODES:
+    _SIMPLE_TOKENS[_opcode] = (_opcode, None)
+_SIMPLE_OPCODE_BYTES = bytes(SIMPLE_OPCODES)
+
+# Finds the next opcode that is followed by operands
+_OPERAND_OPCODE = re.compile(b"[" + re.escape(bytes([OP_PLACE, OP_UNKNOWN, OP_PLACE_TEXT, OP_COMMAND_TEXT])) + b"]")
+
+
+def write_varint(out, value):
+    """Appends a non-negative integer to a bytearray as an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """
+    Reads an unsigned LEB128 varint.
+
+    Returns:
+        tuple: (value, position after the varint)
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_header(names, texts):
+    """Encodes the file header for lists of direction names and texts."""
+    out = bytearray(BINARY_MAGIC)
+    out.append(BINARY_VERSION)
+    out.append(len(names))
+    for name in names:
+        encoded = name.encode()
+        out.append(len(encoded))
+        out += encoded
+    write_varint(out, len(texts))
+    for text in texts:
+        encoded = text.encode()
+        write_varint(out, len(encoded))
+        out += encoded
+    return out
+
+
+def read_header(data):
+    """
+    Reads the file header.
+
+    Returns:
+        tuple: (direction names, texts, position of the first command)
+
+    Raises:
+        ValueError: If the data is not a binary command file of a supported version.
+    """
+    if data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError("Not a binary command file")
+    pos = len(BINARY_MAGIC)
+    if data[pos] != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary command file version {data[pos]}")
+    count = data[pos + 1]
+    pos += 2
+    names = []
+    for _ in range(count):
+        length = data[pos]
+        names.append(bytes(data[pos + 1:pos + 1 + length]).decode())
+        pos += 1 + length
+    count, pos = read_varint(data, pos)
+    texts = []
+    for _ in range(count):
+        length, pos = read_varint(data, pos)
+        texts.append(bytes(data[pos:pos + length]).decode())
+        pos += length
+    return names, texts, pos
+
+
+def _pack_place(argument, headings):
+    """Returns (x, y, heading) if a PLACE argument has the canonical "X,Y,NAME" form, otherwise None."""
+    parts = argument.split(',')
+    if len(parts) != 3 or parts[2] not in headings:
+        return None
+    x_text, y_text = parts[0], parts[1]
+    if not (x_text.isdigit() and x_text.isascii() and y_text.isdigit() and y_text.isascii()):
+        return None
+    x, y = int(x_text), int(y_text)
+    if str(x) != x_text or str(y) != y_text:
+        return None  # Leading zeros would not survive the round trip
+    return x, y, headings[parts[2]]
+
+
+def encode_commands(commands, directions=None):
+    """
+    Encodes command lines in the binary format.
+
+    Args:
+        commands: An iterable of command lines.
+        directions: Direction names (or a mapping keyed by them) that PLACE
+            commands can be packed with. Defaults to the default configuration.
+
+    Returns:
+        bytearray: The encoded file contents.
+    """
+    names = list(directions if directions is not None else DEFAULT_CONFIG["directions"])
+    if len(names) > 255:
+        raise ValueError("At most 255 directions can be encoded")
+    headings = {name: index for index, name in enumerate(names)}
+    text_indexes = {}
+    out = bytearray()
+    for command in commands:
+        opcode, argument = tokenize(command)
+        if opcode == OP_NOP:
+            continue
+        if opcode in SIMPLE_OPCODES:
+            out.append(opcode)
+            continue
+        packed = _pack_place(argument, headings) if opcode == OP_PLACE else None
+        if packed is not None:
+            out.append(OP_PLACE)
+            write_varint(out, packed[0])
+            write_varint(out, packed[1])
+            out.append(packed[2])
+            continue
+        if opcode == OP_PLACE or opcode == OP_UNKNOWN:
+            out.append(OP_PLACE_TEXT if opcode == OP_PLACE else OP_UNKNOWN)
+            text = argument
+        else:
+            out.append(OP_COMMAND_TEXT)
+            text = command.strip()
+        write_varint(out, text_indexes.setdefault(text, len(text_indexes)))
+    return encode_header(names, list(text_indexes)) + out
+
+
+def iter_binary_tokens_from(data, directions=None):
+    """
+    Yields (opcode, argument) tokens, as returned by command_parser.tokenize,
+    from the contents of a binary command file.
+
+    Args:
+        data: The file contents, e.g. bytes or an mmap.
+        directions (DirectionModel): Optional direction model of the robot the
+            tokens are run on. Packed PLACEs whose direction it knows are then
+            yielded with a Placement argument instead of "X,Y,NAME" text.
+
+    Raises:
+        ValueError: If the data is not a valid binary command file.
+    """
+    names, texts, pos = read_header(data)
+    # The facing angle for each header direction, or None to yield the PLACE as text
+    angles = [directions.angle_for(name) if directions is not None else None for name in names]
+    text_tokens = {
+        OP_PLACE_TEXT: [(OP_PLACE, text) for text in texts],
+        OP_UNKNOWN: [(OP_UNKNOWN, text) for text in texts],
+        OP_COMMAND_TEXT: [tokenize(text) for text in texts],
+    }
+    simple_tokens = _SIMPLE_TOKENS
+    search_operand_opcode = _OPERAND_OPCODE.search
+    place_tokens = {}
+    size = len(data)
+    while pos < size:
+        opcode = data[pos]
+        if opcode == OP_PLACE:
+            x = data[pos + 1]
+            y = data[pos + 2]
+            if x < 0x80 and y < 0x80:  # Both coordinates fit in a single byte
+                key = (x, y, data[pos + 3])
+                pos += 4
+            else:
+                x, pos = read_varint(data, pos + 1)
+                y, pos = read_varint(data, pos)
+                key = (x, y, data[pos])
+                pos += 1
+            token = place_tokens.get(key)
+            if token is None:
+                if len(place_tokens) >= TOKEN_CACHE_SIZE:
+                    place_tokens.clear()
+                x, y, heading = key
+                angle = angles[heading]
+                name = names[heading]
+                token = place_tokens[key] = (OP_PLACE, f"{x},{y},{name}" if angle is None
+                                             else Placement(x, y, angle, name))
+            yield token
+        elif opcode in text_tokens:
+            index = data[pos + 1]
+            if index < 0x80:
+                pos += 2
+            else:
+                index, pos = read_varint(data, pos + 1)
+            yield text_tokens[opcode][index]
+        else:
+            token = simple_tokens[opcode]
+            if token is None:
+                raise ValueError(f"Invalid opcode {opcode} at byte {pos}")
+            pos += 1
+            yield token
+            if pos < size and simple_tokens[data[pos]] is not None:
+                # A run of operand-free opcodes: emit the rest of it in one go
+                match = search_operand_opcode(data, pos)
+                end = match.start() if match else size
+                run = data[pos:end]
+                if run.translate(None, _SIMPLE_OPCODE_BYTES):
+                    invalid = pos + next(i for i, opcode in enumerate(run) if simple_tokens[opcode] is None)
+                    raise ValueError(f"Invalid opcode {data[invalid]} at byte {invalid}")
+                yield from map(simple_tokens.__getitem__, run)
+                pos = end
+
+
+def iter_binary_tokens(path, directions=None):
+    """
+    Yields (opcode, argument) tokens from a memory-mapped binary command file.
+
+    Args:
+        path (str): Path to the binary command file.
+        directions (DirectionModel): Optional direction model that packed
+            PLACEs are parsed with (see iter_binary_tokens_from).
+
+    Raises:
+        ValueError: If the file is not a valid binary command file.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError("Not a binary command file") from None  # Empty files cannot be mapped
+        with mapped:
+            yield from iter_binary_tokens_from(mapped, directions)
+
+
+def decode_tokens(tokens):
+    """Yields the text command line for each token."""
+    for opcode, argument in tokens:
+        yield format_token(opcode, argument)
+
+
+def convert_text_to_binary(text_path, binary_path, directions=None):
+    """
+    Converts a text command file to the binary format.
+
+    Returns:
+        int: The size of the binary file in bytes.
+    """
+    with open(text_path, 'r') as f:
+        data = encode_commands(f, directions)
+    with open(binary_path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def convert_binary_to_text(binary_path, text_path):
+    """
+    Converts a binary command file back to text, one command per line.
+
+    The text is equivalent rather than identical to the original: blank lines
+    are dropped, keywords are upper-cased and anything after a command's
+    argument is removed.
+    """
+    with open(text_path, 'w') as f:
+        for line in decode_tokens(iter_binary_tokens(binary_path)):
+            f.write(line + "\n")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] not in ("encode", "decode"):
+        print("Usage: python -m toyrobot.binary_format encode|decode SOURCE DESTINATION", file=sys.stderr)
+        return 2
+    mode, source, destination = argv
+    if mode == "encode":
+        from toyrobot.config import load_config
+        convert_text_to_binary(source, destination, load_config().directions)
+    else:
+        convert_binary_to_text(source, destination)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,408 @@
+"""
+Filename: blocks.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module implements DEFINE and REPEAT blocks in the command language:
+
+        DEFINE SQUARE        records a macro, run with CALL SQUARE
+        MOVE
+        RIGHT
+        END
+        REPEAT 1000000       runs its body a number of times at its END
+        CALL SQUARE
+        END
+
+    Blocks can be nested, except that DEFINE is only allowed outside any
+    block. A CALL inside a block runs the macro defined at the time the CALL
+    was recorded. The lines of a block are recorded, not run, until its END.
+
+    Running a block's body once is a function of the robot's state (placed
+    or not, position and facing angle) and the number of obstacles on the
+    table, which only grows, so identifies the obstacles exactly. Each block
+    memoizes that function: the state it ends in, the output it wrote and
+    whether it reached EXIT. REPEAT runs the body through the memo and
+    detects cycles in the states it passes through (Brent's algorithm); a
+    cycle that writes no output is then skipped in one step, so REPEAT n
+    finishes in time bounded by the number of states rather than by n.
+    Output inside a loop is written exactly as if the block were expanded,
+    and as it is produced: a body that writes more than MEMO_OUTPUT_LIMIT
+    records streams them without being memoized, so memory stays bounded
+    however much a block writes.
+
+    A BlockRunner can limit the lines recorded per block and the commands a
+    REPEAT or CALL may run (the server does, per connection); a block over
+    either limit is reported and dropped. A block still open when the input
+    ends is reported by finish() and dropped.
+
+    Blocks that use STATS or HEATMAP are not memoized, because their output
+    depends on every command before them, and no block is memoized while
+    analytics are enabled, since they count every MOVE that runs. Commands
+    inside blocks are not timed separately by --stats.
+"""
+
+from functools import partial
+
+from toyrobot.command_dispatcher import CommandDispatcher, ERROR_FORMATS, STATUS_OK, STATUS_ERROR, STATUS_EXIT
+from toyrobot.command_parser import (
+    format_token, KEYWORDS, OPCODE_NAMES, OP_DEFINE, OP_REPEAT, OP_END, OP_CALL, OP_STATS, OP_HEATMAP
+)
+from toyrobot.output_sink import OutputSink, KIND_REPORT
+from toyrobot.position import Position
+from toyrobot.robot_placer import parse_coordinate
+
+# Most memoized states kept per block before its memo is cleared
+MEMO_LIMIT = 1 << 20
+
+# Most output records memoized for one run of a body; bodies that write more are not memoized
+MEMO_OUTPUT_LIMIT = 256
+
+# Most output records kept across a block's memo before it is cleared
+MEMO_RECORD_LIMIT = 1 << 20
+
+# Every opcode runs while recording, so that it can be recorded
+_ALL_OPCODES = frozenset(OPCODE_NAMES)
+
+
+def state_key(robot, table):
+    """Returns the state a block's effect depends on: (x, y, facing angle, obstacle count)."""
+    obstacles = 0 if table.obstacles is None else len(table.obstacles)
+    position = robot.position
+    if position is None:
+        return None, None, None, obstacles
+    return position.x, position.y, robot.facing_angle, obstacles
+
+
+def restore_state(robot, key):
+    """Puts the robot in the state described by a state key."""
+    x, y, facing_angle, _ = key
+    if x is None:
+        robot.position = None
+        robot.facing_angle = None
+    elif robot.position is None:
+        robot.position = Position(x, y)
+        robot.facing_angle = facing_angle
+    else:
+        robot.position.move_to(x, y)
+        robot.facing_angle = facing_angle
+
+
+class _MemoSink(OutputSink):
+    def __init__(self, sink, records):
+        """
+        Initialise a sink that writes straight through to another sink,
+        keeping a copy of the first records for a block's memo.
+
+        Args:
+            sink (OutputSink): The sink the output is written to.
+            records (list): The (kind, message) copies, shared by the
+                dispatcher's and the reporter's sinks so they stay in order.
+                Copying stops once it holds more than MEMO_OUTPUT_LIMIT.
+        """
+        self.sink = sink
+        self.records = records
+
+    def write(self, message, kind=KIND_REPORT):
+        self.sink.write(message, kind)
+        records = self.records
+        if len(records) <= MEMO_OUTPUT_LIMIT:
+            records.append((kind, message))
+
+
+class Block:
+    __slots__ = ("items", "memoizable", "memo", "memo_records", "size")
+
+    def __init__(self, items):
+        """
+        Initialise a recorded block.
+
+        Args:
+            items (list): The body as (opcode, argument) tokens, where a nested
+                REPEAT is (OP_REPEAT, (count, Block)) and a CALL is
+                (OP_CALL, Block), or (OP_CALL, name) if no such macro existed.
+        """
+        self.items = items
+        self.memoizable = all(
+            opcode not in (OP_STATS, OP_HEATMAP) and not (opcode == OP_REPEAT and not argument[1].memoizable)
+            and not (opcode == OP_CALL and isinstance(argument, Block) and not argument.memoizable)
+            for opcode, argument in items
+        )
+        self.memo = {}  # State key -> (end state key, output records, status)
+        self.memo_records = 0  # Output records held across the memo
+        # Commands one run of the body executes, with nested REPEATs and CALLs expanded
+        self.size = sum(
+            argument[0] * argument[1].size if opcode == OP_REPEAT
+            else argument.size if opcode == OP_CALL and isinstance(argument, Block) else 1
+            for opcode, argument in items
+        )
+
+
+class _Frame:
+    __slots__ = ("opcode", "argument", "items", "valid")
+
+    def __init__(self, opcode, argument, valid):
+        self.opcode = opcode  # OP_DEFINE or OP_REPEAT
+        self.argument = argument  # The macro name or the repeat count
+        self.items = []
+        self.valid = valid  # Invalid blocks are recorded so their END matches, then dropped
+
+
+class BlockRunner:
+    def __init__(self, dispatcher, max_lines=None, max_commands=None):
+        """
+        Initialise the macros and block recorder for a dispatcher.
+
+        Args:
+            dispatcher (CommandDispatcher): The dispatcher whose commands are
+                recorded, and that runs the commands inside blocks.
+            max_lines (int): Optional limit on the lines recorded for an
+                outermost DEFINE or REPEAT block, nested blocks included.
+            max_commands (int): Optional limit on the commands an outermost
+                REPEAT or a CALL may run, with nested blocks expanded.
+        """
+        self.dispatcher = dispatcher
+        self.max_lines = max_lines
+        self.max_commands = max_commands
+        self.macros = {}
+        self.definitions = []  # The text of every DEFINE block, in order, for checkpoints
+        self.frames = []  # Blocks being recorded, innermost last
+        self._lines = 0  # Lines recorded for the outermost block
+        self._source = []  # Lines of the DEFINE block being recorded
+        self._saved = None  # The dispatcher's handlers while recording
+        self._recording_handlers = {opcode: partial(self.record, opcode) for opcode in OPCODE_NAMES}
+        self._execute = partial(CommandDispatcher.execute, dispatcher)  # Untimed, even with --stats
+
+    @property
+    def recording(self):
+        """True while the lines of a block are being recorded."""
+        return bool(self.frames)
+
+    def close(self):
+        """Drops any blocks being recorded, so the dispatcher runs commands again."""
+        if self.frames:
+            dispatcher = self.dispatcher
+            dispatcher.handlers, dispatcher.placement_free_opcodes = self._saved
+            self._saved = None
+            self.frames.clear()
+            self._source = []
+
+    def finish(self):
+        """
+        Reports a block still open at the end of the input, and drops it.
+
+        Returns:
+            int: STATUS_ERROR if a block was open, otherwise STATUS_OK.
+        """
+        if not self.frames:
+            return STATUS_OK
+        opcode = self.frames[0].opcode
+        self.close()
+        return self.error(opcode, f"unterminated {OPCODE_NAMES[opcode]} block at end of input.")
+
+    def error(self, opcode, message):
+        """Reports an invalid block command and returns STATUS_ERROR."""
+        self.dispatcher.emit(ERROR_FORMATS[opcode].format(message))
+        return STATUS_ERROR
+
+    def define(self, argument):
+        """Starts recording a macro. Returns the status of the DEFINE command."""
+        name = argument.upper()
+        error = None
+        if name in KEYWORDS:
+            error = f"{name!r} is a command and cannot be a macro name."
+        elif self.frames:
+            error = "DEFINE cannot be used inside a block."
+        if not self.frames:
+            self._source = [format_token(OP_DEFINE, argument)] if error is None else []
+        self._open(_Frame(OP_DEFINE, name, error is None))
+        if error is not None:
+            return self.error(OP_DEFINE, f"Invalid DEFINE command: {argument}. Error: {error}")
+        return STATUS_OK
+
+    def repeat(self, argument):
+        """Starts recording a REPEAT block. Returns the status of the REPEAT command."""
+        count = parse_coordinate(argument)
+        valid = count is not None and count >= 0
+        self._open(_Frame(OP_REPEAT, count, valid))
+        if not valid:
+            return self.error(OP_REPEAT, f"Invalid REPEAT command: {argument}. Error: expected a count of 0 or more")
+        return STATUS_OK
+
+    def end(self):
+        """Reports an END that has no block to close."""
+        return self.error(OP_END, "no DEFINE or REPEAT block is open.")
+
+    def call(self, argument, robot, table):
+        """Runs a macro once. Returns STATUS_EXIT if it reached EXIT."""
+        block = self.macros.get(argument.upper())
+        if block is None:
+            return self.undefined(argument)
+        if self.max_commands is not None and block.size > self.max_commands:
+            return self.error(OP_CALL, f"Invalid CALL command: {argument}. Error: runs {block.size} commands, "
+                                       f"more than the limit of {self.max_commands}")
+        return self.run_once(block, robot, table)
+
+    def undefined(self, name):
+        """Reports a CALL of a macro that has not been defined."""
+        return self.error(OP_CALL, f"Invalid CALL command: {name}. Error: no macro named {name.upper()}")
+
+    def _open(self, frame):
+        """Pushes a block frame, switching the dispatcher to recording if it is the outermost."""
+        if not self.frames:
+            dispatcher = self.dispatcher
+            self._saved = (dispatcher.handlers, dispatcher.placement_free_opcodes)
+            dispatcher.handlers = self._recording_handlers
+            dispatcher.placement_free_opcodes = _ALL_OPCODES
+            self._lines = 0
+        elif self.max_lines is not None and self._lines > self.max_lines:
+            frame.valid = False  # Inside a block that was too long, which is being dropped
+        self.frames.append(frame)
+
+    def record(self, opcode, argument, robot, table):
+        """Records one command of the block being recorded, running the block at its END."""
+        self._lines += 1
+        if self.max_lines is not None and self._lines == self.max_lines + 1:
+            self._drop_recorded()
+        if self._source:
+            self._source.append(format_token(opcode, argument))
+        if opcode == OP_DEFINE:
+            return self.define(argument)
+        if opcode == OP_REPEAT:
+            return self.repeat(argument)
+        if opcode != OP_END:
+            frame = self.frames[-1]
+            if frame.valid:
+                if opcode == OP_CALL:
+                    argument = self.macros.get(argument.upper(), argument)
+                frame.items.append((opcode, argument))
+            return STATUS_OK
+
+        frame = self.frames.pop()
+        if self.frames:
+            if frame.valid:
+                self.frames[-1].items.append((OP_REPEAT, (frame.argument, Block(frame.items))))
+            return STATUS_OK
+
+        # The outermost block is complete, so commands run again
+        dispatcher = self.dispatcher
+        dispatcher.handlers, dispatcher.placement_free_opcodes = self._saved
+        self._saved = None
+        if not frame.valid:
+            return STATUS_OK
+        if frame.opcode == OP_DEFINE:
+            self.macros[frame.argument] = Block(frame.items)
+            self.definitions.append("\n".join(self._source))
+            self._source = []
+            return STATUS_OK
+        block = Block(frame.items)
+        commands = frame.argument * block.size
+        if self.max_commands is not None and commands > self.max_commands:
+            return self.error(OP_REPEAT, f"Invalid REPEAT command: {frame.argument}. Error: runs {commands} "
+                                         f"commands, more than the limit of {self.max_commands}")
+        return self.run_repeat(block, frame.argument, robot, table)
+
+    def _drop_recorded(self):
+        """Reports that the block being recorded is too long and drops its lines, still matching its END."""
+        for frame in self.frames:
+            frame.valid = False
+            frame.items = []
+        self._source = []
+        opcode = self.frames[0].opcode
+        self.error(opcode, f"{OPCODE_NAMES[opcode]} block is longer than {self.max_lines} lines.")
+
+    def run_items(self, block, robot, table):
+        """Runs a block's body once, without the memo. Returns STATUS_EXIT if it reached EXIT."""
+        execute = self._execute
+        for opcode, argument in block.items:
+            if opcode == OP_REPEAT:
+                status = self.run_repeat(argument[1], argument[0], robot, table)
+            elif opcode == OP_CALL:
+                status = self.run_once(argument, robot, table) if isinstance(argument, Block) \
+                    else self.undefined(argument)
+            else:
+                status = execute(opcode, argument, robot, table)
+            if status == STATUS_EXIT:
+                return STATUS_EXIT
+        return STATUS_OK
+
+    def run_once(self, block, robot, table):
+        """Runs a block's body once, through its memo. Returns STATUS_EXIT if it reached EXIT."""
+        if not block.memoizable or self.dispatcher.analytics is not None:
+            return self.run_items(block, robot, table)
+        key = state_key(robot, table)
+        transition = block.memo.get(key)
+        if transition is not None:
+            end_key, records, status = transition
+            restore_state(robot, end_key)
+            write = self.dispatcher.output_sink.write
+            for kind, message in records:
+                write(message, kind)
+            return status
+
+        # Run the body with its output written as it goes and copied, so it can be saved with the end state
+        dispatcher = self.dispatcher
+        reporter = robot.robot_reporter
+        output_sink, report_sink = dispatcher.output_sink, reporter.output_sink
+        records = []
+        dispatcher.output_sink = _MemoSink(output_sink, records)
+        reporter.output_sink = _MemoSink(report_sink, records)
+        try:
+            status = self.run_items(block, robot, table)
+        finally:
+            dispatcher.output_sink, reporter.output_sink = output_sink, report_sink
+
+        end_key = state_key(robot, table)
+        # A body that added obstacles ends in a new table, and one that wrote too much would hold it all
+        if end_key[3] == key[3] and len(records) <= MEMO_OUTPUT_LIMIT:
+            if len(block.memo) >= MEMO_LIMIT or block.memo_records + len(records) > MEMO_RECORD_LIMIT:
+                block.memo.clear()
+                block.memo_records = 0
+            block.memo[key] = (end_key, tuple(records), status)
+            block.memo_records += len(records)
+        return status
+
+    def run_repeat(self, block, count, robot, table):
+        """
+        Runs a block's body `count` times. Once the robot's state repeats, a
+        cycle that writes no output is skipped as a whole.
+
+        Returns:
+            int: STATUS_EXIT if the body reached EXIT, otherwise STATUS_OK.
+        """
+        if not block.memoizable or self.dispatcher.analytics is not None:
+            for _ in range(count):
+                if self.run_items(block, robot, table) == STATUS_EXIT:
+                    return STATUS_EXIT
+            return STATUS_OK
+
+        remaining = count
+        anchor = state_key(robot, table)  # Brent's algorithm: compare each state with the last anchor
+        power = 1
+        length = 0
+        while remaining:
+            if self.run_once(block, robot, table) == STATUS_EXIT:
+                return STATUS_EXIT
+            remaining -= 1
+            if anchor is None:
+                continue
+            length += 1
+            key = state_key(robot, table)
+            if key == anchor:
+                # The state repeats every `length` runs from here on
+                if self._is_silent_cycle(block, key, length):
+                    remaining %= length
+                anchor = None
+            elif length == power:
+                anchor, power, length = key, power * 2, 0
+        return STATUS_OK
+
+    def _is_silent_cycle(self, block, key, length):
+        """Returns True if the memo holds a cycle of `length` runs from key that writes nothing."""
+        memo = block.memo
+        for _ in range(length):
+            transition = memo.get(key)
+            if transition is None or transition[1] or transition[2] == STATUS_EXIT:
+                return False
+            key = transition[0]
+        return True
@@ -0,0 +1,295 @@
+"""
+Filename: checkpoint.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides checkpoint and resume for long command replays.
+    Every N commands the robot's state (placed or not, position and facing
+    angle) is saved with the byte offset of the next command in the input
+    file, in a small fixed-size binary record followed by the cells blocked
+    by obstacles, if any, and the text of the DEFINE blocks run so far.
+    Resuming restores the robot, the obstacles and the macros and seeks
+    straight to that offset instead of replaying the whole log. The record
+    also holds a fingerprint of the input it was made from (a hash of its
+    first bytes and of the bytes just before the offset), and a checkpoint
+    whose fingerprint does not match the input is refused rather than
+    resumed at an offset that means nothing in that file; appending to the
+    input keeps its fingerprint. No checkpoint
+    is saved while a DEFINE or REPEAT block is open; the next one is saved at
+    the first interval that ends outside a block.
+"""
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+from itertools import islice
+
+from toyrobot.command_dispatcher import STATUS_OK, STATUS_EXIT
+from toyrobot.command_source import READ_BUFFER_SIZE
+from toyrobot.output_sink import ListSink
+from toyrobot.position import Position
+
+# Magic, version, input offset, commands processed, placed flag, x, y, facing angle,
+# obstacle count, definitions length, input fingerprint; followed by an x, y pair of
+# little-endian int64s per obstacle and the UTF-8 text of the DEFINE blocks
+CHECKPOINT_RECORD = struct.Struct("<4sBQQ?qqdQQ16s")
+CHECKPOINT_MAGIC = b"TRCP"
+CHECKPOINT_VERSION = 4
+
+# Bytes hashed from the start of the input and from just before the checkpoint's offset
+FINGERPRINT_WINDOW = 4096
+
+# Commands run between checkpoints
+DEFAULT_CHECKPOINT_INTERVAL = 100_000
+
+Checkpoint = namedtuple("Checkpoint", ["offset", "commands", "placed", "x", "y", "facing_angle", "obstacles",
+                                       "definitions", "fingerprint"], defaults=[(), "", bytes(16)])
+
+
+def input_fingerprint(path, offset):
+    """
+    Fingerprints the part of an input file before an offset, from its first
+    FINGERPRINT_WINDOW bytes and the FINGERPRINT_WINDOW bytes that end at
+    the offset. Bytes after the offset are not read, so appending to the
+    file does not change its fingerprint.
+
+    Returns:
+        bytes: A 16-byte digest, or b"" if the file is shorter than the offset.
+    """
+    import hashlib  # Only needed once a checkpoint is saved or resumed
+    with open(path, 'rb') as f:
+        head = f.read(min(offset, FINGERPRINT_WINDOW))
+        start = max(offset - FINGERPRINT_WINDOW, 0)
+        f.seek(start)
+        tail = f.read(offset - start)
+    if len(tail) != offset - start:
+        return b""
+    return hashlib.blake2b(head + tail, digest_size=16).digest()
+
+
+def capture_checkpoint(robot, offset, commands, obstacles=(), definitions="", fingerprint=bytes(16)):
+    """
+    Captures the robot's state at a point in the input.
+
+    Args:
+        robot (Robot): The robot whose state is saved.
+        offset (int): Byte offset of the next unprocessed command.
+        commands (int): Number of commands processed so far.
+        obstacles (tuple): The (x, y) cells blocked on the table.
+        definitions (str): The command lines of every DEFINE block so far.
+        fingerprint (bytes): The input's fingerprint at the offset (see input_fingerprint).
+    """
+    if robot.position is None:
+        return Checkpoint(offset, commands, False, 0, 0, 0.0, obstacles, definitions, fingerprint)
+    return Checkpoint(offset, commands, True, robot.position.x, robot.position.y, robot.facing_angle, obstacles,
+                      definitions, fingerprint)
+
+
+def capture_definitions(dispatcher):
+    """Returns the command lines of every DEFINE block a dispatcher has run, for a checkpoint."""
+    return "\n".join(dispatcher.blocks.definitions) if dispatcher.blocks is not None else ""
+
+
+def restore_checkpoint(checkpoint, robot, table=None, dispatcher=None):
+    """
+    Restores the robot, and the table's obstacles if a table is given, to the
+    state saved in a checkpoint. If a dispatcher is given, the saved DEFINE
+    blocks are run through it, without output, to restore the macros.
+    """
+    if table is not None:
+        for x, y in checkpoint.obstacles:
+            table.add_obstacle(x, y)
+    if dispatcher is not None and checkpoint.definitions:
+        output_sink = dispatcher.output_sink
+        dispatcher.output_sink = ListSink()
+        try:
+            for line in checkpoint.definitions.split("\n"):
+                dispatcher.dispatch(line, robot, table)
+        finally:
+            dispatcher.output_sink = output_sink
+    if not checkpoint.placed:
+        robot.position = None
+        robot.facing_angle = None
+        return
+    angle = checkpoint.facing_angle
+    robot.position = Position(checkpoint.x, checkpoint.y)
+    robot.facing_angle = int(angle) if float(angle).is_integer() else angle
+
+
+def save_checkpoint(path, checkpoint):
+    """
+    Writes a checkpoint atomically, so a crash mid-write leaves the previous
+    checkpoint intact.
+    """
+    definitions = checkpoint.definitions.encode()
+    data = CHECKPOINT_RECORD.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, checkpoint.offset, checkpoint.commands,
+                                  checkpoint.placed, checkpoint.x, checkpoint.y, float(checkpoint.facing_angle),
+                                  len(checkpoint.obstacles), len(definitions), checkpoint.fingerprint)
+    cells = array('q', [value for cell in checkpoint.obstacles for value in cell])
+    if sys.byteorder == "big":
+        cells.byteswap()
+    temporary_path = path + ".tmp"
+    with open(temporary_path, 'wb') as f:
+        f.write(data)
+        f.write(cells)
+        f.write(definitions)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Reads a checkpoint file.
+
+    Returns:
+        Checkpoint: The saved state, or None if there is no checkpoint file.
+
+    Raises:
+        ValueError: If the file is not a checkpoint of a supported version.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if len(data) <= len(CHECKPOINT_MAGIC) or not data.startswith(CHECKPOINT_MAGIC):
+        raise ValueError(f"{path} is not a checkpoint file")
+    version = data[len(CHECKPOINT_MAGIC)]
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} has unsupported checkpoint version {version}")
+    if len(data) < CHECKPOINT_RECORD.size:
+        raise ValueError(f"{path} is not a checkpoint file")
+    _, _, *fields, count, definitions_length, fingerprint = CHECKPOINT_RECORD.unpack_from(data)
+    definitions_start = CHECKPOINT_RECORD.size + 16 * count
+    if len(data) != definitions_start + definitions_length:
+        raise ValueError(f"{path} is not a checkpoint file")
+    cells = array('q')
+    cells.frombytes(data[CHECKPOINT_RECORD.size:definitions_start])
+    if sys.byteorder == "big":
+        cells.byteswap()
+    return Checkpoint(*fields, tuple(zip(cells[0::2], cells[1::2])), data[definitions_start:].decode(), fingerprint)
+
+
+class OffsetCommandReader:
+    def __init__(self, path, offset=0, buffer_size=READ_BUFFER_SIZE):
+        """
+        Initialise a reader that yields commands from a file and tracks the
+        byte offset of the next unread command. Lines end at "\\n" (so "\\r\\n"
+        files work too), as with the memory-mapped source.
+
+        Args:
+            path (str): Path to the command file.
+            offset (int): Byte offset to start reading from.
+            buffer_size (int): Size in bytes of each chunk read from disk.
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self._offset = offset
+        self._file = None
+
+    @property
+    def offset(self):
+        """Byte offset of the next command that has not been yielded."""
+        if self._file is not None:
+            return self._file.tell()
+        return self._offset
+
+    def __iter__(self):
+        self._file = open(self.path, 'rb', buffering=self.buffer_size)
+        try:
+            self._file.seek(self._offset)
+            yield from map(bytes.decode, self._file)
+        finally:
+            self._offset = self._file.tell()
+            self._file.close()
+            self._file = None
+
+
+class CheckpointRunner:
+    def __init__(self, dispatcher, path, interval=DEFAULT_CHECKPOINT_INTERVAL, output_sink=None):
+        """
+        Initialise a runner that saves a checkpoint every `interval` commands.
+
+        Args:
+            dispatcher (CommandDispatcher): Executes each command.
+            path (str): The checkpoint file.
+            interval (int): Number of commands between checkpoints.
+            output_sink (OutputSink): Optional sink flushed before each
+                checkpoint, so output up to the checkpoint is written out.
+        """
+        self.dispatcher = dispatcher
+        self.path = path
+        self.interval = interval
+        self.output_sink = output_sink
+        self.checkpoints = 0
+        self._obstacles = (0, ())  # The obstacle count and cells at the last checkpoint
+        self._source = None  # The command file being run
+
+    def run(self, source, robot, table, resume=False):
+        """
+        Runs a command file, checkpointing as it goes. The checkpoint file is
+        removed once the file has been run to the end (or to EXIT).
+
+        Args:
+            source (str): Path to the command file.
+            resume (bool): Continue from the saved checkpoint, if there is one.
+
+        Returns:
+            int: STATUS_EXIT if an EXIT command stopped the run, otherwise STATUS_OK.
+
+        Raises:
+            ValueError: If the checkpoint was not made from this command file.
+        """
+        checkpoint = load_checkpoint(self.path) if resume else None
+        offset = commands = 0
+        if checkpoint is not None:
+            if input_fingerprint(source, checkpoint.offset) != checkpoint.fingerprint:
+                raise ValueError(f"{self.path} was not made from {source}; remove it to run {source} from the start")
+            restore_checkpoint(checkpoint, robot, table, self.dispatcher)
+            offset = checkpoint.offset
+            commands = checkpoint.commands
+        reader = OffsetCommandReader(source, offset)
+        self._source = source
+
+        dispatch = self.dispatcher.dispatch
+        lines = iter(reader)
+        status = STATUS_OK
+        while True:
+            processed = 0
+            for command in islice(lines, self.interval):
+                processed += 1
+                if dispatch(command, robot, table) == STATUS_EXIT:
+                    status = STATUS_EXIT
+                    break
+            commands += processed
+            if status == STATUS_EXIT or processed < self.interval:
+                break  # EXIT or end of input
+            if not self.dispatcher.recording:  # Resuming inside a block would lose its recorded lines
+                self.save(robot, reader.offset, commands, table)
+        lines.close()
+        self.dispatcher.finish()
+
+        try:
+            os.remove(self.path)  # The replay is complete, so there is nothing to resume
+        except FileNotFoundError:
+            pass
+        return status
+
+    def save(self, robot, offset, commands, table=None):
+        """
+        Flushes pending output and saves a checkpoint, including the table's
+        obstacles, the macros and the fingerprint of the command file.
+        """
+        if self.output_sink is not None:
+            self.output_sink.flush()
+        obstacles = table.obstacles if table is not None else None
+        if obstacles is not None and len(obstacles) != self._obstacles[0]:
+            # Obstacles are only ever added, so the cells need listing again only when the count changes
+            self._obstacles = (len(obstacles), tuple(obstacles))
+        save_checkpoint(self.path, capture_checkpoint(robot, offset, commands, self._obstacles[1],
+                                                      capture_definitions(self.dispatcher),
+                                                      input_fingerprint(self._source, offset)))
+        self.checkpoints += 1
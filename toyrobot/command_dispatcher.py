@@ -0,0 +1,286 @@
+"""
+Filename: command_dispatcher.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module executes tokenized commands against a robot. Each opcode is
+    mapped to a handler in a dispatch table, and the outcome of every command
+    is reported through a status code rather than by raising exceptions.
+    An optional Instrumentation times every command and answers STATS.
+    DEFINE, REPEAT, END and CALL are handed to a BlockRunner (see blocks.py),
+    created the first time one of them is used, and PATH to a PathPlanner
+    (see path_planner.py), created for each table it plans on. HEATMAP
+    writes the visit counts of an optional Analytics (see analytics.py).
+"""
+
+from toyrobot.command_parser import (
+    tokenize, OP_NOP, OP_PLACE, OP_MOVE, OP_LEFT, OP_RIGHT, OP_REPORT, OP_EXIT, OP_UNKNOWN, OP_STATS,
+    OP_OBSTACLE, OP_DEFINE, OP_REPEAT, OP_END, OP_CALL, OP_PATH, OP_HEATMAP
+)
+from toyrobot.obstacle_map import parse_obstacle
+from toyrobot.output_sink import StdoutSink, KIND_ERROR, KIND_IGNORED, KIND_INFO, KIND_REPORT
+from toyrobot.robot_placer import parse_place
+
+# Status codes returned for each executed command
+STATUS_OK = 0
+STATUS_IGNORED = 1
+STATUS_ERROR = 2
+STATUS_EXIT = 3
+
+# Messages reported for failed or ignored commands
+NOT_PLACED_MESSAGE = "Command ignored: Robot not placed on the table."
+STATS_DISABLED_MESSAGE = "STATS: instrumentation is not enabled (run with --stats)."
+ANALYTICS_DISABLED_MESSAGE = "HEATMAP: analytics are not enabled (run with --analytics PATH)."
+UNREACHABLE_MESSAGE = "Target cannot be reached."
+ERROR_FORMATS = {
+    OP_PLACE: "Error: Invalid PLACE command - {}",
+    OP_MOVE: "Error during MOVE command: {}",
+    OP_LEFT: "Error during LEFT command: {}",
+    OP_RIGHT: "Error during RIGHT command: {}",
+    OP_REPORT: "Error during REPORT command: {}",
+    OP_STATS: "Error during STATS command: {}",
+    OP_OBSTACLE: "Error: Invalid OBSTACLE command - {}",
+    OP_DEFINE: "Error: Invalid DEFINE command - {}",
+    OP_REPEAT: "Error: Invalid REPEAT command - {}",
+    OP_END: "Error: Invalid END command - {}",
+    OP_CALL: "Error: Invalid CALL command - {}",
+    OP_PATH: "Error: Invalid PATH command - {}",
+    OP_HEATMAP: "Error during HEATMAP command: {}",
+    OP_UNKNOWN: "Error: Unknown command '{}'",
+}
+
+# Commands that run whether or not the robot has been placed
+PLACEMENT_FREE_OPCODES = frozenset({OP_PLACE, OP_STATS, OP_OBSTACLE, OP_DEFINE, OP_REPEAT, OP_END, OP_CALL,
+                                    OP_HEATMAP})
+
+class CommandDispatcher:
+    def __init__(self, output_sink=None, instrumentation=None):
+        """
+        Initialise the dispatch table mapping each opcode to its handler.
+
+        Handlers take (argument, robot, table) and return a status code.
+
+        Args:
+            output_sink (OutputSink): Optional sink for error and status
+                messages. Defaults to writing each message straight to stdout.
+            instrumentation (Instrumentation): Optional statistics recorder.
+                When given, every command is timed and STATS reports the
+                statistics; otherwise execute runs untimed.
+        """
+        self.output_sink = output_sink or StdoutSink()
+        self.instrumentation = instrumentation
+        self.handlers = {
+            OP_PLACE: self.place,
+            OP_MOVE: self.move,
+            OP_LEFT: self.left,
+            OP_RIGHT: self.right,
+            OP_REPORT: self.report,
+            OP_EXIT: self.exit,
+            OP_UNKNOWN: self.unknown,
+            OP_STATS: self.stats,
+            OP_OBSTACLE: self.obstacle,
+            OP_DEFINE: self.define,
+            OP_REPEAT: self.repeat,
+            OP_END: self.end,
+            OP_CALL: self.call,
+            OP_PATH: self.path,
+            OP_HEATMAP: self.heatmap,
+        }
+        # Both are swapped while a block is being recorded, so every command is recorded instead of run
+        self.placement_free_opcodes = PLACEMENT_FREE_OPCODES
+        self.blocks = None  # The BlockRunner, created by the first block command
+        self.block_limits = None  # (max_lines, max_commands) for the BlockRunner, set by Session.limit_blocks
+        self.planner = None  # The PathPlanner for the table of the last PATH command
+        self.analytics = None  # The Analytics recording the robot's visits, set by Session.enable_analytics
+        if instrumentation is not None:
+            self.execute = self.execute_instrumented
+
+    def dispatch(self, command, robot, table):
+        """
+        Tokenizes and executes a single command line.
+
+        Returns:
+            int: One of the STATUS_* codes.
+        """
+        opcode, argument = tokenize(command)
+        return self.execute(opcode, argument, robot, table)
+
+    def execute(self, opcode, argument, robot, table):
+        """
+        Executes an already tokenized command.
+
+        Returns:
+            int: One of the STATUS_* codes.
+        """
+        if opcode == OP_NOP:
+            return STATUS_OK
+        if robot.position is None and opcode not in self.placement_free_opcodes:
+            self.emit(NOT_PLACED_MESSAGE, KIND_IGNORED)
+            return STATUS_IGNORED
+        try:
+            return self.handlers[opcode](argument, robot, table)
+        except Exception as e:
+            self.emit(ERROR_FORMATS[opcode].format(e))
+            return STATUS_ERROR
+
+    def execute_instrumented(self, opcode, argument, robot, table):
+        """
+        Executes an already tokenized command, recording its latency and outcome.
+
+        Returns:
+            int: One of the STATUS_* codes.
+        """
+        if opcode == OP_NOP:
+            return STATUS_OK
+        instrumentation = self.instrumentation
+        clock = instrumentation.clock
+        start = clock()
+        status = CommandDispatcher.execute(self, opcode, argument, robot, table)
+        elapsed = clock() - start
+        stats = instrumentation.by_opcode.get(opcode) or instrumentation.command_stats(opcode)
+        stats.record(elapsed)
+        if status == STATUS_ERROR:
+            stats.errors += 1
+        elif status == STATUS_IGNORED:
+            stats.ignored += 1
+        return status
+
+    def emit(self, message, kind=KIND_ERROR):
+        """Writes a message produced while executing a command to the output sink."""
+        self.output_sink.write(message, kind)
+
+    def place(self, argument, robot, table):
+        """Places the robot, reporting invalid arguments as an error."""
+        error = robot.robot_placer.try_place(argument, robot, table)
+        if error is not None:
+            self.emit(ERROR_FORMATS[OP_PLACE].format(error))
+            return STATUS_ERROR
+        return STATUS_OK
+
+    def move(self, argument, robot, table):
+        """Moves the robot one space forward."""
+        robot.robot_mover.move_one_space(robot, table)
+        return STATUS_OK
+
+    def left(self, argument, robot, table):
+        """Rotates the robot 90 degrees counterclockwise."""
+        robot.robot_rotator.left(robot)
+        return STATUS_OK
+
+    def right(self, argument, robot, table):
+        """Rotates the robot 90 degrees clockwise."""
+        robot.robot_rotator.right(robot)
+        return STATUS_OK
+
+    def report(self, argument, robot, table):
+        """Reports the robot's position and direction."""
+        robot.robot_reporter.report(robot)
+        return STATUS_OK
+
+    def exit(self, argument, robot, table):
+        """Says goodbye and asks the caller to stop processing commands."""
+        self.emit("Goodbye!", KIND_INFO)
+        return STATUS_EXIT
+
+    def stats(self, argument, robot, table):
+        """Reports the statistics recorded so far, one line per command type."""
+        if self.instrumentation is None:
+            self.emit(STATS_DISABLED_MESSAGE, KIND_INFO)
+            return STATUS_OK
+        for line in self.instrumentation.format_lines():
+            self.emit(line, KIND_INFO)
+        return STATUS_OK
+
+    def obstacle(self, argument, robot, table):
+        """Blocks a cell of the table, reporting invalid arguments as an error."""
+        x, y, error = parse_obstacle(argument, table)
+        position = robot.position
+        if error is None and position is not None and position.x == x and position.y == y:
+            error = "Cell is occupied by the robot."
+        elif error is None and table.occupancy is not None and table.occupancy.occupant(x, y) is not None:
+            error = f"Cell is occupied by robot {table.occupancy.occupant(x, y)}."
+        if error is not None:
+            self.emit(ERROR_FORMATS[OP_OBSTACLE].format(f"Invalid OBSTACLE command: {argument}. Error: {error}"))
+            return STATUS_ERROR
+        table.add_obstacle(x, y)
+        return STATUS_OK
+
+    @property
+    def recording(self):
+        """True while the lines of a DEFINE or REPEAT block are being recorded."""
+        return self.blocks is not None and self.blocks.recording
+
+    def block_runner(self):
+        """Returns the BlockRunner, creating it on first use."""
+        if self.blocks is None:
+            from toyrobot.blocks import BlockRunner  # Only files that use blocks need it
+            self.blocks = BlockRunner(self, *(self.block_limits or ()))
+        return self.blocks
+
+    def finish(self):
+        """
+        Ends the input: a DEFINE or REPEAT block left open is reported as an error and dropped.
+
+        Returns:
+            int: STATUS_ERROR if a block was left open, otherwise STATUS_OK.
+        """
+        if self.blocks is None:
+            return STATUS_OK
+        return self.blocks.finish()
+
+    def reset_blocks(self):
+        """Forgets every macro and drops any block being recorded."""
+        if self.blocks is not None:
+            self.blocks.close()
+            self.blocks = None
+
+    def define(self, argument, robot, table):
+        """Starts recording a macro, run later with CALL."""
+        return self.block_runner().define(argument)
+
+    def repeat(self, argument, robot, table):
+        """Starts recording a block that is run a number of times at its END."""
+        return self.block_runner().repeat(argument)
+
+    def end(self, argument, robot, table):
+        """Reports an END with no open block; an END that closes a block is recorded instead."""
+        return self.block_runner().end()
+
+    def call(self, argument, robot, table):
+        """Runs a macro."""
+        return self.block_runner().call(argument, robot, table)
+
+    def path(self, argument, robot, table):
+        """Reports the shortest list of commands that takes the robot to a target X,Y,F."""
+        x, y, facing_angle, error = parse_place(argument, robot.directions, table)
+        if error is None:
+            planner = self.planner
+            if planner is None or planner.table is not table or planner.directions is not robot.directions:
+                from toyrobot.path_planner import PathPlanner  # Only files that plan paths need it
+                planner = self.planner = PathPlanner(table, robot.directions)
+            position = robot.position
+            commands = planner.path_between((position.x, position.y, robot.facing_angle % 360 // 90),
+                                            (x, y, facing_angle % 360 // 90))
+            if commands is not None:
+                self.emit(" ".join(["Path:", *commands]), KIND_REPORT)
+                return STATUS_OK
+            error = UNREACHABLE_MESSAGE
+        self.emit(ERROR_FORMATS[OP_PATH].format(f"Invalid PATH command: {argument}. Error: {error}"))
+        return STATUS_ERROR
+
+    def heatmap(self, argument, robot, table):
+        """Writes the analytics file now, if there is one, and reports a summary of the counts."""
+        analytics = self.analytics
+        if analytics is None:
+            self.emit(ANALYTICS_DISABLED_MESSAGE, KIND_INFO)
+            return STATUS_OK
+        if analytics.path is not None:
+            self.emit(f"HEATMAP: wrote {analytics.export()}", KIND_INFO)
+        self.emit(f"HEATMAP: {analytics.summary()}", KIND_INFO)
+        return STATUS_OK
+
+    def unknown(self, argument, robot, table):
+        """Reports an unrecognised command."""
+        self.emit(ERROR_FORMATS[OP_UNKNOWN].format(argument))
+        return STATUS_ERROR
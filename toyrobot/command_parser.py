@@ -0,0 +1,115 @@
+"""
+Filename: command_parser.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module turns raw command lines into compact (opcode, argument) tokens
+    in a single pass. Tokens for repeated lines are cached, so the common
+    commands (MOVE, LEFT, RIGHT, REPORT) are only ever parsed once.
+"""
+
+# Opcodes for the command set
+OP_NOP = 0
+OP_PLACE = 1
+OP_MOVE = 2
+OP_LEFT = 3
+OP_RIGHT = 4
+OP_REPORT = 5
+OP_EXIT = 6
+OP_UNKNOWN = 7
+OP_STATS = 8
+OP_OBSTACLE = 9
+OP_DEFINE = 10
+OP_REPEAT = 11
+OP_END = 12
+OP_CALL = 13
+OP_PATH = 14
+OP_HEATMAP = 15
+
+# Command keywords mapped to their opcodes
+KEYWORDS = {
+    "PLACE": OP_PLACE,
+    "MOVE": OP_MOVE,
+    "LEFT": OP_LEFT,
+    "RIGHT": OP_RIGHT,
+    "REPORT": OP_REPORT,
+    "EXIT": OP_EXIT,
+    "STATS": OP_STATS,
+    "OBSTACLE": OP_OBSTACLE,
+    "DEFINE": OP_DEFINE,
+    "REPEAT": OP_REPEAT,
+    "END": OP_END,
+    "CALL": OP_CALL,
+    "PATH": OP_PATH,
+    "HEATMAP": OP_HEATMAP,
+}
+
+# Display name for each opcode
+OPCODE_NAMES = {opcode: keyword for keyword, opcode in KEYWORDS.items()}
+OPCODE_NAMES[OP_NOP] = "NOP"
+OPCODE_NAMES[OP_UNKNOWN] = "UNKNOWN"
+
+# Commands whose argument is the first space separated word after the keyword
+ARGUMENT_OPCODES = {OP_PLACE, OP_OBSTACLE, OP_DEFINE, OP_REPEAT, OP_CALL, OP_PATH}
+
+# Commands that open, close or run a DEFINE or REPEAT block (see blocks.py)
+BLOCK_OPCODES = frozenset({OP_DEFINE, OP_REPEAT, OP_END, OP_CALL})
+
+# Maximum number of distinct lines kept in the token cache
+TOKEN_CACHE_SIZE = 4096
+
+_token_cache = {}
+
+
+def tokenize(command):
+    """
+    Converts a command line into an (opcode, argument) token.
+
+    Args:
+        command (str): A raw command line, e.g. "PLACE 1,2,NORTH\\n".
+
+    Returns:
+        tuple: (opcode, argument) where argument is the PLACE or OBSTACLE
+        argument string, the upper-cased word for OP_UNKNOWN, and None otherwise. Blank lines
+        return OP_NOP.
+    """
+    token = _token_cache.get(command)
+    if token is None:
+        token = _tokenize(command)
+        if len(_token_cache) >= TOKEN_CACHE_SIZE:
+            _token_cache.clear()
+        _token_cache[command] = token
+    return token
+
+
+def _tokenize(command):
+    """Tokenizes a command line without consulting the cache."""
+    command = command.strip()
+    if not command:
+        return OP_NOP, None
+
+    first_word, separator, rest = command.partition(' ')
+    first_word = first_word.strip().upper()
+    opcode = KEYWORDS.get(first_word, OP_UNKNOWN)
+
+    if opcode in ARGUMENT_OPCODES:
+        if not separator:
+            return OP_UNKNOWN, first_word  # e.g. a bare "PLACE" with no arguments
+        return opcode, rest.partition(' ')[0]
+    if opcode == OP_UNKNOWN:
+        return opcode, first_word
+    return opcode, None
+
+
+def format_token(opcode, argument):
+    """
+    Returns a command line that tokenizes to the given token, e.g.
+    "PLACE 1,2,NORTH" for (OP_PLACE, "1,2,NORTH").
+    """
+    if opcode == OP_UNKNOWN:
+        return argument  # The upper-cased unknown command word
+    if argument is None:
+        return OPCODE_NAMES[opcode]
+    # An empty argument comes from a second space after the keyword, which must be kept
+    return f"{OPCODE_NAMES[opcode]} {argument}" if argument else f"{OPCODE_NAMES[opcode]}  _"
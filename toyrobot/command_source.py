@@ -0,0 +1,118 @@
+"""
+Filename: command_source.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides streaming command sources. Commands are read lazily
+    in large buffered chunks from a file, a memory-mapped file or a piped
+    stream and yielded one line at a time, so command logs of any size can be
+    replayed in constant memory.
+"""
+import mmap
+import sys
+
+# Size of each chunk read from disk or a pipe
+READ_BUFFER_SIZE = 1 << 20
+
+# Source name that selects standard input
+STDIN_SOURCE = "-"
+
+# First bytes of a binary command file (see binary_format.py)
+BINARY_MAGIC = b"TRBC"
+
+
+def is_binary_command_file(path):
+    """
+    Returns True if the file starts with the binary command file magic.
+
+    This lives here rather than in binary_format so that checking a text
+    file does not import the binary reader.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    except OSError:
+        return False
+
+
+def iter_stream_commands(stream):
+    """
+    Yields commands from an already open text stream (e.g. piped stdin).
+
+    Args:
+        stream: A text stream to read lines from.
+    """
+    yield from stream
+
+
+def iter_file_commands(path, buffer_size=READ_BUFFER_SIZE):
+    """
+    Yields commands from a text file, reading it in large buffered chunks.
+
+    Args:
+        path (str): Path to the command file.
+        buffer_size (int): Size in bytes of each chunk read from disk.
+    """
+    with open(path, 'r', buffering=buffer_size) as f:
+        yield from f
+
+
+def iter_file_range_commands(path, start=0, end=None, buffer_size=READ_BUFFER_SIZE):
+    """
+    Yields the commands in a byte range of a file. Lines end at "\\n" (so
+    "\\r\\n" files work too), as with the memory-mapped source.
+
+    Args:
+        path (str): Path to the command file.
+        start (int): Byte offset of the first command, at the start of a line.
+        end (int): Byte offset to stop at, at the start of a line. Defaults
+            to the end of the file.
+        buffer_size (int): Size in bytes of each chunk read from disk.
+    """
+    with open(path, 'rb', buffering=buffer_size) as f:
+        f.seek(start)
+        if end is None:
+            yield from map(bytes.decode, f)
+            return
+        remaining = end - start
+        for line in f:
+            if remaining <= 0:
+                return
+            remaining -= len(line)
+            yield line.decode()
+
+
+def iter_mmap_commands(path):
+    """
+    Yields commands from a memory-mapped file, leaving paging to the OS.
+
+    Args:
+        path (str): Path to the command file.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty files cannot be mapped and have no commands
+        with mapped:
+            for line in iter(mapped.readline, b""):
+                yield line.decode()
+
+
+def open_command_source(source, use_mmap=False):
+    """
+    Returns a lazy iterator of commands for the given source.
+
+    Args:
+        source (str): A file path, or "-" for standard input.
+        use_mmap (bool): Memory-map the file instead of reading it in chunks.
+
+    Returns:
+        iterator: Yields one command line at a time.
+    """
+    if source == STDIN_SOURCE:
+        return iter_stream_commands(sys.stdin)
+    if use_mmap:
+        return iter_mmap_commands(source)
+    return iter_file_commands(source)
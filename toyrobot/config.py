@@ -0,0 +1,185 @@
+"""
+Filename: config.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module loads config.json and compiles it once into an immutable
+    SimulationConfig: the table bounds, any obstacles, and a DirectionModel
+    with every direction lookup precomputed. Configuration mistakes are rejected here,
+    before any commands run, rather than surfacing part-way through a session.
+
+    A validated configuration is cached in __pycache__ next to the file,
+    keyed by the file's modification time and size, so short-lived runs
+    skip importing json and parsing the file when it has not changed.
+"""
+import marshal
+import os
+
+from toyrobot.direction_model import compile_directions
+
+CONFIG_PATH = "config.json"
+CONFIG_CACHE_VERSION = 2
+DEFAULT_CONFIG = {
+    "table_size": {"width": 5, "length": 5},
+    "directions": {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}
+}
+
+
+def _is_coordinate(value, maximum):
+    """Returns True if value is an integer from 0 to maximum."""
+    return not isinstance(value, bool) and isinstance(value, int) and 0 <= value <= maximum
+
+
+class SimulationConfig:
+    __slots__ = ("width", "length", "max_x", "max_y", "directions", "obstacles")
+
+    def __init__(self, width, length, directions, obstacles=()):
+        """
+        Initialise a validated configuration.
+
+        Args:
+            width (int): Table width (North-South).
+            length (int): Table length (East-West).
+            directions: A DirectionModel, or a dict of direction names to angles.
+            obstacles: Optional iterable of [x, y] cells that are blocked.
+
+        Raises:
+            ValueError: If the table size is not a pair of positive integers,
+                an obstacle is not a cell on the table, or the directions are
+                invalid.
+        """
+        for name, value in (("width", width), ("length", length)):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"Table {name} must be a positive integer, got {value!r}")
+        self.width = width
+        self.length = length
+        self.max_x = length - 1  # Coordinates are 0-indexed
+        self.max_y = width - 1
+        self.directions = compile_directions(directions)
+        self.obstacles = tuple(map(tuple, obstacles))
+        for cell in self.obstacles:
+            if len(cell) != 2 or not (_is_coordinate(cell[0], self.max_x) and _is_coordinate(cell[1], self.max_y)):
+                raise ValueError(f"Obstacle must be an [x, y] cell on the table, got {list(cell)!r}")
+
+    def __getitem__(self, key):
+        """Allows the compiled config to be read like the config.json dictionary."""
+        if key == "table_size":
+            return {"width": self.width, "length": self.length}
+        if key == "directions":
+            return self.directions
+        if key == "obstacles":
+            return [list(cell) for cell in self.obstacles]
+        raise KeyError(key)
+
+    def __reduce__(self):
+        return (SimulationConfig, (self.width, self.length, dict(self.directions), self.obstacles))
+
+
+def compile_config(config):
+    """
+    Compiles a configuration dictionary in the format of config.json.
+
+    Args:
+        config: A dict with "table_size", "directions" and optionally
+            "obstacles", or an already compiled SimulationConfig (returned
+            unchanged).
+
+    Returns:
+        SimulationConfig: The validated configuration.
+
+    Raises:
+        ValueError: If a section is missing or invalid.
+    """
+    if isinstance(config, SimulationConfig):
+        return config
+    try:
+        table_size = config["table_size"]
+        return SimulationConfig(table_size["width"], table_size["length"], config["directions"],
+                                config.get("obstacles", ()))
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Missing or malformed configuration entry: {e}") from None
+
+
+def config_cache_path(path):
+    """Returns the path of the compiled configuration cache for a config file."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, "__pycache__", name + ".cache")
+
+
+def read_config_cache(path, key):
+    """
+    Reads the cached configuration for a config file.
+
+    Args:
+        path (str): Path to the config file.
+        key (tuple): The file's (mtime_ns, size) the cache must match.
+
+    Returns:
+        SimulationConfig: The cached configuration, or None if there is no
+        usable cache for this version of the file.
+    """
+    try:
+        with open(config_cache_path(path), 'rb') as f:
+            version, cached_key, width, length, directions, obstacles = marshal.load(f)
+        if version != CONFIG_CACHE_VERSION or cached_key != key:
+            return None
+        return SimulationConfig(width, length, dict(directions), obstacles)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None  # Missing, stale or unreadable; the file is simply loaded again
+
+
+def write_config_cache(path, key, config):
+    """Caches a validated configuration, ignoring failures (e.g. a read-only directory)."""
+    cache_path = config_cache_path(path)
+    data = marshal.dumps((CONFIG_CACHE_VERSION, key, config.width, config.length, tuple(config.directions.items()),
+                          config.obstacles))
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as f:
+            f.write(data)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_config(path=CONFIG_PATH, use_cache=True):
+    """
+    Loads and compiles the configuration from the config.json file, falling
+    back to the default configuration if the file is missing or unparsable.
+
+    Args:
+        path (str): Path to the config file.
+        use_cache (bool): Reuse the configuration cached for this version of
+            the file, and cache it after loading.
+
+    Raises:
+        ValueError: If the file parses but the configuration is invalid.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        print(f"Error: {path} file not found. Using default configuration.")
+        return compile_config(DEFAULT_CONFIG)
+    key = (stat.st_mtime_ns, stat.st_size)
+    if use_cache:
+        config = read_config_cache(path, key)
+        if config is not None:
+            return config
+
+    import json  # Only needed when the cache is missing or stale
+
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: {path} file not found. Using default configuration.")
+        return compile_config(DEFAULT_CONFIG)
+    except json.JSONDecodeError as e:
+        print(f"Error: Failed to parse {path} - {e}. Using default configuration.")
+        return compile_config(DEFAULT_CONFIG)
+    config = compile_config(config)
+    if use_cache:
+        write_config_cache(path, key, config)
+    return config
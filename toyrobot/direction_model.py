@@ -0,0 +1,129 @@
+"""
+Filename: direction_model.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module compiles the "directions" configuration into an immutable
+    DirectionModel. The model validates the configuration once and precomputes
+    every lookup the robot components need: direction name to angle, angle to
+    direction name, name to heading index and the unit-step delta for each
+    heading. It behaves like the original read-only directions dictionary.
+"""
+from collections.abc import Mapping
+
+# Unit-step deltas (dx, dy) indexed by heading, where heading = (angle % 360) // 90
+HEADING_STEPS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+HEADING_ANGLES = (0, 90, 180, 270)
+
+_compiled = {}
+
+
+def normalize_name(name):
+    """Normalises a direction name for lookup, e.g. " north" -> "NORTH"."""
+    return name.strip().upper()
+
+
+def compile_directions(directions):
+    """
+    Returns the DirectionModel for a directions mapping, compiling each
+    distinct configuration only once.
+
+    Args:
+        directions: A DirectionModel, or a dict of direction names to angles.
+
+    Raises:
+        ValueError: If the directions are invalid.
+    """
+    if isinstance(directions, DirectionModel):
+        return directions
+    key = tuple(directions.items())
+    model = _compiled.get(key)
+    if model is None:
+        model = _compiled[key] = DirectionModel(directions)
+    return model
+
+
+class DirectionModel(Mapping):
+    __slots__ = ("_angles", "_angle_by_key", "_name_by_angle", "_heading_by_key", "steps_by_angle")
+
+    def __init__(self, directions):
+        """
+        Compiles and validates a directions configuration.
+
+        Args:
+            directions (dict): Mapping of direction names to angles in degrees,
+                e.g. {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180}.
+
+        Raises:
+            ValueError: If there are no directions, a name is repeated (ignoring
+                case), an angle is not a number, an angle is not a multiple of
+                90 degrees, or two directions share the same angle.
+        """
+        if not directions:
+            raise ValueError("At least one direction must be configured.")
+
+        angles = {}
+        angle_by_key = {}
+        name_by_angle = {}
+        heading_by_key = {}
+        for name, angle in directions.items():
+            if isinstance(angle, bool) or not isinstance(angle, (int, float)):
+                raise ValueError(f"Direction {name} has a non-numeric angle: {angle!r}")
+            if angle % 90 != 0:
+                raise ValueError(f"Direction {name} has angle {angle}; angles must be multiples of 90 degrees")
+            normalized_angle = int(angle) % 360
+            if normalized_angle in name_by_angle:
+                raise ValueError(f"Directions {name_by_angle[normalized_angle]} and {name} "
+                                 f"have the same angle ({normalized_angle} degrees)")
+            key = normalize_name(name)
+            if key in angle_by_key:
+                raise ValueError(f"Direction {name} is configured more than once")
+
+            angles[name] = angle
+            angle_by_key[key] = angle
+            name_by_angle[normalized_angle] = name
+            heading_by_key[key] = normalized_angle // 90
+
+        steps_by_angle = {angle: HEADING_STEPS[index] for index, angle in enumerate(HEADING_ANGLES)}
+        for angle in angles.values():
+            steps_by_angle[angle] = HEADING_STEPS[int(angle) % 360 // 90]
+
+        self._angles = angles
+        self._angle_by_key = angle_by_key
+        self._name_by_angle = name_by_angle
+        self._heading_by_key = heading_by_key
+        self.steps_by_angle = steps_by_angle
+
+    def __getitem__(self, name):
+        return self._angles[name]
+
+    def __iter__(self):
+        return iter(self._angles)
+
+    def __len__(self):
+        return len(self._angles)
+
+    def __repr__(self):
+        return f"DirectionModel({self._angles!r})"
+
+    def __reduce__(self):
+        return (DirectionModel, (dict(self._angles),))
+
+    def angle_for(self, name):
+        """
+        Returns the configured angle for a direction name, ignoring case and
+        surrounding whitespace, or None if there is no such direction.
+        """
+        return self._angle_by_key.get(normalize_name(name))
+
+    def heading_for(self, name):
+        """Returns the heading index (0=East, 1=North, 2=West, 3=South) for a direction name, or None."""
+        return self._heading_by_key.get(normalize_name(name))
+
+    def name_for(self, angle):
+        """
+        Returns the direction name for an angle in degrees (any multiple of
+        360 apart counts as the same angle), or None if no direction has it.
+        """
+        return self._name_by_angle.get(angle % 360)
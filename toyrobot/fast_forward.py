@@ -0,0 +1,99 @@
+"""
+Filename: fast_forward.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module implements an execution mode that folds runs of repeated
+    commands into a single closed-form update. A run of k MOVEs becomes one
+    clamped k-space move and a run of LEFT/RIGHT turns becomes one net
+    rotation, while the output stays identical to executing every command.
+    MOVE runs on a table with obstacles are executed one by one, and commands
+    inside a DEFINE or REPEAT block are recorded one by one, unfolded.
+"""
+
+from toyrobot.command_dispatcher import NOT_PLACED_MESSAGE, STATUS_OK, STATUS_EXIT
+from toyrobot.command_parser import tokenize, OP_NOP, OP_MOVE, OP_LEFT, OP_RIGHT
+from toyrobot.movement_engine import unit_step
+from toyrobot.output_sink import KIND_IGNORED
+
+# Net rotation in degrees for each turning opcode
+TURN_ANGLES = {OP_LEFT: 90, OP_RIGHT: -90}
+
+class FastForwardRunner:
+    def __init__(self, dispatcher):
+        """
+        Initialise the runner with the dispatcher used for all other commands.
+
+        Attributes:
+            folded (int): Number of commands absorbed into an earlier command
+                of the same run, i.e. commands that were not executed one by one.
+        """
+        self.dispatcher = dispatcher
+        self.folded = 0
+
+    def run(self, commands, robot, table):
+        """
+        Runs an iterable of command lines, folding runs of MOVE and turn commands.
+
+        Returns:
+            int: STATUS_EXIT if an EXIT command stopped the run, otherwise STATUS_OK.
+        """
+        return self.run_tokens(map(tokenize, commands), robot, table)
+
+    def run_tokens(self, tokens, robot, table):
+        """
+        Runs an iterable of (opcode, argument) tokens, as returned by
+        command_parser.tokenize, folding runs of MOVE and turn commands.
+
+        Returns:
+            int: STATUS_EXIT if an EXIT command stopped the run, otherwise STATUS_OK.
+        """
+        dispatcher = self.dispatcher
+        execute = dispatcher.execute
+        recording = dispatcher.recording  # Only a command that is executed can start or end a block
+        run_opcode = None  # OP_MOVE or OP_LEFT (for any turn) while a run is pending
+        run_length = 0
+        net_turn = 0
+
+        for opcode, argument in tokens:
+            if opcode == OP_NOP:
+                continue
+            if (opcode == OP_MOVE or opcode in TURN_ANGLES) and not recording:
+                kind = OP_MOVE if opcode == OP_MOVE else OP_LEFT
+                if kind != run_opcode:
+                    self._apply(run_opcode, run_length, net_turn, robot, table)
+                    run_opcode, run_length, net_turn = kind, 0, 0
+                run_length += 1
+                net_turn += TURN_ANGLES.get(opcode, 0)
+                continue
+
+            self._apply(run_opcode, run_length, net_turn, robot, table)
+            run_opcode, run_length, net_turn = None, 0, 0
+            if execute(opcode, argument, robot, table) == STATUS_EXIT:
+                return STATUS_EXIT
+            recording = dispatcher.recording
+
+        self._apply(run_opcode, run_length, net_turn, robot, table)
+        dispatcher.finish()
+        return STATUS_OK
+
+    def _apply(self, run_opcode, run_length, net_turn, robot, table):
+        """Applies a pending run of MOVE or turn commands as a single update."""
+        if not run_length:
+            return
+        if robot.position is None:
+            for _ in range(run_length):
+                self.dispatcher.emit(NOT_PLACED_MESSAGE, KIND_IGNORED)
+            return
+
+        if run_opcode == OP_LEFT:
+            robot.robot_rotator.rotate(robot, net_turn)
+        elif table.obstacles is None and unit_step(robot.facing_angle) is not None:
+            # Clamping is monotonic along a grid axis, so k single moves equal one k-space move
+            robot.robot_mover.move(run_length, robot, table)
+        else:
+            for _ in range(run_length):
+                robot.robot_mover.move_one_space(robot, table)
+            return
+        self.folded += run_length - 1
@@ -0,0 +1,217 @@
+"""
+Filename: fleet.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module implements a vectorised fleet engine that simulates many
+    independent robots at once. The positions and facing angles of all robots
+    are kept in NumPy arrays, one array per field, and each command step is
+    applied to every robot with array operations. Each robot's output matches
+    what the scalar Robot and CommandDispatcher would produce for it.
+
+    Obstacles on the fleet's Table block every robot. As that table is
+    shared, OBSTACLE commands are reported as errors instead of being applied.
+    Every robot steps through its commands in lockstep, so DEFINE, REPEAT,
+    END and CALL are reported as errors too. PATH is planned for each robot
+    that runs it, with one PathPlanner shared by the fleet.
+"""
+import numpy as np
+
+from toyrobot.command_dispatcher import (
+    NOT_PLACED_MESSAGE, STATS_DISABLED_MESSAGE, ANALYTICS_DISABLED_MESSAGE, UNREACHABLE_MESSAGE, ERROR_FORMATS
+)
+from toyrobot.command_parser import (
+    tokenize, OP_NOP, OP_PLACE, OP_MOVE, OP_LEFT, OP_RIGHT, OP_REPORT, OP_EXIT, OP_UNKNOWN, OP_STATS,
+    OP_OBSTACLE, OP_DEFINE, OP_CALL, OP_PATH, OP_HEATMAP, OPCODE_NAMES
+)
+from toyrobot.direction_model import compile_directions, HEADING_ANGLES
+from toyrobot.robot_placer import parse_place
+
+# Largest table side the int64 state arrays can hold, including one step past the edge
+MAX_TABLE_SIDE = int(np.iinfo(np.int64).max)
+
+# Why an OBSTACLE command is rejected, as every robot in a fleet shares one table
+SHARED_TABLE_ERROR = "Obstacles must be set on the fleet's shared Table."
+MACROS_UNSUPPORTED_ERROR = "DEFINE, REPEAT, END and CALL are not supported by the fleet."
+
+class Fleet:
+    def __init__(self, size, table, directions):
+        """
+        Initialise a fleet of robots that are not yet placed on the table.
+
+        Args:
+            size (int): Number of robots in the fleet.
+            table (Table): The table shared by every robot.
+            directions: A DirectionModel, or a dict of direction names to
+                angles. Angles must be whole multiples of 90 degrees.
+
+        Raises:
+            ValueError: If the directions are invalid, or the table is too
+                large for 64-bit coordinates.
+        """
+        if max(table.width, table.length) > MAX_TABLE_SIDE:
+            raise ValueError(f"Fleet tables can be at most {MAX_TABLE_SIDE} units per side")
+        self.size = size
+        self.table = table
+        self.directions = compile_directions(directions)
+
+        # Robot state, one array per field
+        self.x = np.zeros(size, dtype=np.int64)
+        self.y = np.zeros(size, dtype=np.int64)
+        self.facing_angle = np.zeros(size, dtype=np.int64)
+        self.placed = np.zeros(size, dtype=bool)
+        self.active = np.ones(size, dtype=bool)  # False once a robot has processed EXIT
+        self.outputs = [[] for _ in range(size)]
+
+        # Unit-step deltas and direction names indexed by normalised angle
+        self._step_x = np.zeros(360, dtype=np.int64)
+        self._step_y = np.zeros(360, dtype=np.int64)
+        self._names = [None] * 360
+        for angle in HEADING_ANGLES:
+            self._step_x[angle], self._step_y[angle] = self.directions.steps_by_angle[angle]
+            self._names[angle] = self.directions.name_for(angle)
+        self._place_cache = {}
+        self._planner = None  # The PathPlanner, created by the first PATH command
+
+    def execute(self, command):
+        """
+        Executes the same command line on every robot in the fleet.
+        """
+        opcode, argument = tokenize(command)
+        self._step(np.full(self.size, opcode, dtype=np.int8), [argument] * self.size)
+
+    def run(self, command_columns):
+        """
+        Runs each robot through its own list of command lines.
+
+        Args:
+            command_columns (list): One list of command lines per robot.
+                Shorter lists are padded with no-ops.
+
+        Returns:
+            list: The output lines produced by each robot.
+        """
+        if len(command_columns) != self.size:
+            raise ValueError(f"Expected {self.size} command columns, got {len(command_columns)}")
+
+        steps = max((len(column) for column in command_columns), default=0)
+        # Index every distinct command line, then tokenize each one once; index 0 is the no-op padding
+        indexes = {}
+        codes = np.zeros((steps, self.size), dtype=np.intp)
+        for robot_index, column in enumerate(command_columns):
+            codes[:len(column), robot_index] = [indexes.setdefault(command, len(indexes) + 1) for command in column]
+        tokens = [(OP_NOP, None)] + [tokenize(command) for command in indexes]
+        token_opcodes = np.array([opcode for opcode, _ in tokens], dtype=np.int8)
+        token_arguments = np.empty(len(tokens), dtype=object)
+        token_arguments[:] = [argument for _, argument in tokens]
+        opcodes = token_opcodes[codes]
+        arguments = token_arguments[codes]
+
+        for step in range(steps):
+            self._step(opcodes[step], arguments[step])
+        return self.outputs
+
+    def states(self):
+        """
+        Returns each robot's state as (x, y, facing_angle), or None if not placed.
+        """
+        return [
+            (int(x), int(y), int(angle)) if placed else None
+            for x, y, angle, placed in zip(self.x, self.y, self.facing_angle, self.placed)
+        ]
+
+    def _step(self, opcodes, arguments):
+        """Applies one command per robot to the whole fleet."""
+        opcodes = np.where(self.active, opcodes, OP_NOP)
+        outputs = self.outputs
+
+        # Everything except PLACE, STATS, OBSTACLE, HEATMAP and the block commands (numbered OP_DEFINE to
+        # OP_CALL) is ignored until a robot has been placed
+        ignored = (~self.placed & (opcodes != OP_NOP) & (opcodes != OP_PLACE) & (opcodes != OP_STATS)
+                   & (opcodes != OP_OBSTACLE) & (opcodes != OP_HEATMAP) & ((opcodes < OP_DEFINE) | (opcodes > OP_CALL)))
+        for index in np.flatnonzero(ignored):
+            outputs[index].append(NOT_PLACED_MESSAGE)
+        opcodes = np.where(ignored, OP_NOP, opcodes)
+
+        for index in np.flatnonzero(opcodes == OP_PLACE):
+            self._place(index, arguments[index])
+
+        moving = np.flatnonzero(opcodes == OP_MOVE)
+        if len(moving):
+            angles = self.facing_angle[moving] % 360
+            x = np.clip(self.x[moving] + self._step_x[angles], 0, self.table.length - 1)
+            y = np.clip(self.y[moving] + self._step_y[angles], 0, self.table.width - 1)
+            if self.table.obstacles is not None:
+                free = ~self.table.obstacles.blocked_mask(x, y)  # Moves onto an obstacle are ignored
+                moving, x, y = moving[free], x[free], y[free]
+            self.x[moving] = x
+            self.y[moving] = y
+
+        self.facing_angle = np.where(opcodes == OP_LEFT, (self.facing_angle + 90) % 360, self.facing_angle)
+        self.facing_angle = np.where(opcodes == OP_RIGHT, (self.facing_angle - 90) % 360, self.facing_angle)
+
+        for index in np.flatnonzero(opcodes == OP_REPORT):
+            name = self._names[int(self.facing_angle[index]) % 360]
+            outputs[index].append(f"{self.x[index]},{self.y[index]},{name}")
+
+        for index in np.flatnonzero(opcodes == OP_UNKNOWN):
+            outputs[index].append(ERROR_FORMATS[OP_UNKNOWN].format(arguments[index]))
+
+        for index in np.flatnonzero(opcodes == OP_OBSTACLE):
+            message = f"Invalid OBSTACLE command: {arguments[index]}. Error: {SHARED_TABLE_ERROR}"
+            outputs[index].append(ERROR_FORMATS[OP_OBSTACLE].format(message))
+
+        for index in np.flatnonzero((opcodes >= OP_DEFINE) & (opcodes <= OP_CALL)):
+            opcode = int(opcodes[index])
+            argument = "" if arguments[index] is None else f": {arguments[index]}"
+            message = f"Invalid {OPCODE_NAMES[opcode]} command{argument}. Error: {MACROS_UNSUPPORTED_ERROR}"
+            outputs[index].append(ERROR_FORMATS[opcode].format(message))
+
+        for index in np.flatnonzero(opcodes == OP_PATH):
+            self._path(index, arguments[index])
+
+        for index in np.flatnonzero(opcodes == OP_STATS):
+            outputs[index].append(STATS_DISABLED_MESSAGE)  # Fleets are not instrumented
+
+        for index in np.flatnonzero(opcodes == OP_HEATMAP):
+            outputs[index].append(ANALYTICS_DISABLED_MESSAGE)  # Nor are their visits counted
+
+        exiting = opcodes == OP_EXIT
+        for index in np.flatnonzero(exiting):
+            outputs[index].append("Goodbye!")
+        self.active &= ~exiting
+
+    def _path(self, index, argument):
+        """Reports the shortest list of commands that takes a single robot to a target X,Y,F."""
+        x_coord, y_coord, facing_angle, error = parse_place(argument, self.directions, self.table)
+        if error is None and self._planner is None:
+            from toyrobot.path_planner import PathPlanner
+            try:
+                self._planner = PathPlanner(self.table, self.directions)
+            except ValueError as e:
+                error = str(e)  # The table is too large to plan on
+        if error is None:
+            start = (int(self.x[index]), int(self.y[index]), int(self.facing_angle[index]) % 360 // 90)
+            commands = self._planner.path_between(start, (x_coord, y_coord, facing_angle % 360 // 90))
+            if commands is not None:
+                self.outputs[index].append(" ".join(["Path:", *commands]))
+                return
+            error = UNREACHABLE_MESSAGE
+        message = f"Invalid PATH command: {argument}. Error: {error}"
+        self.outputs[index].append(ERROR_FORMATS[OP_PATH].format(message))
+
+    def _place(self, index, argument):
+        """Places a single robot, caching the parsed arguments."""
+        placement = self._place_cache.get(argument)
+        if placement is None:
+            placement = self._place_cache[argument] = parse_place(argument, self.directions, self.table)
+        x_coord, y_coord, facing_angle, error = placement
+        if error is not None:
+            message = f"Invalid PLACE command: {argument}. Error: {error}"
+            self.outputs[index].append(ERROR_FORMATS[OP_PLACE].format(message))
+            return
+        self.x[index] = x_coord
+        self.y[index] = y_coord
+        self.facing_angle[index] = facing_angle
+        self.placed[index] = True
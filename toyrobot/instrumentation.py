@@ -0,0 +1,190 @@
+"""
+Filename: instrumentation.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides optional per-command instrumentation. When enabled,
+    the dispatcher times every command and the robot's placer, mover, rotator
+    and reporter time each call they handle, recording counts, errors and a
+    latency histogram per command type. Histogram buckets are powers of two
+    nanoseconds, so recording a sample is one bit_length() and an increment.
+    Nothing is wrapped or timed unless an Instrumentation is supplied.
+"""
+import time
+
+from toyrobot.command_parser import OPCODE_NAMES
+
+# Latency histogram buckets: bucket n counts samples below 2**n nanoseconds
+HISTOGRAM_BUCKETS = 64
+
+# Percentiles included in snapshots and STATS output
+PERCENTILES = (50, 90, 99)
+
+# Robot component methods timed by instrument_robot
+COMPONENT_METHODS = (
+    ("robot_placer", "try_place"),
+    ("robot_mover", "move_one_space"),
+    ("robot_rotator", "left"),
+    ("robot_rotator", "right"),
+    ("robot_reporter", "report"),
+)
+
+
+class CommandStats:
+    __slots__ = ("count", "errors", "ignored", "total_ns", "max_ns", "histogram")
+
+    def __init__(self):
+        """Initialise empty counters and latency histogram for one command type."""
+        self.count = 0
+        self.errors = 0
+        self.ignored = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def record(self, elapsed_ns):
+        """Records one timed call."""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.histogram[elapsed_ns.bit_length()] += 1
+
+    def percentile(self, percent):
+        """
+        Returns an upper bound, in nanoseconds, on the given latency percentile.
+
+        The bound is the top of the histogram bucket the percentile falls in,
+        capped at the slowest sample recorded.
+        """
+        if not self.count:
+            return 0
+        target = self.count * percent / 100
+        seen = 0
+        for bucket, samples in enumerate(self.histogram):
+            seen += samples
+            if seen >= target:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self):
+        """Returns the statistics as a JSON-serializable dictionary."""
+        stats = {
+            "count": self.count,
+            "errors": self.errors,
+            "ignored": self.ignored,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns // self.count if self.count else 0,
+            "max_ns": self.max_ns,
+        }
+        for percent in PERCENTILES:
+            stats[f"p{percent}_ns"] = self.percentile(percent)
+        # Non-empty buckets only, keyed by the bucket's upper bound in nanoseconds
+        stats["histogram"] = {str(1 << bucket): samples for bucket, samples in enumerate(self.histogram) if samples}
+        return stats
+
+
+def format_duration(nanoseconds):
+    """Formats a duration in nanoseconds with a readable unit."""
+    if nanoseconds < 1_000:
+        return f"{nanoseconds}ns"
+    if nanoseconds < 1_000_000:
+        return f"{nanoseconds / 1_000:.1f}us"
+    return f"{nanoseconds / 1_000_000:.1f}ms"
+
+
+class Instrumentation:
+    def __init__(self, clock=time.perf_counter_ns):
+        """
+        Initialise empty statistics.
+
+        Args:
+            clock: Callable returning the current time in integer nanoseconds.
+        """
+        self.clock = clock
+        self.commands = {}
+        self.components = {}
+        self.by_opcode = {}  # The same CommandStats as in commands, keyed by opcode
+
+    def command_stats(self, opcode):
+        """Returns the statistics for a command opcode, creating them on first use."""
+        stats = self.by_opcode.get(opcode)
+        if stats is None:
+            name = OPCODE_NAMES.get(opcode, "UNKNOWN")
+            stats = self.commands.get(name)
+            if stats is None:
+                stats = self.commands[name] = CommandStats()
+            self.by_opcode[opcode] = stats
+        return stats
+
+    def component_stats(self, name):
+        """Returns the statistics for a component method, creating them on first use."""
+        stats = self.components.get(name)
+        if stats is None:
+            stats = self.components[name] = CommandStats()
+        return stats
+
+    def instrument_robot(self, robot):
+        """
+        Times the robot's component methods that commands are handled by.
+
+        Each method in COMPONENT_METHODS is replaced, on that component instance
+        only, by a wrapper that records its latency and any exception it raises
+        under "ClassName.method".
+        """
+        for component_name, method_name in COMPONENT_METHODS:
+            component = getattr(robot, component_name)
+            method = getattr(component, method_name)
+            name = f"{type(component).__name__}.{method_name}"
+            setattr(component, method_name, self._timed(method, self.component_stats(name)))
+
+    def _timed(self, method, stats):
+        """Wraps a method so each call is recorded in stats."""
+        clock = self.clock
+
+        record = stats.record
+
+        def timed(*args):
+            start = clock()
+            try:
+                result = method(*args)
+            except Exception:
+                stats.errors += 1
+                record(clock() - start)
+                raise
+            record(clock() - start)
+            return result
+        return timed
+
+    def snapshot(self):
+        """
+        Returns all statistics recorded so far.
+
+        Returns:
+            dict: {"commands": {name: stats}, "components": {name: stats}}, where
+            each stats dictionary is as returned by CommandStats.to_dict.
+        """
+        return {
+            "commands": {name: stats.to_dict() for name, stats in sorted(self.commands.items())},
+            "components": {name: stats.to_dict() for name, stats in sorted(self.components.items())},
+        }
+
+    def reset(self):
+        """Clears every counter and histogram."""
+        # Reset in place, as the component wrappers hold on to their stats
+        for stats in (*self.commands.values(), *self.components.values()):
+            stats.__init__()
+
+    def format_lines(self):
+        """Returns one line of STATS output per command type seen so far."""
+        if not self.commands:
+            return ["STATS: no commands recorded."]
+        lines = []
+        for name, stats in sorted(self.commands.items()):
+            mean = stats.total_ns // stats.count if stats.count else 0
+            percentiles = " ".join(f"p{percent}={format_duration(stats.percentile(percent))}"
+                                   for percent in PERCENTILES)
+            lines.append(f"STATS {name}: count={stats.count} errors={stats.errors} ignored={stats.ignored} "
+                         f"mean={format_duration(mean)} {percentiles} max={format_duration(stats.max_ns)}")
+        return lines
@@ -0,0 +1,156 @@
+"""
+Filename: movement_engine.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides the pluggable movement engines used by RobotMover.
+    The ComplexMovementEngine is the reference implementation built on the
+    Position class's polar (complex number) arithmetic. The LookupMovementEngine
+    produces identical results using exact integers and a table of unit-step
+    deltas, clamping to the table bounds and updating the robot's Position in
+    place without allocating any objects. On a table with obstacles both engines
+    stop the robot on the last free cell before the first blocked one, so a
+    k-space move matches k single moves.
+"""
+import cmath
+import math
+from itertools import chain
+
+# How close a unit-step component must be to a whole number to be treated as exact
+STEP_TOLERANCE = 1e-9
+
+
+def unit_step(angle_degrees):
+    """
+    Computes the integer unit-step delta for a facing angle.
+
+    Args:
+        angle_degrees (float): Direction angle in degrees (0=East, 90=North, etc.).
+
+    Returns:
+        tuple: (dx, dy) if a one unit move in this direction lands exactly on a
+        grid cell (any multiple of 90 degrees), otherwise None.
+    """
+    step = cmath.rect(1, math.radians(angle_degrees))
+    dx = round(step.real)
+    dy = round(step.imag)
+    if abs(step.real - dx) > STEP_TOLERANCE or abs(step.imag - dy) > STEP_TOLERANCE:
+        return None
+    return dx, dy
+
+
+def last_free_cell(x, y, target_x, target_y, obstacles):
+    """
+    Walks along a grid axis from (x, y) towards (target_x, target_y).
+
+    Returns:
+        tuple: The last (x, y) reached before the first blocked cell, or the
+        target if nothing is in the way.
+    """
+    dx = (target_x > x) - (target_x < x)
+    dy = (target_y > y) - (target_y < y)
+    for _ in range(abs(target_x - x) + abs(target_y - y)):
+        if obstacles.blocked(x + dx, y + dy):
+            break
+        x += dx
+        y += dy
+    return x, y
+
+
+class ComplexMovementEngine:
+    def move(self, robot, table, distance):
+        """
+        Moves the robot using Position's complex number arithmetic. On a table
+        with obstacles the robot walks one unit at a time, forwards or
+        backwards, then the remaining fraction of the distance, and stops
+        before the first blocked cell.
+        """
+        position = robot.position
+        obstacles = table.obstacles
+        if obstacles is None:
+            # Calculate the new position based on the robot's current position and facing angle, and
+            # constrain it to the table dimensions (0-indexed, so max is length-1 or width-1)
+            robot.position = position.move_in_direction(distance, robot.facing_angle).constrain_to_bounds(
+                0, table.length-1, 0, table.width-1)
+            return
+
+        # Whole units in the direction of the move (backwards for a negative distance), then the full distance
+        sign = -1 if distance < 0 else 1
+        new_position = position
+        for step in chain(range(sign, sign * math.ceil(abs(distance)), sign), (distance,)):
+            candidate = position.move_in_direction(step, robot.facing_angle).constrain_to_bounds(
+                0, table.length-1, 0, table.width-1)
+            if obstacles.blocked(candidate.x, candidate.y):
+                break
+            new_position = candidate
+        robot.position = new_position
+
+
+class LookupMovementEngine:
+    def __init__(self, directions=None):
+        """
+        Initialise the engine with a table of unit-step deltas.
+
+        Args:
+            directions (dict): Optional mapping of direction names to angles.
+                Deltas for these angles are precomputed; any other angle is
+                looked up once on first use.
+        """
+        self._steps = {}
+        self._fallback = ComplexMovementEngine()
+        for angle in (directions or {}).values():
+            self._steps[angle] = unit_step(angle)
+
+    def step_for(self, angle_degrees):
+        """
+        Returns the cached (dx, dy) unit step for an angle, or None when the
+        angle has no exact integer step.
+        """
+        try:
+            return self._steps[angle_degrees]
+        except KeyError:
+            step = self._steps[angle_degrees] = unit_step(angle_degrees)
+            return step
+
+    def move(self, robot, table, distance):
+        """
+        Moves the robot using integer arithmetic on the precomputed deltas,
+        taken from the robot's DirectionModel for configured headings.
+
+        Angles without an exact integer step, and non-integer distances, are
+        delegated to the ComplexMovementEngine so results stay identical.
+
+        On a table with obstacles the robot stops in front of the first
+        blocked cell on its way, so a k-space move matches k single moves.
+        """
+        step = robot.directions.steps_by_angle.get(robot.facing_angle) or self.step_for(robot.facing_angle)
+        if step is None or type(distance) is not int:
+            self._fallback.move(robot, table, distance)
+            return
+
+        position = robot.position
+        x = position.x + step[0] * distance
+        y = position.y + step[1] * distance
+
+        # Clamp to the table dimensions (0-indexed, so max is length-1 or width-1)
+        max_x = table.max_x
+        max_y = table.max_y
+        if x < 0:
+            x = 0
+        elif x > max_x:
+            x = max_x
+        if y < 0:
+            y = 0
+        elif y > max_y:
+            y = max_y
+
+        obstacles = table.obstacles
+        if obstacles is not None:
+            if distance == 1:
+                if obstacles.blocked(x, y):
+                    return
+            else:
+                x, y = last_free_cell(position.x, position.y, x, y, obstacles)
+        position.x = x
+        position.y = y
@@ -0,0 +1,131 @@
+"""
+Filename: obstacle_map.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides the spatial indexes that record which cells of the
+    table are blocked. Each cell is keyed by its row-major index y * length + x,
+    so checking a cell is one multiply-add and one lookup whatever the number
+    of obstacles. Small tables use a dense bytearray with one byte per cell;
+    tables with more cells than DENSE_CELL_LIMIT use a sparse set holding
+    only the blocked cells.
+"""
+
+from toyrobot.robot_placer import parse_coordinate
+
+# Largest table, in cells, that gets a dense occupancy grid (one byte per cell)
+DENSE_CELL_LIMIT = 1 << 24
+
+
+class DenseObstacleMap:
+    __slots__ = ("length", "cells", "count")
+
+    def __init__(self, width, length):
+        """
+        Initialise an empty occupancy grid covering the whole table.
+
+        Args:
+            width (int): Table width (North-South).
+            length (int): Table length (East-West).
+        """
+        self.length = length
+        self.cells = bytearray(width * length)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Yields the blocked cells as (x, y) in row-major order."""
+        cells = self.cells
+        index = cells.find(1)
+        while index != -1:
+            yield index % self.length, index // self.length
+            index = cells.find(1, index + 1)
+
+    def add(self, x, y):
+        """Blocks a cell. Blocking a cell twice has no further effect."""
+        index = y * self.length + x
+        if not self.cells[index]:
+            self.cells[index] = 1
+            self.count += 1
+
+    def blocked(self, x, y):
+        """Returns True if the cell at (x, y) is blocked."""
+        return self.cells[y * self.length + x] == 1
+
+    def blocked_mask(self, xs, ys):
+        """Returns a NumPy boolean mask of which of the cells (xs[i], ys[i]) are blocked."""
+        import numpy as np  # Only the vectorised Fleet engine needs masks
+        return np.frombuffer(self.cells, dtype=np.uint8)[ys * self.length + xs].astype(bool)
+
+
+class SparseObstacleMap:
+    __slots__ = ("length", "cells")
+
+    def __init__(self, width, length):
+        """
+        Initialise an empty set of blocked cells.
+
+        Args:
+            width (int): Table width (North-South). Unused, but accepted so
+                both maps are created the same way.
+            length (int): Table length (East-West).
+        """
+        self.length = length
+        self.cells = set()
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        """Yields the blocked cells as (x, y) in row-major order."""
+        for index in sorted(self.cells):
+            yield index % self.length, index // self.length
+
+    def add(self, x, y):
+        """Blocks a cell. Blocking a cell twice has no further effect."""
+        self.cells.add(y * self.length + x)
+
+    def blocked(self, x, y):
+        """Returns True if the cell at (x, y) is blocked."""
+        return y * self.length + x in self.cells
+
+    def blocked_mask(self, xs, ys):
+        """Returns a NumPy boolean mask of which of the cells (xs[i], ys[i]) are blocked."""
+        import numpy as np  # Only the vectorised Fleet engine needs masks
+        # Row-major indexes of a large table can overflow int64, so look each one up exactly
+        cells, length = self.cells, self.length
+        return np.fromiter((int(y) * length + int(x) in cells for x, y in zip(xs, ys)), dtype=bool, count=len(xs))
+
+
+def make_obstacle_map(width, length):
+    """Returns an empty obstacle map suited to the size of the table."""
+    if width * length <= DENSE_CELL_LIMIT:
+        return DenseObstacleMap(width, length)
+    return SparseObstacleMap(width, length)
+
+
+def parse_obstacle(string, table):
+    """
+    Parses and validates the argument of an OBSTACLE command.
+
+    Args:
+        string (str): The OBSTACLE argument, e.g. "1,2".
+        table (Table): The table the obstacle is being added to.
+
+    Returns:
+        tuple: (x, y, error) where error is None for a valid cell, otherwise
+        a description of why the argument is invalid.
+    """
+    parts = string.split(',')
+    if len(parts) != 2:
+        return None, None, "expected X,Y"
+    x_coord = parse_coordinate(parts[0])
+    y_coord = parse_coordinate(parts[1])
+    if x_coord is None or y_coord is None:
+        return None, None, f"invalid coordinate {parts[0] if x_coord is None else parts[1]!r}"
+    if not (0 <= x_coord <= table.max_x and 0 <= y_coord <= table.max_y):
+        return None, None, "Obstacle out of table bounds."
+    return x_coord, y_coord, None
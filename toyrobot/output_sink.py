@@ -0,0 +1,181 @@
+"""
+Filename: output_sink.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides the output sinks that the reporter and the command
+    dispatcher write through. Every message is tagged with a kind (report,
+    error, ignored or info) so sinks can format or collect them as needed.
+    Sinks can buffer output, collect it in memory, write JSON lines, or hand
+    it to a background writer thread so the simulation never blocks on I/O.
+    The json, queue and threading modules are only imported by the sinks
+    that need them, keeping plain-text startup cheap.
+"""
+import sys
+
+# Kinds of messages written to a sink
+KIND_REPORT = "report"
+KIND_ERROR = "error"
+KIND_IGNORED = "ignored"
+KIND_INFO = "info"
+
+# Number of lines buffered before a batch-mode sink writes them out
+DEFAULT_FLUSH_EVERY = 256
+
+
+class OutputSink:
+    """Base class for output sinks."""
+
+    def write(self, message, kind=KIND_REPORT):
+        """
+        Writes a single message.
+
+        Args:
+            message (str): The message text, without a trailing newline.
+            kind (str): One of the KIND_* constants.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Writes out any buffered messages."""
+
+    def close(self):
+        """Flushes the sink and releases any resources it holds."""
+        self.flush()
+
+
+class StdoutSink(OutputSink):
+    def __init__(self, stream=None, flush_every=1):
+        """
+        Initialise a sink that writes text lines to a stream.
+
+        Args:
+            stream: The text stream to write to. Defaults to whatever
+                sys.stdout is at the time of writing.
+            flush_every (int): Number of lines to buffer before writing them
+                out and flushing the stream. 1 writes each line straight
+                through, like print().
+        """
+        self.stream = stream
+        self.flush_every = flush_every
+        self._buffer = []
+
+    def format(self, message, kind):
+        """Formats a message as a line of output."""
+        return message
+
+    def write(self, message, kind=KIND_REPORT):
+        if self.flush_every <= 1:
+            (self.stream or sys.stdout).write(self.format(message, kind) + "\n")
+            return
+        self._buffer.append(self.format(message, kind))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        stream = self.stream or sys.stdout
+        if self._buffer:
+            self._buffer.append("")  # Terminates the last line
+            stream.write("\n".join(self._buffer))
+            self._buffer.clear()
+        stream.flush()
+
+
+class JsonLinesSink(StdoutSink):
+    """Writes each message as a JSON object, e.g. {"type": "report", "message": "0,1,NORTH"}."""
+
+    def __init__(self, stream=None, flush_every=1):
+        super().__init__(stream, flush_every)
+        import json
+        self._dumps = json.dumps
+
+    def format(self, message, kind):
+        return self._dumps({"type": kind, "message": message})
+
+
+class ListSink(OutputSink):
+    def __init__(self):
+        """Initialise a sink that collects (kind, message) records in memory."""
+        self.records = []
+
+    @property
+    def messages(self):
+        """The collected message texts, in order."""
+        return [message for _, message in self.records]
+
+    def write(self, message, kind=KIND_REPORT):
+        self.records.append((kind, message))
+
+    def clear(self):
+        """Discards the collected records."""
+        self.records.clear()
+
+
+class BackgroundWriterSink(OutputSink):
+    def __init__(self, sink, batch_size=DEFAULT_FLUSH_EVERY, max_batches=64):
+        """
+        Initialise a sink that hands messages to another sink on a background thread.
+
+        Args:
+            sink (OutputSink): The sink that does the actual writing.
+            batch_size (int): Number of messages handed to the thread at a time.
+            max_batches (int): Number of batches that may be queued before
+                writers wait for the thread to catch up.
+        """
+        import queue
+        import threading
+
+        self.sink = sink
+        self.batch_size = batch_size
+        self._pending = []
+        self._error = None
+        self._queue = queue.Queue(maxsize=max_batches)
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Writes queued batches until the closing sentinel (None) arrives."""
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    return
+                if self._error is not None:
+                    continue  # Keep draining so writers never block on a dead sink
+                if batch:
+                    for kind, message in batch:
+                        self.sink.write(message, kind)
+                else:
+                    self.sink.flush()  # An empty batch is a flush request
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def write(self, message, kind=KIND_REPORT):
+        self._pending.append((kind, message))
+        if len(self._pending) >= self.batch_size:
+            self._queue.put(self._pending)
+            self._pending = []
+
+    def flush(self):
+        """Waits until every message written so far has reached the underlying sink."""
+        if self._pending:
+            self._queue.put(self._pending)
+            self._pending = []
+        self._queue.put([])
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        if not self._thread.is_alive():
+            return
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+        self.sink.close()
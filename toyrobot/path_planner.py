@@ -0,0 +1,187 @@
+"""
+Filename: path_planner.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module plans the shortest list of MOVE, LEFT and RIGHT commands
+    that takes a robot from one state (x, y and facing direction) to another,
+    for the PATH X,Y,F command and for library use:
+
+        planner = PathPlanner(Table(5, 5), {"NORTH": 90, "EAST": 0, "SOUTH": 270, "WEST": 180})
+        planner.path((0, 0, "NORTH"), (2, 1, "EAST"))  # ['MOVE', 'RIGHT', 'MOVE', 'MOVE']
+
+    Every command costs one step, so a breadth-first search finds shortest
+    paths. It runs backwards from the target over every (x, y, heading)
+    state of the table, giving a distance table: the number of commands
+    from each state to the target. MOVE follows the simulator's rules, so a
+    MOVE off the edge or onto an obstacle leaves the robot where it is and
+    is never part of a shortest path. With the distance table, a path is
+    read off in time proportional to its length by taking, from each state,
+    a command that leads to a state one step closer.
+
+    Distance tables are kept in a least recently used cache bounded by the
+    total number of states held, keyed by the target and the table's
+    obstacles, so repeated queries towards the same target skip the search.
+"""
+from array import array
+from collections import OrderedDict
+
+from toyrobot.direction_model import HEADING_STEPS, compile_directions
+
+# Most distance-table entries kept in the cache, across every cached target
+PATH_CACHE_STATES = 1 << 24
+
+# Largest number of states (4 per cell) a table may have for paths to be planned on it
+MAX_PATH_STATES = 1 << 22
+
+_UNREACHED = -1
+
+
+class PathPlanner:
+    def __init__(self, table, directions, cache_states=PATH_CACHE_STATES):
+        """
+        Initialise a path planner for a table.
+
+        Args:
+            table (Table): The table paths are planned on, with its obstacles.
+            directions: A DirectionModel, or a dict of direction names to angles.
+            cache_states (int): Most distance-table entries kept in the cache.
+
+        Raises:
+            ValueError: If the directions are invalid, or the table has more
+                than MAX_PATH_STATES states.
+        """
+        states = 4 * table.width * table.length
+        if states > MAX_PATH_STATES:
+            raise ValueError(f"Paths can only be planned on tables of up to {MAX_PATH_STATES // 4} cells, "
+                             f"got {table.width * table.length}")
+        self.table = table
+        self.directions = compile_directions(directions)
+        self.cache_states = cache_states
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()  # (target state, obstacle map, obstacle count) -> distance table
+        self._cached_states = 0
+
+    def path(self, start, target):
+        """
+        Returns the shortest list of commands from one state to another.
+
+        Args:
+            start (tuple): (x, y, direction name) the robot starts in.
+            target (tuple): (x, y, direction name) the robot should end in.
+
+        Returns:
+            list: Command names ("MOVE", "LEFT" or "RIGHT"), empty if start
+            is the target, or None if the target cannot be reached.
+
+        Raises:
+            ValueError: If either state is off the table, on an obstacle, or
+                names an unknown direction.
+        """
+        return self.path_between(self._state(*start), self._state(*target))
+
+    def path_between(self, start, target):
+        """
+        Returns the shortest list of commands between two states, each given as
+        (x, y, heading) with heading 0=East, 1=North, 2=West, 3=South, or
+        None if the target cannot be reached. Both states must be free cells.
+        """
+        table = self.table
+        length, width = table.length, table.width
+        obstacles = table.obstacles
+        state = ((start[1] * length + start[0]) << 2) | start[2]
+        distances = self.distances(((target[1] * length + target[0]) << 2) | target[2])
+        remaining = distances[state]
+        if remaining == _UNREACHED:
+            return None
+
+        commands = []
+        while remaining:
+            remaining -= 1
+            heading = state & 3
+            cell = state >> 2
+            dx, dy = HEADING_STEPS[heading]
+            x, y = cell % length + dx, cell // length + dy
+            if 0 <= x < length and 0 <= y < width and (obstacles is None or not obstacles.blocked(x, y)):
+                moved = ((y * length + x) << 2) | heading
+                if distances[moved] == remaining:
+                    commands.append("MOVE")
+                    state = moved
+                    continue
+            left = (state & ~3) | ((heading + 1) & 3)
+            if distances[left] == remaining:
+                commands.append("LEFT")
+                state = left
+            else:
+                commands.append("RIGHT")
+                state = (state & ~3) | ((heading - 1) & 3)
+        return commands
+
+    def distances(self, target):
+        """
+        Returns the distance table for a target state index ((y * length + x) * 4 + heading):
+        the number of commands from each state to the target, or -1 where it cannot be reached.
+        """
+        obstacles = self.table.obstacles
+        key = (target, obstacles, 0 if obstacles is None else len(obstacles))  # Obstacles are only ever added
+        cache = self._cache
+        distances = cache.get(key)
+        if distances is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return distances
+
+        self.misses += 1
+        distances = self._search(target)
+        cache[key] = distances
+        self._cached_states += len(distances)
+        while self._cached_states > self.cache_states and len(cache) > 1:
+            self._cached_states -= len(cache.popitem(last=False)[1])
+        return distances
+
+    def _search(self, target):
+        """Runs a breadth-first search backwards from the target state."""
+        table = self.table
+        length, width = table.length, table.width
+        blocked = None if table.obstacles is None else table.obstacles.blocked
+        distances = array('i', [_UNREACHED]) * (4 * width * length)
+        distances[target] = 0
+        frontier = [target]
+        distance = 0
+        while frontier:
+            distance += 1
+            reached = []
+            append = reached.append
+            for state in frontier:
+                heading = state & 3
+                base = state & ~3
+                # LEFT turns heading - 1 into this heading, and RIGHT turns heading + 1 into it
+                for previous in (base | ((heading - 1) & 3), base | ((heading + 1) & 3)):
+                    if distances[previous] == _UNREACHED:
+                        distances[previous] = distance
+                        append(previous)
+                # MOVE reaches this cell from the cell behind it
+                dx, dy = HEADING_STEPS[heading]
+                cell = state >> 2
+                x, y = cell % length - dx, cell // length - dy
+                if 0 <= x < length and 0 <= y < width and (blocked is None or not blocked(x, y)):
+                    previous = ((y * length + x) << 2) | heading
+                    if distances[previous] == _UNREACHED:
+                        distances[previous] = distance
+                        append(previous)
+            frontier = reached
+        return distances
+
+    def _state(self, x, y, direction):
+        """Converts (x, y, direction name) into (x, y, heading), validating it."""
+        table = self.table
+        heading = self.directions.heading_for(direction)
+        if heading is None:
+            raise ValueError(f"Unknown direction {direction!r}")
+        if not (0 <= x < table.length and 0 <= y < table.width):
+            raise ValueError(f"State {x},{y},{direction} is off the table")
+        if table.is_blocked(x, y):
+            raise ValueError(f"State {x},{y},{direction} is on an obstacle")
+        return x, y, heading
@@ -4,77 +4,109 @@ Author: Aaron Pacanowski
 Email: aaronpaca@gmail.com
 Date: 2025-07-28
 Description:
-    This module provides a Position class that abstracts the representation
-    of a 2D position using complex numbers. It simplifies position manipulation
-    so developers can edit other files without requiring knowledge of complex number mathematics.
+    This module provides a Position class that represents a cell on the table
+    as a compact pair of integer coordinates. Movement in an arbitrary
+    direction is calculated with complex numbers, so developers can edit other
+    files without requiring knowledge of complex number mathematics.
+
+    Coordinates are exact Python integers of any size. Whole-cell moves along
+    the grid use integer arithmetic, and only the offset of any other move
+    goes through floating point, so positions on tables far beyond 2**53
+    cells per side stay exact.
 """
 import cmath
 import math
 
+# Exact unit steps for the grid headings, keyed by angle in degrees
+GRID_STEPS = {0: (1, 0), 90: (0, 1), 180: (-1, 0), 270: (0, -1)}
+
+
+def round_offset(coordinate, offset):
+    """
+    Returns round(coordinate + offset) for an integer coordinate of any size,
+    rounding halves to even like round(), without converting the coordinate
+    to a float.
+    """
+    whole = math.floor(offset)
+    result = coordinate + whole
+    fraction = offset - whole
+    if fraction > 0.5 or (fraction == 0.5 and result % 2):
+        result += 1
+    return result
+
+
 class Position:
+    __slots__ = ("x", "y")
+
     def __init__(self, x=0, y=0):
         """
         Initialize a position with x and y coordinates.
-        
+
+        Coordinates are rounded to the nearest whole cell.
+
         Args:
             x (int): X coordinate (East-West)
             y (int): Y coordinate (North-South)
         """
-        self._complex_pos = complex(x, y)
-    
-    @property
-    def x(self):
-        """Get the x coordinate (East-West position)."""
-        return round(self._complex_pos.real)
-    
-    @property
-    def y(self):
-        """Get the y coordinate (North-South position)."""
-        return round(self._complex_pos.imag)
-    
+        self.x = x if type(x) is int else round(x)
+        self.y = y if type(y) is int else round(y)
+
+    def move_to(self, x, y):
+        """
+        Moves this position to the given coordinates in place, without
+        allocating a new Position.
+
+        Args:
+            x (int): New X coordinate (East-West)
+            y (int): New Y coordinate (North-South)
+        """
+        self.x = x
+        self.y = y
+
     def move_in_direction(self, distance, angle_degrees):
         """
         Move the position in the specified direction for the given distance.
-        
+
         Args:
             distance (float): Distance to move.
             angle_degrees (float): Direction angle in degrees (0=East, 90=North, etc.).
-            
+
         Returns:
             Position: A new Position object representing the moved position.
 
         Notes:
         - 0° corresponds to East, and the positive direction is counterclockwise.
         """
-        # Convert angle to radians and calculate the new position using polar form
-        radians = math.radians(angle_degrees)
-        new_complex = self._complex_pos + cmath.rect(distance, radians)
-        
+        step = GRID_STEPS.get(angle_degrees % 360)
+        if step is not None and type(distance) is int:
+            return Position(self.x + step[0] * distance, self.y + step[1] * distance)
+
+        # Convert angle to radians and calculate the offset using polar form
+        offset = cmath.rect(distance, math.radians(angle_degrees))
+
         # Create and return new Position object
-        new_position = Position()
-        new_position._complex_pos = new_complex
-        return new_position
-    
+        return Position(round_offset(self.x, offset.real), round_offset(self.y, offset.imag))
+
     def constrain_to_bounds(self, min_x, max_x, min_y, max_y):
         """
         Ensure position stays within the specified bounds
-        
+
         Args:
             min_x (int): Minimum allowed x coordinate
             max_x (int): Maximum allowed x coordinate
             min_y (int): Minimum allowed y coordinate
             max_y (int): Maximum allowed y coordinate
-            
+
         Returns:
             Position: A new Position object constrained to the bounds
         """
         # Constrain x and y to the specified ranges
         constrained_x = min(max(min_x, self.x), max_x)
         constrained_y = min(max(min_y, self.y), max_y)
-        
+
         # Create and return a new Position with constrained coordinates
         return Position(constrained_x, constrained_y)
-    
+
     def __str__(self):
         """String representation of position as 'x,y'"""
         return f"{self.x},{self.y}"
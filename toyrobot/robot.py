@@ -14,12 +14,19 @@ from toyrobot.robot_reporter import RobotReporter
 from toyrobot.robot_placer import RobotPlacer
 from toyrobot.robot_mover import RobotMover
 from toyrobot.position import Position
+from toyrobot.direction_model import compile_directions
 
 class Robot:
+    __slots__ = ("position", "facing_angle", "directions", "table",
+                 "robot_rotator", "robot_reporter", "robot_placer", "robot_mover")
+
     def __init__(self, directions, robot_rotator=None, robot_reporter=None, 
                 table=None, robot_placer=None, robot_mover=None):
         """
         Initialize a Robot with required components.
+
+        The directions may be a DirectionModel or a dict of direction names to
+        angles, which is compiled (once per distinct dict) into a DirectionModel.
         
         The robot starts with no position (not on the table) and no facing direction.
         It will be placed on the table using the PLACE command.
@@ -34,7 +41,7 @@ class Robot:
         """
         self.position = None  # Will be a Position object once placed
         self.facing_angle = None  # Will be set when placed
-        self.directions = directions
+        self.directions = compile_directions(directions)
         self.table = table
         self.robot_rotator = robot_rotator or RobotRotator()
         self.robot_reporter = robot_reporter or RobotReporter()
@@ -9,20 +9,26 @@ Description:
     moves according to its current direction.
 """
 
-from toyrobot.position import Position
+from toyrobot.movement_engine import LookupMovementEngine
 
 class RobotMover:
+    def __init__(self, engine=None):
+        """
+        Initialise the mover with a movement engine.
+
+        Args:
+            engine: Optional movement engine. Defaults to the integer
+                LookupMovementEngine; pass a ComplexMovementEngine to use
+                the reference complex number implementation.
+        """
+        self.engine = engine or LookupMovementEngine()
+
     def move(self, distance, robot, table):
         """
         Moves the robot forward by the specified distance.
         """
-        # Calculate the new position based on the robot's current position and facing angle
-        new_position = robot.position.move_in_direction(distance, robot.facing_angle)
-        
-        # Constrain the position to the table dimensions (0-indexed, so max is length-1 or width-1)
-        constrained_position = new_position.constrain_to_bounds(0, table.length-1, 0, table.width-1)
-        robot.position = constrained_position
-    
+        self.engine.move(robot, table, distance)
+
     def move_one_space(self, robot, table):
         """Moves the robot only 1 space forward as required in this implementation."""
-        self.move(1, robot, table)
\ No newline at end of file
+        self.move(1, robot, table)
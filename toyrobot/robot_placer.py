@@ -6,27 +6,114 @@ Date: 2025-07-28
 Description:
     This module handles placing the robot on the table at a specific position
     and orientation. It validates that the placement is within the table boundaries
-    and that the direction is valid.
+    and not on an obstacle, and that the direction is valid. Direction names are
+    matched ignoring case and surrounding whitespace, using the robot's compiled
+    DirectionModel. A PLACE argument can also be a Placement that is already
+    parsed, e.g. read from a binary command file, which skips the text.
 """
+from collections import namedtuple
 
 from toyrobot.position import Position
 
+class Placement(namedtuple("Placement", ["x", "y", "facing_angle", "name"])):
+    """
+    A parsed PLACE argument: the coordinates, the facing angle and the
+    direction name it was given with. It prints as "X,Y,NAME", so errors
+    and converters show it exactly like the text argument.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.x},{self.y},{self.name}"
+
+def parse_coordinate(text):
+    """
+    Parses an integer coordinate, returning None instead of raising when invalid.
+
+    Plain digit strings take the fast path; anything else (signs, padding) is
+    left to int() so the accepted syntax is unchanged.
+    """
+    if text.isdigit() and text.isascii():
+        return int(text)
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+def parse_place(string, directions, table):
+    """
+    Parses and validates the arguments of a PLACE command.
+
+    Args:
+        string (str): The PLACE arguments, e.g. "1,2,NORTH", or a Placement
+            whose angle is from the same direction model.
+        directions (DirectionModel): The compiled direction model.
+        table (Table): The table the robot is being placed on.
+
+    Returns:
+        tuple: (x, y, facing_angle, error) where error is None for a valid
+        placement, otherwise a description of why the arguments are invalid.
+    """
+    if type(string) is Placement:
+        x_coord, y_coord, facing_angle, _ = string
+        if not (0 <= x_coord < table.length and 0 <= y_coord < table.width):
+            return None, None, None, "Placement out of table bounds."
+        if table.obstacles is not None and table.obstacles.blocked(x_coord, y_coord):
+            return None, None, None, "Placement blocked by an obstacle."
+        return x_coord, y_coord, facing_angle, None
+
+    position_arguments = string.split(',')  # splits the string by the commas
+
+    x_coord = parse_coordinate(position_arguments[0])
+    if x_coord is None:
+        return None, None, None, f"invalid literal for int() with base 10: {position_arguments[0]!r}"
+    if len(position_arguments) < 2:
+        return None, None, None, "list index out of range"
+
+    y_coord = parse_coordinate(position_arguments[1])
+    if y_coord is None:
+        return None, None, None, f"invalid literal for int() with base 10: {position_arguments[1]!r}"
+    if len(position_arguments) < 3:
+        return None, None, None, "list index out of range"
+
+    facing_direction = position_arguments[2].rstrip()
+
+    # Ensure that the x and y values are on the tabletop (0-indexed, so max is length-1 or width-1)
+    if not (0 <= x_coord < table.length and 0 <= y_coord < table.width):
+        return None, None, None, "Placement out of table bounds."
+    if table.obstacles is not None and table.obstacles.blocked(x_coord, y_coord):
+        return None, None, None, "Placement blocked by an obstacle."
+    facing_angle = directions.angle_for(facing_direction)
+    if facing_angle is None:
+        return None, None, None, repr(facing_direction)
+    return x_coord, y_coord, facing_angle, None
+
 class RobotPlacer:
     def place(self, string, robot, table):
         """
         Places the robot at the specified position and direction.
+
+        Raises:
+            ValueError: If the PLACE arguments are invalid.
+        """
+        error = self.try_place(string, robot, table)
+        if error is not None:
+            raise ValueError(error)
+
+    def try_place(self, string, robot, table):
+        """
+        Places the robot at the specified position and direction.
+
+        Returns:
+            str: None if the robot was placed, otherwise a description of why
+            the PLACE command is invalid.
         """
-        position_arguments = string.split(',')  # splits the string by the commas
-        try:
-            x_coord = int(position_arguments[0])
-            y_coord = int(position_arguments[1])
-            facing_direction = str(position_arguments[2].rstrip())
-            
-            # Ensure that the x and y values are on the tabletop (0-indexed, so max is length-1 or width-1)
-            if 0 <= x_coord < table.length and 0 <= y_coord < table.width:
-                robot.facing_angle = robot.directions[facing_direction]
-                robot.position = Position(x_coord, y_coord)
-            else:
-                raise ValueError("Placement out of table bounds.")
-        except (IndexError, ValueError, KeyError) as e:
-            raise ValueError(f"Invalid PLACE command: {string}. Error: {e}")
\ No newline at end of file
+        x_coord, y_coord, facing_angle, error = parse_place(string, robot.directions, table)
+        if error is not None:
+            return f"Invalid PLACE command: {string}. Error: {error}"
+        robot.facing_angle = facing_angle
+        if robot.position is None:
+            robot.position = Position(x_coord, y_coord)
+        else:
+            robot.position.move_to(x_coord, y_coord)
+        return None
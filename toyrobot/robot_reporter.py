@@ -8,44 +8,33 @@ Description:
     It formats and outputs the robot's state in the specified format: X,Y,DIRECTION.
 """
 
+from toyrobot.output_sink import StdoutSink, KIND_REPORT
+
 class RobotReporter:
+    def __init__(self, output_sink=None):
+        """
+        Initialise the reporter with the sink that reports are written to.
+
+        Args:
+            output_sink (OutputSink): Optional sink. Defaults to writing
+                each report straight to stdout.
+        """
+        self.output_sink = output_sink or StdoutSink()
+
     def report(self, robot):
         """
         Reports the current position and direction of the robot.
-        Prints in the format "X,Y,DIRECTION" (e.g. "0,1,NORTH").
+        Writes in the format "X,Y,DIRECTION" (e.g. "0,1,NORTH").
 
         Notes:
-        - The robot's facing angle is normalized to the range [0, 360).
+        - Angles that differ by a multiple of 360° report the same direction.
         - 0° corresponds to East, and the positive direction is counterclockwise.
         """
         if robot.position is None:
             return  # Robot is not on the table
 
-        # Get the position coordinates
-        x_coord = robot.position.x
-        y_coord = robot.position.y
-        
-        # Normalize the facing angle to be between 0 and 360 degrees
-        robot.facing_angle %= 360
-        
-        # Get the direction name from the angle
-        facing_direction = self.get_key_from_directions_dict(robot.facing_angle, robot)
-        
-        # Print the position report
-        print(f"{x_coord},{y_coord},{facing_direction}")
-    
-    def get_key_from_directions_dict(self, val, robot):
-        """
-        Retrieves the key (direction name) from the directions dictionary
-        based on the given angle.
+        # Look up the direction name in the compiled model, leaving the robot untouched
+        facing_direction = robot.directions.name_for(robot.facing_angle)
 
-        Args:
-            val (float): The angle in degrees.
-            robot: The robot object containing the directions dictionary.
-
-        Returns:
-            str: The direction name (e.g., "NORTH").
-        """
-        for key, value in robot.directions.items():
-             if val == value:
-                 return key
+        # Write the position report
+        self.output_sink.write(f"{robot.position.x},{robot.position.y},{facing_direction}", KIND_REPORT)
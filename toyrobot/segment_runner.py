@@ -0,0 +1,270 @@
+"""
+Filename: segment_runner.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module replays one large command file on many cores. A valid PLACE
+    overwrites the robot's whole state, so the output after it does not
+    depend on anything before it. The file is split at valid PLACE commands
+    near evenly spaced byte offsets, each segment is run in a fresh Session
+    on a process pool, and the segments' output is emitted in file order.
+    The first segment starts with no robot on the table, so the "not placed"
+    messages before the first valid PLACE are the same as in a serial run.
+
+    OBSTACLE commands change the table for every later command, so once a
+    segment adds an obstacle, the rest of the file is run in this process
+    from the state that segment ended in. Likewise, macros and open blocks
+    carry into later segments, and a PLACE inside a block is no boundary at
+    all, so once a segment uses DEFINE, REPEAT, END or CALL, that segment
+    and the rest of the file are run in this process.
+"""
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from toyrobot.checkpoint import capture_checkpoint, restore_checkpoint
+from toyrobot.command_dispatcher import STATUS_EXIT
+from toyrobot.command_parser import tokenize, OP_PLACE
+from toyrobot.command_source import iter_file_range_commands
+from toyrobot.config import compile_config
+from toyrobot.output_sink import OutputSink, KIND_REPORT
+from toyrobot.robot_placer import parse_place
+from toyrobot.session import Session
+from toyrobot.table import Table
+
+# Segments per worker process, so a slow segment does not leave the other workers idle
+SEGMENTS_PER_JOB = 4
+
+# Output records a worker buffers before appending them to its spool file
+SPOOL_BATCH_SIZE = 4096
+
+# Result of running one segment: the checkpoint holds the robot's final state and,
+# if obstacles_added, every obstacle on the table
+SegmentResult = namedtuple("SegmentResult", ["commands", "status", "checkpoint", "obstacles_added", "blocks_used"])
+
+
+class SegmentSummary:
+    def __init__(self, segments, jobs, commands, seconds, serial_from=None):
+        """
+        Initialise the summary of a segmented run.
+
+        Args:
+            segments (int): Number of segments the file was split into.
+            jobs (int): Number of worker processes.
+            commands (int): Total number of commands processed.
+            seconds (float): Wall clock time of the run.
+            serial_from (int): Index of the first segment run in this process
+                because of an OBSTACLE or block command, if any.
+        """
+        self.segments = segments
+        self.jobs = jobs
+        self.commands = commands
+        self.seconds = seconds
+        self.serial_from = serial_from
+
+    def __str__(self):
+        seconds = max(self.seconds, 1e-9)
+        summary = (f"Ran {self.commands} commands in {self.segments} segments on {self.jobs} workers "
+                   f"in {self.seconds:.3f}s: {self.commands / seconds:,.0f} commands/sec")
+        if self.serial_from is not None:
+            summary += f" (serial from segment {self.serial_from})"
+        return summary
+
+
+class SpoolSink(OutputSink):
+    def __init__(self, path, batch_size=SPOOL_BATCH_SIZE):
+        """
+        Initialise a sink that saves (kind, message) records to a file in
+        pickled batches, so a segment's output need not fit in memory.
+
+        Args:
+            path (str): The spool file.
+            batch_size (int): Number of records per pickled batch.
+        """
+        self.file = open(path, 'wb')
+        self.batch_size = batch_size
+        self.records = []
+
+    def write(self, message, kind=KIND_REPORT):
+        self.records.append((kind, message))
+        if len(self.records) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.records:
+            pickle.dump(self.records, self.file, pickle.HIGHEST_PROTOCOL)
+            self.records = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def replay_spool(path, output_sink):
+    """Writes the records saved by a SpoolSink to an output sink, in order."""
+    write = output_sink.write
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                records = pickle.load(f)
+            except EOFError:
+                return
+            for kind, message in records:
+                write(message, kind)
+
+
+def is_valid_place(line, directions, table):
+    """Returns True if a raw command line is a PLACE that would place the robot."""
+    try:
+        opcode, argument = tokenize(line.decode())
+    except UnicodeDecodeError:
+        return False
+    return opcode == OP_PLACE and parse_place(argument, directions, table)[3] is None
+
+
+def find_segment_starts(path, config, count):
+    """
+    Finds up to `count` segment start offsets: 0, then the first valid PLACE
+    at or after each evenly spaced byte offset in the file.
+
+    Args:
+        path (str): The command file.
+        config (SimulationConfig): Configuration the file is run with.
+        count (int): Number of segments wanted.
+
+    Returns:
+        list: Increasing byte offsets, each at the start of a line. There are
+        fewer than `count` if the file has too few valid PLACE commands.
+    """
+    table = Table(config.width, config.length, config.obstacles)
+    size = os.path.getsize(path)
+    starts = [0]
+    with open(path, 'rb') as f:
+        for index in range(1, count):
+            target = max(size * index // count, starts[-1] + 1)
+            if target >= size:
+                break
+            f.seek(target - 1)
+            f.readline()  # Move to the first line starting at or after the target
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    return starts  # No valid PLACE in the rest of the file
+                if is_valid_place(line, config.directions, table):
+                    starts.append(offset)
+                    break
+    return starts
+
+
+def run_segment(path, config, start, end, spool_path):
+    """
+    Runs the commands in one byte range of a file in a fresh session.
+
+    Args:
+        path (str): The command file.
+        config (SimulationConfig): Configuration for the session.
+        start (int): Byte offset of the segment's first command.
+        end (int): Byte offset of the next segment, or None for the end of the file.
+        spool_path (str): File the segment's output is saved to.
+
+    Returns:
+        SegmentResult: Commands processed, the final status, and the end state.
+    """
+    sink = SpoolSink(spool_path)
+    try:
+        session = Session(config, sink)
+        table = session.table
+        initial_obstacles = len(table.obstacles or ())
+        status = session.run(iter_file_range_commands(path, start, end))
+        if end is None:
+            session.finish()
+    finally:
+        sink.close()
+    obstacles_added = len(table.obstacles or ()) != initial_obstacles
+    obstacles = tuple(table.obstacles) if obstacles_added else ()
+    checkpoint = capture_checkpoint(session.robot, end, session.commands_processed, obstacles)
+    blocks_used = session.dispatcher.blocks is not None
+    return SegmentResult(session.commands_processed, status, checkpoint, obstacles_added, blocks_used)
+
+
+def run_rest(path, config, output_sink, start, checkpoint=None):
+    """Runs a file from a byte offset to the end in this process, from a checkpoint's state if given."""
+    session = Session(config, output_sink)
+    if checkpoint is not None:
+        restore_checkpoint(checkpoint, session.robot, session.table)
+    session.run(iter_file_range_commands(path, start))
+    session.finish()
+    return session.commands_processed
+
+
+def run_segmented(path, config, output_sink, jobs=None, segments=None):
+    """
+    Runs one command file split at valid PLACE commands, with the segments
+    on a process pool, giving the same output as running it serially.
+
+    Args:
+        path (str): The command file.
+        config: A SimulationConfig, or a dict in the format of config.json.
+        output_sink (OutputSink): Sink that receives the output in file order.
+        jobs (int): Number of worker processes. Defaults to one per core;
+            1 runs every segment in this process.
+        segments (int): Number of segments to aim for. Defaults to
+            SEGMENTS_PER_JOB per worker.
+
+    Returns:
+        SegmentSummary: Segments, commands processed and the time taken.
+
+    Raises:
+        FileNotFoundError: If the command file does not exist.
+    """
+    config = compile_config(config)
+    jobs = jobs or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    starts = find_segment_starts(path, config, segments or jobs * SEGMENTS_PER_JOB)
+    bounds = list(zip(starts, starts[1:] + [None]))
+
+    spool_dir = tempfile.mkdtemp(prefix="toyrobot-segments-")
+    spool_paths = [os.path.join(spool_dir, f"{index}.spool") for index in range(len(bounds))]
+    executor = ProcessPoolExecutor(min(jobs, len(bounds))) if jobs > 1 and len(bounds) > 1 else None
+    commands = 0
+    serial_from = None
+    try:
+        if executor is None:
+            results = (run_segment(path, config, start, end, spool_path)
+                       for (start, end), spool_path in zip(bounds, spool_paths))
+        else:
+            futures = [executor.submit(run_segment, path, config, start, end, spool_path)
+                       for (start, end), spool_path in zip(bounds, spool_paths)]
+            results = (future.result() for future in futures)
+
+        # Segments are taken in file order, whichever worker finishes first
+        previous = None  # Checkpoint at the end of the previous segment
+        for index, result in enumerate(results):
+            last = index + 1 == len(bounds)
+            if result.blocks_used and not last:
+                # A block may span the next boundary and later segments may call macros, so run from here
+                serial_from = index
+                commands += run_rest(path, config, output_sink, bounds[index][0], previous)
+                break
+            replay_spool(spool_paths[index], output_sink)
+            os.remove(spool_paths[index])
+            commands += result.commands
+            if result.status == STATUS_EXIT:
+                break
+            if result.obstacles_added and not last:
+                # Later segments ran without this segment's obstacles, so finish the file here
+                serial_from = index + 1
+                commands += run_rest(path, config, output_sink, bounds[serial_from][0], result.checkpoint)
+                break
+            previous = result.checkpoint
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        shutil.rmtree(spool_dir, ignore_errors=True)
+    return SegmentSummary(len(bounds), jobs, commands, time.perf_counter() - start_time, serial_from)
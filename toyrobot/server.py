@@ -0,0 +1,202 @@
+"""
+Filename: server.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module runs the simulator as an asyncio network service. Every TCP or
+    Unix-socket connection gets its own Session (table, robot and dispatcher)
+    and sends the usual command protocol, one command per line. Every complete
+    line received is run in order and the output is written back on the same
+    connection. Writes wait for the client to read (backpressure), idle
+    connections are closed after a timeout, and EXIT ends only the connection
+    that sent it. DEFINE and REPEAT blocks are limited per connection
+    (MAX_BLOCK_LINES, MAX_BLOCK_COMMANDS), so that one command cannot hold
+    the event loop or fill the connection's output without end.
+"""
+import asyncio
+import json
+
+from toyrobot.command_dispatcher import STATUS_OK, STATUS_EXIT
+from toyrobot.config import compile_config
+from toyrobot.output_sink import OutputSink, KIND_REPORT, KIND_INFO
+from toyrobot.session import Session, DEFAULT_IDLE_TIMEOUT
+
+# Bytes read from a connection at a time; every complete line in a read is run before replying
+READ_SIZE = 64 * 1024
+
+# Longest command line accepted, in bytes; longer lines close the connection
+MAX_LINE_LENGTH = 64 * 1024
+
+# Most lines one DEFINE or REPEAT block may record, and most commands one REPEAT or CALL may run
+MAX_BLOCK_LINES = 10_000
+MAX_BLOCK_COMMANDS = 1_000_000
+
+# Highest TCP port number
+MAX_PORT = 65535
+
+IDLE_MESSAGE = "Session closed: idle timeout."
+LINE_TOO_LONG_MESSAGE = "Session closed: command line too long."
+
+
+class ConnectionSink(OutputSink):
+    def __init__(self, json_lines=False):
+        """
+        Initialise a sink that collects one connection's output until the
+        server sends it.
+
+        Args:
+            json_lines (bool): Format each message as a JSON object, like
+                JsonLinesSink, instead of a plain text line.
+        """
+        self.json_lines = json_lines
+        self._lines = []
+
+    def write(self, message, kind=KIND_REPORT):
+        if self.json_lines:
+            message = json.dumps({"type": kind, "message": message})
+        self._lines.append(message)
+
+    def take(self):
+        """Returns the collected output as encoded bytes and clears it."""
+        if not self._lines:
+            return b""
+        self._lines.append("")  # Terminates the last line
+        data = "\n".join(self._lines).encode()
+        self._lines.clear()
+        return data
+
+
+class RobotServer:
+    def __init__(self, config, idle_timeout=DEFAULT_IDLE_TIMEOUT, json_lines=False, instrumentation=None,
+                 max_block_lines=MAX_BLOCK_LINES, max_block_commands=MAX_BLOCK_COMMANDS):
+        """
+        Initialise a server that hosts one session per connection.
+
+        Args:
+            config: A SimulationConfig, or a configuration dictionary in the
+                format of config.json, used for every session.
+            idle_timeout (float): Seconds to wait for a command before closing
+                a connection. None waits forever.
+            json_lines (bool): Send output as JSON lines instead of plain text.
+            instrumentation (Instrumentation): Optional statistics recorder
+                shared by every session.
+            max_block_lines (int): Most lines one DEFINE or REPEAT block
+                may record in a session.
+            max_block_commands (int): Most commands one REPEAT or CALL may
+                run in a session, with nested blocks expanded.
+        """
+        self.config = compile_config(config)
+        self.idle_timeout = idle_timeout
+        self.json_lines = json_lines
+        self.instrumentation = instrumentation
+        self.block_limits = (max_block_lines, max_block_commands)
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.evicted_sessions = 0
+        self.commands_processed = 0
+
+    async def handle_connection(self, reader, writer):
+        """Runs a session for one connection until EXIT, end of input or eviction."""
+        sink = ConnectionSink(self.json_lines)
+        session = Session(self.config, sink, self.instrumentation)
+        session.limit_blocks(*self.block_limits)
+        self.active_sessions += 1
+        self.total_sessions += 1
+        pending = b""
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(reader.read(READ_SIZE), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.evicted_sessions += 1
+                    sink.write(IDLE_MESSAGE, KIND_INFO)
+                    break
+                if not data:
+                    # The client closed its end; run a final unterminated line
+                    if pending:
+                        self._run_lines(session, [pending.decode(errors="replace")])
+                    session.finish()
+                    break
+
+                # Run every complete line received so far, keeping any partial line
+                buffered = pending + data
+                end = buffered.rfind(b"\n")
+                if end < 0:
+                    pending = buffered
+                    status = STATUS_OK
+                else:
+                    pending = buffered[end + 1:]
+                    status = self._run_lines(session, buffered[:end].decode(errors="replace").split("\n"))
+                if len(pending) > MAX_LINE_LENGTH:
+                    sink.write(LINE_TOO_LONG_MESSAGE, KIND_INFO)
+                    break
+                output = sink.take()
+                if output:
+                    writer.write(output)
+                    await writer.drain()  # Waits while the client is not reading
+                if status == STATUS_EXIT:
+                    break
+            writer.write(sink.take())
+            await writer.drain()
+        except ConnectionError:
+            pass  # The client went away; nothing left to send
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _run_lines(self, session, lines):
+        """Runs command lines through a session and returns its status."""
+        before = session.commands_processed
+        try:
+            return session.run(lines)
+        finally:
+            self.commands_processed += session.commands_processed - before
+
+    async def start(self, host=None, port=None, unix_path=None):
+        """
+        Starts listening on a TCP address or a Unix socket.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, unix_path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve_forever(self, host=None, port=None, unix_path=None, on_start=None):
+        """
+        Listens and serves connections until cancelled.
+
+        Args:
+            on_start: Optional callable given the asyncio.Server once listening.
+        """
+        server = await self.start(host, port, unix_path)
+        if on_start is not None:
+            on_start(server)
+        async with server:
+            await server.serve_forever()
+
+    def __str__(self):
+        return (f"{self.total_sessions} sessions ({self.evicted_sessions} evicted), "
+                f"{self.commands_processed} commands")
+
+
+def parse_address(address):
+    """
+    Parses a "[HOST:]PORT" server address.
+
+    Returns:
+        tuple: (host, port), where host is None for all interfaces.
+
+    Raises:
+        ValueError: If the port is not a number from 0 to MAX_PORT.
+    """
+    host, _, port = address.rpartition(":")
+    if not (port.isdigit() and port.isascii()) or int(port) > MAX_PORT:
+        raise ValueError(f"invalid port {port!r} in {address!r}, expected a number from 0 to {MAX_PORT}")
+    return host or None, int(port)
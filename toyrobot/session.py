@@ -0,0 +1,118 @@
+"""
+Filename: session.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides the Session class, which wires a table, a robot and
+    its components, and a command dispatcher together from a configuration
+    dictionary. Each session is an independent simulation context, so many
+    can run side by side (e.g. one per file or per network connection).
+"""
+
+from toyrobot.config import compile_config
+from toyrobot.command_dispatcher import CommandDispatcher, STATUS_OK, STATUS_EXIT
+from toyrobot.output_sink import StdoutSink
+from toyrobot.robot import Robot
+from toyrobot.robot_mover import RobotMover
+from toyrobot.robot_placer import RobotPlacer
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.robot_rotator import RobotRotator
+from toyrobot.table import Table
+
+# Seconds a network session may go without sending a command before it is closed
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+class Session:
+    def __init__(self, config, output_sink=None, instrumentation=None):
+        """
+        Initialise the table, robot and dispatcher for a configuration.
+
+        Args:
+            config: A SimulationConfig, or a dict with "table_size" and
+                "directions" in the format of config.json.
+            output_sink (OutputSink): Optional sink for all output. Defaults
+                to writing each line straight to stdout.
+            instrumentation (Instrumentation): Optional statistics recorder
+                for the dispatcher and the robot's components.
+
+        Raises:
+            ValueError: If the configuration is invalid.
+        """
+        config = compile_config(config)
+        self.output_sink = output_sink or StdoutSink()
+        self.table = Table(config.width, config.length, config.obstacles)
+        self.robot = Robot(config.directions, RobotRotator(), RobotReporter(self.output_sink),
+                           self.table, RobotPlacer(), RobotMover())
+        self.dispatcher = CommandDispatcher(self.output_sink, instrumentation)
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.instrument_robot(self.robot)
+        self.analytics = None
+        self.commands_processed = 0
+
+    def enable_analytics(self, path=None):
+        """
+        Starts counting the robot's visits and clamped MOVEs (see analytics.py).
+
+        Blocks are no longer memoized, so that every MOVE inside them is counted.
+
+        Args:
+            path (str): Optional .npy or .csv file written by HEATMAP and by
+                Analytics.export().
+
+        Returns:
+            Analytics: The counts, updated as commands run.
+
+        Raises:
+            ValueError: If the table is too large or the path has neither extension.
+        """
+        from toyrobot.analytics import Analytics  # Only sessions with analytics need NumPy
+        analytics = self.analytics = Analytics(self.table, path)
+        analytics.attach(self.robot)
+        self.dispatcher.analytics = analytics
+        return analytics
+
+    def limit_blocks(self, max_lines, max_commands):
+        """
+        Limits the DEFINE and REPEAT blocks this session runs (see blocks.py).
+
+        Args:
+            max_lines (int): Most lines recorded for one outermost block.
+            max_commands (int): Most commands one outermost REPEAT or CALL
+                may run, with nested blocks expanded.
+        """
+        dispatcher = self.dispatcher
+        dispatcher.block_limits = (max_lines, max_commands)
+        if dispatcher.blocks is not None:
+            dispatcher.blocks.max_lines = max_lines
+            dispatcher.blocks.max_commands = max_commands
+
+    def finish(self):
+        """
+        Ends the session's input, reporting any DEFINE or REPEAT block left open.
+
+        Returns:
+            int: STATUS_ERROR if a block was left open, otherwise STATUS_OK.
+        """
+        return self.dispatcher.finish()
+
+    def run(self, commands):
+        """
+        Processes an iterable of command lines until they run out or EXIT is reached.
+
+        Returns:
+            int: STATUS_EXIT if an EXIT command stopped the run, otherwise STATUS_OK.
+        """
+        dispatch = self.dispatcher.dispatch
+        robot = self.robot
+        table = self.table
+        processed = 0
+        try:
+            for command in commands:
+                processed += 1
+                if dispatch(command, robot, table) == STATUS_EXIT:
+                    return STATUS_EXIT
+            return STATUS_OK
+        finally:
+            self.commands_processed += processed
@@ -0,0 +1,142 @@
+"""
+Filename: simulator.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides the Simulator class, the library entry point for
+    running the toy robot from other programs. It is built once from a
+    configuration and runs any number of command lists, each from a robot
+    that has not been placed, returning the reports, errors and ignored
+    commands as data instead of printing them:
+
+        simulator = Simulator(load_config())
+        result = simulator.run(["PLACE 0,0,NORTH", "MOVE", "REPORT"])
+        result.reports  # ['0,1,NORTH']
+
+    The table, robot, components and dispatcher are created once and reset
+    between runs, so a run costs only its commands. Invalid commands are
+    reported in the result rather than raised.
+"""
+from collections import namedtuple
+
+from toyrobot.command_dispatcher import STATUS_EXIT
+from toyrobot.config import compile_config
+from toyrobot.output_sink import ListSink, KIND_REPORT, KIND_ERROR, KIND_IGNORED, KIND_INFO
+from toyrobot.session import Session
+
+# Result of a run: the messages of each kind in order, STATUS_EXIT if EXIT stopped the
+# run (otherwise STATUS_OK), the number of commands processed, and the robot's final
+# state as (x, y, direction name), or None if it was never placed
+SimulationResult = namedtuple("SimulationResult", ["reports", "errors", "ignored", "info", "status", "commands",
+                                                   "state"])
+
+# A message written while running commands, with the 1-based number of the command that wrote it
+SimulationEvent = namedtuple("SimulationEvent", ["line", "kind", "message"])
+
+
+class Simulator:
+    def __init__(self, config):
+        """
+        Initialise a reusable simulation for a configuration.
+
+        Args:
+            config: A SimulationConfig, or a dict with "table_size" and
+                "directions" in the format of config.json.
+
+        Raises:
+            ValueError: If the configuration is invalid.
+        """
+        self.config = compile_config(config)
+        self.sink = ListSink()
+        self.session = Session(self.config, self.sink)
+        table = self.session.table
+        self._initial_obstacles = 0 if table.obstacles is None else len(table.obstacles)
+
+    def reset(self):
+        """Takes the robot off the table and removes obstacles, macros and output left by the last run."""
+        session = self.session
+        robot = session.robot
+        robot.position = None
+        robot.facing_angle = None
+        table = session.table
+        obstacles = table.obstacles
+        if obstacles is not None and len(obstacles) != self._initial_obstacles:
+            # Obstacles are only ever added, so a changed count means OBSTACLE commands ran
+            table.obstacles = None
+            for x, y in self.config.obstacles:
+                table.add_obstacle(x, y)
+        session.dispatcher.reset_blocks()
+        self.sink.clear()
+
+    def run(self, commands):
+        """
+        Runs a list of command lines from a fresh start, until they run out or EXIT is reached.
+
+        Args:
+            commands: An iterable of command lines, or one string of lines.
+
+        Returns:
+            SimulationResult: The output sorted by kind, the status and the final state.
+        """
+        if isinstance(commands, str):
+            commands = commands.splitlines()
+        self.reset()
+        session = self.session
+        processed = session.commands_processed
+        status = session.run(commands)
+        session.finish()
+
+        by_kind = {KIND_REPORT: [], KIND_ERROR: [], KIND_IGNORED: [], KIND_INFO: []}
+        for kind, message in self.sink.records:
+            by_kind[kind].append(message)
+        self.sink.clear()
+        return SimulationResult(by_kind[KIND_REPORT], by_kind[KIND_ERROR], by_kind[KIND_IGNORED], by_kind[KIND_INFO],
+                                status, session.commands_processed - processed, self.state())
+
+    def run_iter(self, commands):
+        """
+        Runs a list of command lines from a fresh start, yielding each message as it is written.
+
+        Nothing is held in memory beyond the current command's messages, so
+        this suits long or endless command streams. The simulator must not be
+        used for another run until the iteration is finished or closed.
+
+        Args:
+            commands: An iterable of command lines, or one string of lines.
+
+        Yields:
+            SimulationEvent: The command number, kind and text of each message.
+        """
+        if isinstance(commands, str):
+            commands = commands.splitlines()
+        self.reset()
+        session = self.session
+        dispatch = session.dispatcher.dispatch
+        robot = session.robot
+        table = session.table
+        records = self.sink.records
+        line = 0
+        try:
+            for command in commands:
+                line += 1
+                status = dispatch(command, robot, table)
+                if records:
+                    for kind, message in records:
+                        yield SimulationEvent(line, kind, message)
+                    records.clear()
+                if status == STATUS_EXIT:
+                    return
+            session.finish()
+            for kind, message in records:
+                yield SimulationEvent(line, kind, message)
+            records.clear()
+        finally:
+            session.commands_processed += line
+
+    def state(self):
+        """Returns the robot's state as (x, y, direction name), or None if it is not on the table."""
+        robot = self.session.robot
+        if robot.position is None:
+            return None
+        return robot.position.x, robot.position.y, robot.directions.name_for(robot.facing_angle)
@@ -0,0 +1,430 @@
+"""
+Filename: state_index.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module provides a prefix-state index over a command log, answering
+    "where was the robot after command k" and "what did commands [i, j) do"
+    without replaying the log from the start.
+
+    Every command is a pure function on the robot's state (not placed, or
+    x, y and one of four headings), so a run of commands is too. A run's
+    function is stored in closed form as a Transition: for each of the four
+    headings a placed robot may start with, the heading it ends with and a
+    clamped shift for each axis, x -> min(max(x + a, lo), hi), plus where an
+    unplaced robot ends up. Clamped shifts compose into clamped shifts, so a
+    Transition has constant size whatever the table size or run length.
+
+    The log is split into blocks of commands, and a segment tree holds the
+    composed Transition of every block and every node's range of blocks.
+    Queries compose O(log n) tree nodes plus at most two partial blocks, and
+    editing a command recompiles its block and the nodes above it.
+
+    Obstacles break the clamped-shift form, so tables with obstacles and logs
+    with OBSTACLE commands are rejected. Logs with DEFINE, REPEAT, END or CALL
+    are rejected too, since a command's effect would depend on the lines
+    recorded before it.
+
+    Usage: python -m toyrobot.state_index COMMAND_FILE K [K ...]
+"""
+import sys
+from collections import namedtuple
+
+from toyrobot.command_parser import tokenize, BLOCK_OPCODES, OP_PLACE, OP_MOVE, OP_LEFT, OP_RIGHT, OP_EXIT, OP_OBSTACLE
+from toyrobot.command_source import iter_file_commands
+from toyrobot.config import load_config
+from toyrobot.direction_model import compile_directions, HEADING_ANGLES, HEADING_STEPS
+from toyrobot.robot_placer import parse_place
+from toyrobot.table import Table
+
+# Commands per leaf of the segment tree
+DEFAULT_BLOCK_SIZE = 64
+
+# The robot's position and direction name, as REPORT would give them
+IndexedState = namedtuple("IndexedState", ["x", "y", "facing"])
+
+OBSTACLES_UNSUPPORTED_MESSAGE = "The state index does not support obstacles"
+MACROS_UNSUPPORTED_MESSAGE = "The state index does not support DEFINE, REPEAT, END or CALL"
+
+
+def _check_supported(opcode):
+    """Raises ValueError for commands the index cannot represent."""
+    if opcode == OP_OBSTACLE:
+        raise ValueError(OBSTACLES_UNSUPPORTED_MESSAGE)
+    if opcode in BLOCK_OPCODES:
+        raise ValueError(MACROS_UNSUPPORTED_MESSAGE)
+
+
+def _clamp(value, low, high):
+    return low if value < low else high if value > high else value
+
+
+class Transition:
+    __slots__ = ("paths", "exits", "unplaced")
+
+    def __init__(self, paths, exits, unplaced):
+        """
+        Initialise the state transition of a run of commands.
+
+        Args:
+            paths (tuple): For a placed robot starting with heading 0-3 (East,
+                North, West, South), a tuple (heading, ax, low_x, high_x, ay,
+                low_y, high_y) giving its final heading and final position
+                (min(max(x + ax, low_x), high_x), min(max(y + ay, low_y), high_y)).
+            exits (bool): A placed robot reaches EXIT within the run, and the
+                paths describe its state at that point.
+            unplaced (tuple): The final (x, y, heading, exited) of a robot
+                that starts unplaced, or None if it is never placed.
+        """
+        self.paths = paths
+        self.exits = exits
+        self.unplaced = unplaced
+
+    @classmethod
+    def identity(cls, max_x, max_y):
+        """Returns the transition of an empty run on a table with the given bounds."""
+        return cls(tuple((heading, 0, 0, max_x, 0, 0, max_y) for heading in range(4)), False, None)
+
+    def then(self, other):
+        """Returns the transition of this run followed by another run."""
+        if self.exits:
+            paths = self.paths  # Nothing runs after EXIT
+        else:
+            paths = []
+            other_paths = other.paths
+            for heading, ax, low_x, high_x, ay, low_y, high_y in self.paths:
+                next_heading, bx, next_low_x, next_high_x, by, next_low_y, next_high_y = other_paths[heading]
+                paths.append((
+                    next_heading,
+                    ax + bx, _clamp(low_x + bx, next_low_x, next_high_x), _clamp(high_x + bx, next_low_x, next_high_x),
+                    ay + by, _clamp(low_y + by, next_low_y, next_high_y), _clamp(high_y + by, next_low_y, next_high_y),
+                ))
+            paths = tuple(paths)
+        return Transition(paths, self.exits or other.exits, self._then_unplaced(other))
+
+    def _then_unplaced(self, other):
+        """Returns where a robot that starts unplaced ends up after this run and then another."""
+        if self.unplaced is None:
+            return other.unplaced
+        x, y, heading, exited = self.unplaced
+        if exited:
+            return self.unplaced
+        return (*other.apply_placed(x, y, heading), other.exits)
+
+    def apply_placed(self, x, y, heading):
+        """Returns the final (x, y, heading) of a robot placed at (x, y) facing a heading."""
+        next_heading, ax, low_x, high_x, ay, low_y, high_y = self.paths[heading]
+        return _clamp(x + ax, low_x, high_x), _clamp(y + ay, low_y, high_y), next_heading
+
+    def apply(self, state):
+        """
+        Applies the transition to a state.
+
+        Args:
+            state (tuple): (x, y, heading, exited), or None for an unplaced robot.
+
+        Returns:
+            tuple: The final state, in the same form.
+        """
+        if state is None:
+            return self.unplaced
+        if state[3]:
+            return state
+        return (*self.apply_placed(state[0], state[1], state[2]), self.exits)
+
+
+class StateIndex:
+    def __init__(self, commands, table, directions, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Index a command log.
+
+        Args:
+            commands: An iterable of command lines.
+            table (Table): The table the commands run on.
+            directions: A DirectionModel, or a dict of direction names to angles.
+            block_size (int): Commands per segment tree leaf. Queries replay
+                at most two partial blocks, so smaller blocks answer faster
+                but take more memory.
+
+        Raises:
+            ValueError: If the table has obstacles or the log has OBSTACLE,
+                DEFINE, REPEAT, END or CALL commands.
+        """
+        if table.obstacles is not None:
+            raise ValueError(OBSTACLES_UNSUPPORTED_MESSAGE)
+        self.table = table
+        self.directions = compile_directions(directions)
+        self.block_size = block_size
+        self.max_x = table.max_x
+        self.max_y = table.max_y
+        self.tokens = list(map(tokenize, commands))
+        for opcode, _ in self.tokens:
+            _check_supported(opcode)
+        self._places = {}
+        self._identity = Transition.identity(self.max_x, self.max_y)
+
+        blocks = (len(self.tokens) + block_size - 1) // block_size
+        size = 1
+        while size < blocks:
+            size *= 2
+        self._size = size
+        self._tree = [self._identity] * (2 * size)
+        for block in range(blocks):
+            self._tree[size + block] = self._compile_block(block)
+        for node in range(size - 1, 0, -1):
+            self._tree[node] = self._tree[2 * node].then(self._tree[2 * node + 1])
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def state_after(self, k):
+        """
+        Returns the robot's state after the first k commands of the log.
+
+        Returns:
+            IndexedState: The position and direction name, or None if the
+            robot has not been placed. Commands after an EXIT have no effect.
+
+        Raises:
+            IndexError: If k is not between 0 and the number of commands.
+        """
+        if not 0 <= k <= len(self.tokens):
+            raise IndexError(f"Command index {k} out of range 0-{len(self.tokens)}")
+        block = k // self.block_size
+        state = self._state_before_block(block)
+        state = self._apply_commands(state, self.tokens[block * self.block_size:k])
+        if state is None:
+            return None
+        x, y, heading, _ = state
+        return IndexedState(x, y, self.directions.name_for(HEADING_ANGLES[heading]))
+
+    def transition(self, start, end):
+        """
+        Returns the combined state transition of commands [start, end).
+
+        Raises:
+            IndexError: If the range is not within the log.
+        """
+        if not 0 <= start <= end <= len(self.tokens):
+            raise IndexError(f"Command range [{start}, {end}) out of range 0-{len(self.tokens)}")
+        block_size = self.block_size
+        first = -(-start // block_size)  # The first whole block in the range
+        last = end // block_size
+        if first >= last:
+            return self._compile(self.tokens[start:end])
+        head = self._compile(self.tokens[start:first * block_size])
+        tail = self._compile(self.tokens[last * block_size:end])
+        return head.then(self._blocks_transition(first, last)).then(tail)
+
+    def update(self, k, command):
+        """
+        Replaces command k of the log and updates the index.
+
+        Raises:
+            IndexError: If k is not the index of a command.
+            ValueError: If the new command is an OBSTACLE, DEFINE, REPEAT, END or CALL.
+        """
+        if not 0 <= k < len(self.tokens):
+            raise IndexError(f"Command index {k} out of range 0-{len(self.tokens) - 1}")
+        token = tokenize(command)
+        _check_supported(token[0])
+        self.tokens[k] = token
+        block = k // self.block_size
+        node = self._size + block
+        tree = self._tree
+        tree[node] = self._compile_block(block)
+        node //= 2
+        while node:
+            tree[node] = tree[2 * node].then(tree[2 * node + 1])
+            node //= 2
+
+    def _state_before_block(self, block):
+        """Returns the state after blocks [0, block), applying O(log n) tree nodes in order."""
+        tree = self._tree
+        state = None
+        node, low, width = 1, 0, self._size
+        while block > low:
+            if block >= low + width:
+                return tree[node].apply(state)
+            width //= 2
+            if block >= low + width:
+                state = tree[2 * node].apply(state)
+                node, low = 2 * node + 1, low + width
+            else:
+                node *= 2
+        return state
+
+    def _blocks_transition(self, first, last):
+        """Composes the transitions of blocks [first, last) from the segment tree."""
+        tree = self._tree
+        left = right = self._identity
+        first += self._size
+        last += self._size
+        while first < last:
+            if first & 1:
+                left = left.then(tree[first])
+                first += 1
+            if last & 1:
+                last -= 1
+                right = tree[last].then(right)
+            first //= 2
+            last //= 2
+        return left.then(right)
+
+    def _compile_block(self, block):
+        start = block * self.block_size
+        return self._compile(self.tokens[start:start + self.block_size])
+
+    def _place(self, argument):
+        """Returns the (x, y, heading) a PLACE argument puts the robot at, or None if it is invalid."""
+        place = self._places.get(argument, False)
+        if place is False:
+            x, y, angle, error = parse_place(argument, self.directions, self.table)
+            place = None if error is not None else (x, y, int(angle % 360) // 90)
+            self._places[argument] = place
+        return place
+
+    def _run(self, x, y, heading, commands):
+        """
+        Runs commands from an iterator on a placed robot.
+
+        Returns:
+            tuple: The final (x, y, heading, exited).
+        """
+        max_x, max_y = self.max_x, self.max_y
+        for opcode, argument in commands:
+            if opcode == OP_MOVE:
+                dx, dy = HEADING_STEPS[heading]
+                x = _clamp(x + dx, 0, max_x)
+                y = _clamp(y + dy, 0, max_y)
+            elif opcode == OP_LEFT:
+                heading = (heading + 1) & 3
+            elif opcode == OP_RIGHT:
+                heading = (heading - 1) & 3
+            elif opcode == OP_PLACE:
+                place = self._place(argument)
+                if place is not None:
+                    x, y, heading = place
+            elif opcode == OP_EXIT:
+                return x, y, heading, True
+        return x, y, heading, False
+
+    def _run_unplaced(self, commands):
+        """
+        Runs commands from an iterator on an unplaced robot, which ignores
+        everything until a valid PLACE.
+
+        Returns:
+            tuple: The final (x, y, heading, exited), or None if the robot is never placed.
+        """
+        for opcode, argument in commands:
+            if opcode == OP_PLACE:
+                place = self._place(argument)
+                if place is not None:
+                    return self._run(*place, commands)
+        return None
+
+    def _apply_commands(self, state, tokens):
+        """Applies a list of tokens to a (x, y, heading, exited) state or None."""
+        if state is None:
+            return self._run_unplaced(iter(tokens))
+        if state[3]:
+            return state
+        return self._run(state[0], state[1], state[2], iter(tokens))
+
+    def _compile(self, tokens):
+        """
+        Compiles a run of commands into a Transition.
+
+        Until the first valid PLACE or EXIT, a placed robot's heading is its
+        starting heading plus the net rotation so far, and the robots starting
+        with opposite headings move in mirror image. So only the clamped shifts
+        for starting headings East (path 0) and North (path 1) are tracked, and
+        those for West and South are their mirrors. From a valid PLACE on, every
+        starting state is in the same place, which is simply run.
+        """
+        max_x, max_y = self.max_x, self.max_y
+        rotation = 0
+        # Clamped shifts (a, low, high) on each axis for paths 0 and 1
+        ax0, low_x0, high_x0, ay0, low_y0, high_y0 = 0, 0, max_x, 0, 0, max_y
+        ax1, low_x1, high_x1, ay1, low_y1, high_y1 = 0, 0, max_x, 0, 0, max_y
+        exited = False
+        unplaced = None
+        commands = iter(tokens)
+        for opcode, argument in commands:
+            if opcode == OP_MOVE:
+                # Path 0 faces `rotation` and path 1 faces the next heading counterclockwise
+                if rotation == 0:
+                    ax0 += 1
+                    low_x0 = low_x0 + 1 if low_x0 < max_x else max_x
+                    high_x0 = high_x0 + 1 if high_x0 < max_x else max_x
+                    ay1 += 1
+                    low_y1 = low_y1 + 1 if low_y1 < max_y else max_y
+                    high_y1 = high_y1 + 1 if high_y1 < max_y else max_y
+                elif rotation == 1:
+                    ay0 += 1
+                    low_y0 = low_y0 + 1 if low_y0 < max_y else max_y
+                    high_y0 = high_y0 + 1 if high_y0 < max_y else max_y
+                    ax1 -= 1
+                    low_x1 = low_x1 - 1 if low_x1 > 0 else 0
+                    high_x1 = high_x1 - 1 if high_x1 > 0 else 0
+                elif rotation == 2:
+                    ax0 -= 1
+                    low_x0 = low_x0 - 1 if low_x0 > 0 else 0
+                    high_x0 = high_x0 - 1 if high_x0 > 0 else 0
+                    ay1 -= 1
+                    low_y1 = low_y1 - 1 if low_y1 > 0 else 0
+                    high_y1 = high_y1 - 1 if high_y1 > 0 else 0
+                else:
+                    ay0 -= 1
+                    low_y0 = low_y0 - 1 if low_y0 > 0 else 0
+                    high_y0 = high_y0 - 1 if high_y0 > 0 else 0
+                    ax1 += 1
+                    low_x1 = low_x1 + 1 if low_x1 < max_x else max_x
+                    high_x1 = high_x1 + 1 if high_x1 < max_x else max_x
+            elif opcode == OP_LEFT:
+                rotation = (rotation + 1) & 3
+            elif opcode == OP_RIGHT:
+                rotation = (rotation - 1) & 3
+            elif opcode == OP_PLACE:
+                place = self._place(argument)
+                if place is not None:
+                    # Placed and unplaced robots alike are now in the same state
+                    x, y, heading, exited = self._run(*place, commands)
+                    paths = ((heading, 0, x, x, 0, y, y),) * 4
+                    return Transition(paths, exited, (x, y, heading, exited))
+            elif opcode == OP_EXIT:
+                # A placed robot stops here; an unplaced one ignores EXIT and carries on
+                exited = True
+                unplaced = self._run_unplaced(commands)
+                break
+        paths = (
+            (rotation, ax0, low_x0, high_x0, ay0, low_y0, high_y0),
+            ((rotation + 1) & 3, ax1, low_x1, high_x1, ay1, low_y1, high_y1),
+            ((rotation + 2) & 3, -ax0, max_x - high_x0, max_x - low_x0, -ay0, max_y - high_y0, max_y - low_y0),
+            ((rotation + 3) & 3, -ax1, max_x - high_x1, max_x - low_x1, -ay1, max_y - high_y1, max_y - low_y1),
+        )
+        return Transition(paths, exited, unplaced)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or not all(arg.isdigit() for arg in argv[1:]):
+        print("Usage: python -m toyrobot.state_index COMMAND_FILE K [K ...]", file=sys.stderr)
+        return 2
+    config = load_config()
+    table = Table(config.width, config.length, config.obstacles)
+    try:
+        index = StateIndex(iter_file_commands(argv[0]), table, config.directions)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    for k in map(int, argv[1:]):
+        state = index.state_after(k)
+        print(f"After {k}: " + ("not placed" if state is None else f"{state.x},{state.y},{state.facing}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,16 +5,41 @@ Email: aaronpaca@gmail.com
 Date: 2025-07-28
 Description:
     This module defines the Table class representing the tabletop surface
-    on which the robot moves. The table has a defined width and length.
+    on which the robot moves. The table has a defined width and length, and
+    optionally a set of blocked cells the robot can neither move onto nor be
+    placed on.
 """
 
+from toyrobot.obstacle_map import make_obstacle_map
+
 class Table:
-    def __init__(self,width,length):
+    __slots__ = ("width", "length", "max_x", "max_y", "obstacles", "occupancy")
+
+    def __init__(self,width,length,obstacles=()):
         """ 
         Initialises a Table object with a defined width and length.
         
         The table is a grid with coordinates from (0,0) to (length-1, width-1).
         For example, a 5x5 table has coordinates from (0,0) to (4,4).
+
+        Args:
+            obstacles: Optional iterable of (x, y) cells that are blocked.
         """
         self.width = width  # North-South direction
-        self.length = length  # East-West direction
\ No newline at end of file
+        self.length = length  # East-West direction
+        self.max_x = length - 1  # Largest valid coordinates, precomputed for clamping
+        self.max_y = width - 1
+        self.obstacles = None  # An obstacle map, created when the first cell is blocked
+        self.occupancy = None  # The cells held by robots, when a multi-robot World shares the table
+        for x, y in obstacles:
+            self.add_obstacle(x, y)
+
+    def add_obstacle(self, x, y):
+        """Blocks the cell at (x, y), which must be on the table."""
+        if self.obstacles is None:
+            self.obstacles = make_obstacle_map(self.width, self.length)
+        self.obstacles.add(x, y)
+
+    def is_blocked(self, x, y):
+        """Returns True if the cell at (x, y) is blocked by an obstacle."""
+        return self.obstacles is not None and self.obstacles.blocked(x, y)
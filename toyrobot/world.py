@@ -0,0 +1,250 @@
+"""
+Filename: world.py
+Author: Aaron Pacanowski
+Email: aaronpaca@gmail.com
+Date: 2025-07-28
+Description:
+    This module implements a multi-robot world: any number of named robots
+    sharing one table, where no two robots may occupy the same cell.
+
+    Commands name the robot they are for:
+        PLACE R1 0,0,NORTH   (or R1 PLACE 0,0,NORTH) places or re-places R1
+        R1 MOVE, R1 LEFT, R1 RIGHT, R1 REPORT
+        OBSTACLE X,Y, STATS and EXIT apply to the whole world
+
+    Robots are kept in a dictionary by name, so routing a command costs one
+    lookup however many robots there are, and the cells they occupy are kept
+    in an OccupancyMap on the Table, so collision checks on MOVE and PLACE are
+    one lookup too. A MOVE into another robot is ignored, like a MOVE off the
+    edge, and a PLACE onto another robot is rejected. Robot names are case
+    sensitive and cannot be command keywords. DEFINE, REPEAT, END and CALL
+    are not supported, nor is PATH, which would plan around robots that move.
+"""
+
+from toyrobot.command_dispatcher import (
+    CommandDispatcher, ERROR_FORMATS, NOT_PLACED_MESSAGE, STATUS_OK, STATUS_IGNORED, STATUS_ERROR, STATUS_EXIT
+)
+from toyrobot.command_parser import (
+    tokenize, KEYWORDS, OPCODE_NAMES, BLOCK_OPCODES, OP_NOP, OP_PLACE, OP_MOVE, OP_REPORT, OP_EXIT, OP_UNKNOWN,
+    OP_STATS, OP_OBSTACLE, OP_PATH, OP_HEATMAP
+)
+from toyrobot.config import compile_config
+from toyrobot.output_sink import StdoutSink, KIND_ERROR, KIND_IGNORED, KIND_REPORT
+from toyrobot.position import Position
+from toyrobot.robot import Robot
+from toyrobot.robot_mover import RobotMover
+from toyrobot.robot_placer import RobotPlacer, parse_place
+from toyrobot.robot_reporter import RobotReporter
+from toyrobot.robot_rotator import RobotRotator
+from toyrobot.table import Table
+
+# Commands that apply to the whole world rather than to one robot
+WORLD_OPCODES = frozenset({OP_OBSTACLE, OP_STATS, OP_HEATMAP, OP_EXIT, OP_UNKNOWN})
+
+# Reported when a command that moves, turns or reports a robot does not name one
+NAME_REQUIRED_FORMAT = "Error: Command '{}' needs a robot name, e.g. R1 {}"
+
+# Commands the world does not support, and the error reported for them
+UNSUPPORTED_OPCODES = BLOCK_OPCODES | {OP_PATH}
+UNSUPPORTED_FORMAT = "Error: Command '{}' is not supported with --world"
+
+
+class OccupancyMap:
+    __slots__ = ("length", "cells")
+
+    def __init__(self, length):
+        """
+        Initialise an empty map of the cells held by robots.
+
+        Args:
+            length (int): Table length (East-West). Cells are keyed by their
+                row-major index y * length + x.
+        """
+        self.length = length
+        self.cells = {}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def occupant(self, x, y):
+        """Returns the name of the robot at (x, y), or None if the cell is free."""
+        return self.cells.get(y * self.length + x)
+
+    def enter(self, x, y, name):
+        """Records a robot at (x, y)."""
+        self.cells[y * self.length + x] = name
+
+    def leave(self, x, y):
+        """Frees the cell at (x, y)."""
+        del self.cells[y * self.length + x]
+
+    def move(self, x, y, new_x, new_y):
+        """Moves the robot at (x, y) to (new_x, new_y)."""
+        length = self.length
+        self.cells[new_y * length + new_x] = self.cells.pop(y * length + x)
+
+
+class World:
+    def __init__(self, config, output_sink=None):
+        """
+        Initialise an empty table for many named robots.
+
+        Args:
+            config: A SimulationConfig, or a dict with "table_size" and
+                "directions" in the format of config.json.
+            output_sink (OutputSink): Optional sink for all output. Defaults
+                to writing each line straight to stdout.
+
+        Raises:
+            ValueError: If the configuration is invalid.
+        """
+        config = compile_config(config)
+        self.output_sink = output_sink or StdoutSink()
+        self.directions = config.directions
+        self.table = Table(config.width, config.length, config.obstacles)
+        self.occupancy = self.table.occupancy = OccupancyMap(config.length)
+        self.dispatcher = CommandDispatcher(self.output_sink)
+        self.robots = {}
+        self.collisions = 0  # MOVEs ignored because another robot was in the way
+        self.commands_processed = 0
+
+        # The components hold no per-robot state, so every robot shares one of each
+        self._components = (RobotRotator(), RobotReporter(self.output_sink), self.table, RobotPlacer(), RobotMover())
+        self._nobody = Robot(self.directions)  # Stands in for a robot in world-wide commands
+
+    def run(self, commands):
+        """
+        Processes an iterable of command lines until they run out or EXIT is reached.
+
+        Returns:
+            int: STATUS_EXIT if an EXIT command stopped the run, otherwise STATUS_OK.
+        """
+        dispatch = self.dispatch
+        processed = 0
+        try:
+            for command in commands:
+                processed += 1
+                if dispatch(command) == STATUS_EXIT:
+                    return STATUS_EXIT
+            return STATUS_OK
+        finally:
+            self.commands_processed += processed
+
+    def dispatch(self, command):
+        """
+        Routes a single command line to the robot it names, or to the world.
+
+        Returns:
+            int: One of the STATUS_* codes.
+        """
+        first, _, rest = command.strip().partition(' ')
+        robot = self.robots.get(first)
+        if robot is not None:
+            opcode, argument = tokenize(rest)
+            if opcode == OP_MOVE:
+                return self.move(robot)
+            if opcode == OP_REPORT:
+                return self.report(first, robot)
+            if opcode == OP_PLACE:
+                return self.place(first, argument)
+            if opcode == OP_NOP:
+                return self.unknown(first)
+            if opcode in UNSUPPORTED_OPCODES:
+                return self.unsupported(opcode)
+            return self.dispatcher.execute(opcode, argument, robot, self.table)
+
+        keyword = first.upper()
+        if keyword == "PLACE":
+            name, _, argument = rest.strip().partition(' ')
+            if not argument:
+                message = f"Invalid PLACE command: {rest.strip()}. Error: expected PLACE NAME X,Y,F"
+                self.emit(ERROR_FORMATS[OP_PLACE].format(message))
+                return STATUS_ERROR
+            return self.place(name, argument.strip().partition(' ')[0])
+        if keyword in KEYWORDS:
+            opcode, argument = tokenize(command)
+            if opcode in UNSUPPORTED_OPCODES:
+                return self.unsupported(opcode)
+            if opcode not in WORLD_OPCODES:
+                self.emit(NAME_REQUIRED_FORMAT.format(keyword, keyword))
+                return STATUS_ERROR
+            # World-wide commands run whether or not any robot has been placed
+            return self.dispatcher.handlers[opcode](argument, self._nobody, self.table)
+        if not first:
+            return STATUS_OK
+
+        opcode, argument = tokenize(rest)
+        if opcode == OP_PLACE:
+            return self.place(first, argument)
+        if opcode == OP_NOP:
+            return self.unknown(first)
+        self.emit(NOT_PLACED_MESSAGE, KIND_IGNORED)  # A robot that has not been placed yet
+        return STATUS_IGNORED
+
+    def emit(self, message, kind=KIND_ERROR):
+        """Writes a message produced while executing a command to the output sink."""
+        self.output_sink.write(message, kind)
+
+    def place(self, name, argument):
+        """
+        Places a robot, creating it on its first valid PLACE.
+
+        Returns:
+            int: STATUS_OK, or STATUS_ERROR if the arguments are invalid or
+            the cell is taken by another robot.
+        """
+        if name.upper() in KEYWORDS:
+            x = y = facing_angle = None
+            error = f"{name!r} is a command and cannot be a robot name."
+        else:
+            x, y, facing_angle, error = parse_place(argument, self.directions, self.table)
+        if error is None:
+            occupant = self.occupancy.occupant(x, y)
+            if occupant is not None and occupant != name:
+                error = f"Cell is occupied by robot {occupant}."
+        if error is not None:
+            self.emit(ERROR_FORMATS[OP_PLACE].format(f"Invalid PLACE command: {argument}. Error: {error}"))
+            return STATUS_ERROR
+
+        robot = self.robots.get(name)
+        if robot is None:
+            robot = self.robots[name] = Robot(self.directions, *self._components)
+            robot.position = Position(x, y)
+        else:
+            self.occupancy.leave(robot.position.x, robot.position.y)
+            robot.position.move_to(x, y)
+        robot.facing_angle = facing_angle
+        self.occupancy.enter(x, y, name)
+        return STATUS_OK
+
+    def move(self, robot):
+        """Moves a robot one space forward, unless another robot is in the way."""
+        position = robot.position
+        x, y = position.x, position.y
+        robot.robot_mover.move_one_space(robot, self.table)
+        moved = robot.position  # The complex movement engine replaces the Position
+        if moved.x == x and moved.y == y:
+            return STATUS_OK
+        if self.occupancy.occupant(moved.x, moved.y) is not None:
+            robot.position = position
+            position.move_to(x, y)
+            self.collisions += 1
+            return STATUS_OK
+        self.occupancy.move(x, y, moved.x, moved.y)
+        return STATUS_OK
+
+    def report(self, name, robot):
+        """Reports a robot's name, position and direction, e.g. "R1: 0,1,NORTH"."""
+        facing_direction = robot.directions.name_for(robot.facing_angle)
+        self.output_sink.write(f"{name}: {robot.position.x},{robot.position.y},{facing_direction}", KIND_REPORT)
+        return STATUS_OK
+
+    def unsupported(self, opcode):
+        """Reports a block or PATH command, which the world does not support."""
+        self.emit(UNSUPPORTED_FORMAT.format(OPCODE_NAMES[opcode]))
+        return STATUS_ERROR
+
+    def unknown(self, word):
+        """Reports a line that names neither a command nor a robot command."""
+        self.emit(ERROR_FORMATS[OP_UNKNOWN].format(word.upper()))
+        return STATUS_ERROR